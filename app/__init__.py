@@ -1,3 +1,4 @@
+import atexit
 import logging
 from logging.handlers import RotatingFileHandler
 import os
@@ -10,11 +11,18 @@ from flask_sqlalchemy import SQLAlchemy
 from app.config import config
 from app.core.extensions import db, login_manager, jwt, migrate, cors, init_extensions, scheduler, mail
 from app.core.errors import register_error_handlers
-from app.core.middleware import log_request, handle_cors, validate_request
+from app.core.metrics import init_metrics, track_db_pool
+from app.core.query_stats import init_query_stats, log_queries
+from app.core.profiling import init_profiling, profile_job
+from app.core.middleware import log_request, handle_cors, validate_request, rate_limit
 from app.routes import main_bp, auth_bp
 from app.routes.reports import reports_bp
 from app.api.v1 import api_bp
 from app.tasks.cleanup import cleanup_expired_items, cleanup_unverified_accounts
+from app.tasks.report_generator import generate_daily_report
+from app.tasks.inventory_stats import rebuild_inventory_stats
+from app.tasks.user_activity import flush_last_logins
+from app.tasks.sessions import sweep_expired_sessions
 from app.services.notification_service import NotificationService
 from datetime import datetime
 
@@ -50,8 +58,15 @@ def create_app(config_name=None):
         app.logger.info('MAIL_USERNAME: %s', app.config.get('MAIL_USERNAME'))
         app.logger.info('MAIL_DEFAULT_SENDER: %s', app.config.get('MAIL_DEFAULT_SENDER'))
     
+    # Measure every request, then shed those over their limits before CSRF checks or any other handling
+    init_metrics(app)
+    init_query_stats(app)
+    init_profiling(app)
+    rate_limit(app)
+    
     # Initialize extensions
     init_extensions(app)
+    track_db_pool(app)
     
     # Only initialize scheduler if not in testing mode
     if not app.config.get('TESTING', False):
@@ -63,23 +78,47 @@ def create_app(config_name=None):
         # Define context functions for cleanup tasks
         def cleanup_expired_with_context():
             app.logger.info("Starting cleanup_expired_items job at %s", datetime.now())
-            with app.app_context():
+            with app.app_context(), log_queries('cleanup_expired_items'), profile_job('cleanup_expired_items'):
                 cleanup_expired_items()
             app.logger.info("Completed cleanup_expired_items job at %s", datetime.now())
                 
         def cleanup_unverified_with_context():
             app.logger.info("Starting cleanup_unverified_accounts job at %s", datetime.now())
-            with app.app_context():
+            with app.app_context(), log_queries('cleanup_unverified_accounts'), profile_job('cleanup_unverified_accounts'):
                 cleanup_unverified_accounts()
             app.logger.info("Completed cleanup_unverified_accounts job at %s", datetime.now())
         
         def send_daily_notifications_with_context():
             app.logger.info("Starting send_daily_notifications job at %s", datetime.now())
-            with app.app_context():
+            with app.app_context(), log_queries('send_daily_notifications'), profile_job('send_daily_notifications'):
                 notification_service = NotificationService()
                 notification_service.check_expiry_dates()
             app.logger.info("Completed send_daily_notifications job at %s", datetime.now())
         
+        def generate_daily_reports_with_context():
+            app.logger.info("Starting generate_daily_reports job at %s", datetime.now())
+            with app.app_context(), log_queries('generate_daily_reports'), profile_job('generate_daily_reports'):
+                generate_daily_report()
+            app.logger.info("Completed generate_daily_reports job at %s", datetime.now())
+        
+        def rebuild_inventory_stats_with_context():
+            app.logger.info("Starting rebuild_inventory_stats job at %s", datetime.now())
+            with app.app_context(), log_queries('rebuild_inventory_stats'), profile_job('rebuild_inventory_stats'):
+                rebuild_inventory_stats()
+            app.logger.info("Completed rebuild_inventory_stats job at %s", datetime.now())
+        
+        # Runs every few seconds, so only likely N+1s are logged rather than each run's totals
+        def flush_last_logins_with_context():
+            with app.app_context(), log_queries('flush_last_logins', totals=False), profile_job('flush_last_logins'):
+                flush_last_logins()
+        
+        def sweep_expired_sessions_with_context():
+            with app.app_context(), log_queries('sweep_expired_sessions'), profile_job('sweep_expired_sessions'):
+                sweep_expired_sessions()
+        
+        # Buffered last login times are lost if the process stops before a flush
+        atexit.register(flush_last_logins_with_context)
+        
         # Add scheduled jobs only if they don't exist
         with app.app_context():
             # Check if jobs already exist
@@ -133,6 +172,60 @@ def create_app(config_name=None):
                 )
                 app.logger.info("Added send_daily_notifications job")
             
+            if 'generate_daily_reports' not in job_ids:
+                scheduler.add_job(
+                    id='generate_daily_reports',
+                    func=generate_daily_reports_with_context,
+                    trigger='cron',
+                    hour=0,  # Midnight BST
+                    minute=5,
+                    timezone='Europe/London',
+                    misfire_grace_time=43200,  # Allow job to run up to 12 hours late
+                    coalesce=True,  # Run missed jobs only once on startup
+                    max_instances=1,  # Allow only one instance to run at a time
+                    replace_existing=True  # Replace existing job if it exists
+                )
+                app.logger.info("Added generate_daily_reports job")
+            
+            if 'rebuild_inventory_stats' not in job_ids:
+                scheduler.add_job(
+                    id='rebuild_inventory_stats',
+                    func=rebuild_inventory_stats_with_context,
+                    trigger='cron',
+                    hour=0,  # Midnight, when expiry buckets roll over
+                    minute=0,
+                    timezone='Europe/London',
+                    misfire_grace_time=43200,  # Allow job to run up to 12 hours late
+                    coalesce=True,  # Run missed jobs only once on startup
+                    max_instances=1,  # Allow only one instance to run at a time
+                    replace_existing=True  # Replace existing job if it exists
+                )
+                app.logger.info("Added rebuild_inventory_stats job")
+            
+            if 'flush_last_logins' not in job_ids:
+                scheduler.add_job(
+                    id='flush_last_logins',
+                    func=flush_last_logins_with_context,
+                    trigger='interval',
+                    seconds=app.config.get('LAST_LOGIN_FLUSH_SECONDS', 5),
+                    coalesce=True,  # Run missed jobs only once
+                    max_instances=1,  # Allow only one instance to run at a time
+                    replace_existing=True  # Replace existing job if it exists
+                )
+                app.logger.info("Added flush_last_logins job")
+            
+            if 'sweep_expired_sessions' not in job_ids and app.config.get('SESSION_BACKEND') == 'database':
+                scheduler.add_job(
+                    id='sweep_expired_sessions',
+                    func=sweep_expired_sessions_with_context,
+                    trigger='interval',
+                    seconds=app.config.get('SESSION_SWEEP_SECONDS', 900),
+                    coalesce=True,  # Run missed jobs only once
+                    max_instances=1,  # Allow only one instance to run at a time
+                    replace_existing=True  # Replace existing job if it exists
+                )
+                app.logger.info("Added sweep_expired_sessions job")
+            
             # Log all scheduled jobs
             all_jobs = scheduler.get_jobs()
             app.logger.info("All scheduled jobs:")
@@ -8,4 +8,4 @@ api_bp = Blueprint('api', __name__)
 # Register date_ocr blueprint under api_bp
 api_bp.register_blueprint(date_ocr_bp, url_prefix='/date_ocr')
 
-from app.api.v1 import auth, inventory, notifications, items 
\ No newline at end of file
+from app.api.v1 import auth, inventory, notifications, items, profiles 
\ No newline at end of file
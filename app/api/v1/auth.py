@@ -3,13 +3,17 @@ from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identi
 from flask_login import login_user
 from app.api.v1 import api_bp
 from app.core.extensions import db
+from app.core.identity import get_user
+from app.core.rate_limit import rate_limit_group
+from app.core.passwords import HasherBusyError
 from app.models.user import User
 from app.services.zoho_service import ZohoService
-from datetime import datetime
 from flask import current_app
 from app.services.email_service import EmailService
+from app.services.user_activity import last_logins
 
 @api_bp.route('/auth/register', methods=['POST'])
+@rate_limit_group('auth')
 def register():
     """Register a new user."""
     try:
@@ -64,6 +68,7 @@ def register():
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/auth/login', methods=['POST'])
+@rate_limit_group('auth')
 def login():
     """Login user and return JWT token."""
     try:
@@ -91,9 +96,10 @@ def login():
             access_token = create_access_token(identity=user.id)
             current_app.logger.info("JWT token created")
             
-            # Update last login
-            user.last_login = datetime.utcnow()
-            db.session.commit()
+            # Save an upgraded hash; the last login time is buffered
+            if db.session.dirty:
+                db.session.commit()
+            last_logins.record(user.id)
             
             return jsonify({
                 'access_token': access_token,
@@ -107,6 +113,9 @@ def login():
         current_app.logger.warning("Invalid credentials")
         return jsonify({'error': 'Invalid credentials'}), 401
         
+    except HasherBusyError:
+        current_app.logger.warning("Login rejected: password hashing is saturated")
+        return jsonify({'error': 'Too many login attempts right now. Please retry shortly.'}), 503, {'Retry-After': '1'}
     except Exception as e:
         current_app.logger.error(f"Login error: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -117,7 +126,7 @@ def zoho_login():
     """Initiate Zoho OAuth login."""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = get_user(user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
             
@@ -133,7 +142,7 @@ def zoho_callback():
     """Handle Zoho OAuth callback."""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = get_user(user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
             
@@ -156,7 +165,7 @@ def zoho_logout():
     """Logout from Zoho."""
     try:
         user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = get_user(user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
             
@@ -171,7 +180,7 @@ def zoho_logout():
 def get_current_user():
     """Get current user information."""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = get_user(user_id)
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
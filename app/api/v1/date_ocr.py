@@ -1,10 +1,77 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, current_app, url_for, stream_with_context
 from app.core.extensions import csrf
-from app.services.date_ocr_service import DateOCRService
+from app.core.rate_limit import rate_limit_group
+from app.services.date_ocr_service import get_ocr_service
+from app.services.ocr_cache import ocr_cache
+from app.services.ocr_jobs import get_ocr_jobs, OCRJobQueue, QueueFullError
+from app.services.ocr_uploads import read_image_upload, UploadRejected
+import json
 import os
+import queue
 
 date_ocr_bp = Blueprint('date_ocr', __name__)
-ocr_service = DateOCRService()
+
+def _read_image():
+    """Read the uploaded image, returning (image_data, error_response)."""
+    if 'image' not in request.files:
+        return None, (jsonify({
+            'status': 'error',
+            'message': 'No image file provided'
+        }), 400)
+
+    image_file = request.files['image']
+    if not image_file.filename:
+        return None, (jsonify({
+            'status': 'error',
+            'message': 'No image file selected'
+        }), 400)
+
+    # Check type and size from the header before reading the image
+    try:
+        image_data = read_image_upload(image_file)
+    except UploadRejected as e:
+        return None, (jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), e.status_code)
+
+    # Check if an OCR backend is available
+    if not get_ocr_service().available:
+        return None, (jsonify({
+            'status': 'error',
+            'message': 'OCR service not available. Please check Azure credentials or install Tesseract.'
+        }), 503)
+
+    return image_data, None
+
+def _error_line(index: int, filename: str, message: str) -> str:
+    """NDJSON line for a batch image that could not be processed."""
+    return json.dumps({'index': index, 'filename': filename, 'status': 'error', 'message': message}) + '\n'
+
+def _job_line(index: int, filename: str, job) -> str:
+    """NDJSON line with a finished batch job's outcome."""
+    if job['error']:
+        return _error_line(index, filename, f"Error processing image: {job['error']}")
+    result = job['result']
+    if not result['date']:
+        return _error_line(index, filename, 'No date found in image')
+    return json.dumps({
+        'index': index,
+        'filename': filename,
+        'status': 'success',
+        'date': result['date'],
+        'confidence': result['confidence'],
+        'cached': result['cache'] is not None
+    }) + '\n'
+
+def _queue_full(error: QueueFullError):
+    response = jsonify({
+        'status': 'error',
+        'message': 'OCR service is busy. Please retry shortly.'
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
 
 @date_ocr_bp.route('/test', methods=['GET'])
 @csrf.exempt
@@ -21,6 +88,7 @@ def test_connection():
         # Test Azure connection by making a simple OCR call
         test_image = b'fake_image_data'  # This will fail but will test the connection
         try:
+            ocr_service = get_ocr_service()
             if ocr_service.vision_client is None:
                 return jsonify({
                     'status': 'error',
@@ -44,46 +112,51 @@ def test_connection():
             'message': f'Error testing Azure connection: {str(e)}'
         }), 500
 
+@date_ocr_bp.route('/cache', methods=['GET'])
+@csrf.exempt
+def cache_stats():
+    """OCR result cache hit/miss counters."""
+    return jsonify({
+        'status': 'success',
+        'cache': ocr_cache.stats()
+    })
+
 @date_ocr_bp.route('/extract', methods=['POST'])
 @csrf.exempt
+@rate_limit_group('ocr')
 def extract_date():
-    """Extract date from uploaded image."""
+    """Extract date from uploaded image, waiting for the result."""
     try:
-        if 'image' not in request.files:
-            return jsonify({
-                'status': 'error',
-                'message': 'No image file provided'
-            }), 400
+        image_data, error = _read_image()
+        if error:
+            return error
 
-        image_file = request.files['image']
-        if not image_file.filename:
-            return jsonify({
-                'status': 'error',
-                'message': 'No image file selected'
-            }), 400
+        # Run on the shared OCR pool so synchronous requests are bounded too
+        jobs = get_ocr_jobs()
+        try:
+            job = jobs.submit(image_data)
+        except QueueFullError as e:
+            return _queue_full(e)
 
-        # Read image data
-        image_data = image_file.read()
-        if not image_data:
+        if not jobs.wait(job, current_app.config.get('OCR_SYNC_TIMEOUT', 60)):
             return jsonify({
                 'status': 'error',
-                'message': 'Empty image file'
-            }), 400
-
-        # Check if Azure service is available
-        if ocr_service.vision_client is None:
+                'message': 'Timed out waiting for OCR',
+                'job_id': job['id']
+            }), 504
+        if job['error']:
             return jsonify({
                 'status': 'error',
-                'message': 'OCR service not available. Please check Azure credentials.'
-            }), 503
+                'message': f"Error processing image: {job['error']}"
+            }), 500
 
-        # Extract date using Azure OCR
-        date = ocr_service.extract_date(image_data)
-        
-        if date:
+        result = job['result']
+        if result['date']:
             return jsonify({
                 'status': 'success',
-                'date': date
+                'date': result['date'],
+                'confidence': result['confidence'],
+                'cached': result['cache'] is not None
             })
         else:
             return jsonify({
@@ -95,4 +168,152 @@ def extract_date():
         return jsonify({
             'status': 'error',
             'message': f'Error processing image: {str(e)}'
-        }), 500 
\ No newline at end of file
+        }), 500
+
+@date_ocr_bp.route('/extract/jobs', methods=['POST'])
+@csrf.exempt
+@rate_limit_group('ocr')
+def create_extract_job():
+    """Queue date extraction for an uploaded image and return immediately."""
+    try:
+        image_data, error = _read_image()
+        if error:
+            return error
+
+        try:
+            job = get_ocr_jobs().submit(image_data)
+        except QueueFullError as e:
+            return _queue_full(e)
+
+        status_url = url_for('api.date_ocr.get_extract_job', job_id=job['id'])
+        response = jsonify({
+            'status': 'success',
+            'job': OCRJobQueue.to_dict(job),
+            'status_url': status_url
+        })
+        response.status_code = 202
+        response.headers['Location'] = status_url
+        return response
+
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Error processing image: {str(e)}'
+        }), 500
+
+@date_ocr_bp.route('/extract/jobs/<job_id>', methods=['GET'])
+@csrf.exempt
+def get_extract_job(job_id):
+    """Get the status, and once finished the result, of a date extraction job."""
+    job = get_ocr_jobs().get(job_id)
+    if not job:
+        return jsonify({
+            'status': 'error',
+            'message': 'Job not found'
+        }), 404
+
+    return jsonify({
+        'status': 'success',
+        'job': OCRJobQueue.to_dict(job)
+    })
+
+@date_ocr_bp.route('/extract/batch', methods=['POST'])
+@csrf.exempt
+@rate_limit_group('ocr')
+def extract_dates_batch():
+    """Extract dates from many uploaded images in one request.
+
+    Images are sent as repeated ``images`` fields and processed concurrently
+    on the shared OCR pool. Results are streamed as NDJSON, one line per image,
+    as each one completes; pass ``order=input`` to receive them in upload order.
+    If no result arrives within ``OCR_SYNC_TIMEOUT`` seconds, the outstanding
+    images get error lines and the stream ends.
+    """
+    uploads = [image for image in request.files.getlist('images') if image.filename]
+    if not uploads:
+        return jsonify({
+            'status': 'error',
+            'message': 'No image files provided'
+        }), 400
+
+    max_images = current_app.config.get('OCR_BATCH_MAX_IMAGES', 50)
+    if len(uploads) > max_images:
+        return jsonify({
+            'status': 'error',
+            'message': f'At most {max_images} images can be sent in one batch'
+        }), 413
+
+    if not get_ocr_service().available:
+        return jsonify({
+            'status': 'error',
+            'message': 'OCR service not available. Please check Azure credentials or install Tesseract.'
+        }), 503
+
+    in_input_order = request.args.get('order') == 'input'
+    jobs = get_ocr_jobs()
+    timeout = current_app.config.get('OCR_SYNC_TIMEOUT', 60)
+
+    def generate():
+        finished = queue.Queue()
+        ready = {}
+        next_image = 0
+        next_line = 0
+        running = set()
+
+        while next_line < len(uploads):
+            # Keep as many of the batch's images on the pool as it has room for;
+            # each is only read from its spooled upload when it is submitted
+            while next_image < len(uploads):
+                filename = uploads[next_image].filename
+                try:
+                    image_data = read_image_upload(uploads[next_image])
+                except UploadRejected as e:
+                    ready[next_image] = _error_line(next_image, filename, str(e))
+                    next_image += 1
+                    continue
+                try:
+                    # Only wait for a slot when none of our own jobs is running to free one
+                    jobs.submit(
+                        image_data,
+                        timeout=None if running else timeout,
+                        on_done=lambda job, index=next_image: finished.put((index, job))
+                    )
+                except QueueFullError:
+                    if running:
+                        break
+                    ready[next_image] = _error_line(
+                        next_image, filename, 'OCR service is busy. Please retry shortly.'
+                    )
+                    next_image += 1
+                    continue
+                running.add(next_image)
+                next_image += 1
+
+            sendable = next_line in ready if in_input_order else bool(ready)
+            if not sendable and running:
+                try:
+                    index, job = finished.get(timeout=timeout)
+                except queue.Empty:
+                    # A backend is hanging; report what is outstanding instead of waiting forever
+                    for index in running:
+                        ready[index] = _error_line(index, uploads[index].filename, 'OCR timed out')
+                    for index in range(next_image, len(uploads)):
+                        ready[index] = _error_line(
+                            index, uploads[index].filename, 'Not processed: the batch stopped after an OCR timeout'
+                        )
+                    running.clear()
+                    next_image = len(uploads)
+                else:
+                    running.discard(index)
+                    ready[index] = _job_line(index, uploads[index].filename, job)
+
+            if in_input_order:
+                while next_line in ready:
+                    yield ready.pop(next_line)
+                    next_line += 1
+            else:
+                for index in list(ready):
+                    yield ready.pop(index)
+                    next_line += 1
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
@@ -2,9 +2,14 @@ from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.api.v1 import api_bp
 from app.core.extensions import db
+from app.core.identity import get_user
+from app.core.rate_limit import rate_limit_group
 from app.models.item import Item
+from app.models.inventory_stats import UserInventoryStats
 from app.models.user import User
+from app.services.dashboard_cache import dashboard_cache
 from app.services.zoho_service import ZohoService
+from app.services.export_service import ExportService, ITEM_EXPORT_FIELDS, column_types
 from app.services.notification_service import NotificationService
 from datetime import datetime
 from typing import List, Dict, Any, Optional
@@ -18,7 +23,7 @@ logger = logging.getLogger(__name__)
 def get_inventory():
     """Get user's inventory items."""
     user_id = get_jwt_identity()
-    user: Optional[User] = User.query.get(user_id)
+    user: Optional[User] = get_user(user_id)
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -31,6 +36,24 @@ def get_inventory():
     
     return jsonify([item.to_dict() for item in items])
 
+@api_bp.route('/inventory/export', methods=['GET'])
+@jwt_required()
+def export_inventory():
+    """Stream user's inventory items as CSV, NDJSON or Parquet."""
+    user_id = get_jwt_identity()
+    export_format = request.args.get('format', 'ndjson')
+    export_service = ExportService()
+    if export_format not in export_service.available_formats():
+        return jsonify({'error': f'Unsupported export format: {export_format}'}), 400
+    
+    return export_service.response(
+        export_service.item_batches(user_id),
+        ITEM_EXPORT_FIELDS,
+        export_format,
+        filename=f"inventory-{datetime.now().strftime('%Y%m%d')}",
+        types=column_types(Item, ITEM_EXPORT_FIELDS)
+    )
+
 @api_bp.route('/inventory/bulk-delete', methods=['POST'])
 @jwt_required()
 def bulk_delete_items():
@@ -64,7 +87,7 @@ def bulk_delete_items():
                 return jsonify({'error': 'Unauthorized access to items'}), 403
                 
         # Get the user object
-        user = User.query.get(current_user_id)
+        user = get_user(current_user_id)
         if not user:
             return jsonify({'error': 'User not found'}), 404
                 
@@ -88,7 +111,10 @@ def bulk_delete_items():
         # Delete from local database
         try:
             Item.query.filter(Item.id.in_(item_ids)).delete(synchronize_session=False)
+            # Bulk deletes bypass item events, so recount this user's stats
+            UserInventoryStats.rebuild(current_user_id)
             db.session.commit()
+            dashboard_cache.invalidate(current_user_id)
         except Exception as e:
             logger.error(f"Error deleting items from database: {str(e)}")
             db.session.rollback()
@@ -107,10 +133,11 @@ def bulk_delete_items():
 
 @api_bp.route('/inventory/sync', methods=['POST'])
 @jwt_required()
+@rate_limit_group('sync')
 def sync_inventory():
     """Sync inventory with Zoho."""
     user_id = get_jwt_identity()
-    user = User.query.get(user_id)
+    user = get_user(user_id)
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -138,7 +165,7 @@ def get_item(item_id):
 def update_item(item_id):
     """Update an item."""
     user_id = get_jwt_identity()
-    user: Optional[User] = User.query.get(user_id)
+    user: Optional[User] = get_user(user_id)
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -2,6 +2,7 @@ from flask import jsonify, request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.api.v1 import api_bp
 from app.core.extensions import db
+from app.core.identity import get_user
 from app.models.item import Item
 from app.models.user import User
 from app.services.zoho_service import ZohoService
@@ -15,7 +16,7 @@ from flask import current_app
 def create_item():
     """Create a new item."""
     user_id = get_jwt_identity()
-    user: Optional[User] = User.query.get(user_id)
+    user: Optional[User] = get_user(user_id)
     
     if not user:
         return jsonify({'error': 'User not found'}), 404
@@ -4,6 +4,7 @@ from app.api.v1 import api_bp
 from app.core.extensions import db
 from app.models.notification import Notification
 from app.models.user import User
+from app.services.dashboard_cache import dashboard_cache
 from app.services.notification_service import NotificationService
 from flask_wtf.csrf import generate_csrf
 from datetime import datetime, timedelta
@@ -46,6 +47,8 @@ def mark_all_notifications_read():
             status='pending'
         ).update({'status': 'sent'})
         db.session.commit()
+        # Bulk updates skip the ORM events that invalidate the dashboard
+        dashboard_cache.invalidate(current_user.id)
         return jsonify({'message': 'All notifications marked as read'})
     except Exception as e:
         db.session.rollback()
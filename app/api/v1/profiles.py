@@ -0,0 +1,18 @@
+from flask import jsonify, send_from_directory
+from app.api.v1 import api_bp
+from app.core.middleware import require_admin
+from app.core.profiling import list_profiles, profiles_dir
+
+@api_bp.route('/admin/profiles', methods=['GET'])
+@require_admin
+def get_profiles():
+    """List saved request and job profiles, newest first."""
+    return jsonify({'profiles': list_profiles()})
+
+@api_bp.route('/admin/profiles/<name>', methods=['GET'])
+@require_admin
+def download_profile(name):
+    """Download a saved profile."""
+    if name not in {profile['name'] for profile in list_profiles()}:
+        return jsonify({'error': 'Profile not found'}), 404
+    return send_from_directory(profiles_dir(), name, as_attachment=True)
@@ -8,6 +8,7 @@ class Config:
     """Base configuration."""
     # Flask
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key'
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 16 * 1024 * 1024))  # Larger request bodies are refused with 413
     
     # SQLAlchemy
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///app.db'
@@ -27,11 +28,46 @@ class Config:
     SCHEDULER_JOBS = []  # Jobs are now configured in app/__init__.py
     
     # Security
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))  # bcrypt cost; older hashes are upgraded on login
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 2))  # Concurrent bcrypt operations per process
+    PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', 32))  # bcrypt operations allowed to wait
+    PASSWORD_HASH_TIMEOUT = int(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))  # Seconds to wait for a hashing slot
+    LAST_LOGIN_FLUSH_SECONDS = int(os.environ.get('LAST_LOGIN_FLUSH_SECONDS', 5))  # How often buffered last login times are written
+    LAST_LOGIN_BUFFER_SIZE = int(os.environ.get('LAST_LOGIN_BUFFER_SIZE', 500))  # Buffered logins that force an early write
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 30))  # Seconds users' identity fields are cached per process; 0 disables
+    SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'database')  # 'database', 'cookie' (signed, stateless) or 'filesystem'
+    SESSION_TOUCH_SECONDS = int(os.environ.get('SESSION_TOUCH_SECONDS', 300))  # Unchanged sessions have their expiry extended at most this often
+    SESSION_SWEEP_SECONDS = int(os.environ.get('SESSION_SWEEP_SECONDS', 900))  # How often expired sessions are deleted
     VERIFICATION_CODE_EXPIRY = timedelta(minutes=15)
     PASSWORD_RESET_EXPIRY = timedelta(hours=1)
     MAX_LOGIN_ATTEMPTS = 5  # Maximum number of failed login attempts before account is locked
     LOGIN_LOCKOUT_DURATION = timedelta(minutes=15)  # How long an account stays locked after too many failed attempts
     
+    # Rate limiting
+    RATE_LIMIT_ENABLED = os.environ.get('RATE_LIMIT_ENABLED', 'true').lower() in ['true', 'on', '1']
+    RATE_LIMIT_STORAGE = os.environ.get('RATE_LIMIT_STORAGE', 'sqlite')  # 'sqlite' (shared by the workers on a host) or 'memory' (per process)
+    RATE_LIMIT_STORAGE_PATH = os.environ.get('RATE_LIMIT_STORAGE_PATH')  # SQLite file; defaults to instance/rate_limits.sqlite
+    RATE_LIMIT_DEFAULT = os.environ.get('RATE_LIMIT_DEFAULT', '300 per minute')  # Per user, or per IP address when signed out
+    RATE_LIMIT_AUTH = os.environ.get('RATE_LIMIT_AUTH', '10 per minute')  # Login, registration and password reset, per IP address
+    RATE_LIMIT_OCR = os.environ.get('RATE_LIMIT_OCR', '30 per minute')  # OCR uploads
+    RATE_LIMIT_SYNC = os.environ.get('RATE_LIMIT_SYNC', '6 per minute')  # Zoho inventory syncs
+    RATE_LIMIT_REPORTS = os.environ.get('RATE_LIMIT_REPORTS', '10 per minute')  # Report generation
+    MAX_CONCURRENT_OCR = int(os.environ.get('MAX_CONCURRENT_OCR', 8))  # OCR requests running at once per process; 0 for no cap
+    MAX_CONCURRENT_SYNC = int(os.environ.get('MAX_CONCURRENT_SYNC', 2))  # Zoho syncs running at once per process
+    MAX_CONCURRENT_REPORTS = int(os.environ.get('MAX_CONCURRENT_REPORTS', 2))  # Report generations running at once per process
+    
+    # Metrics and profiling
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')  # Bearer token /metrics requires; unset, /metrics is 404 outside debug and testing
+    QUERY_STATS_ENABLED = os.environ.get('QUERY_STATS_ENABLED', 'true').lower() in ['true', 'on', '1']  # Count queries per request and job
+    QUERY_STATS_SERVER_TIMING = os.environ.get('QUERY_STATS_SERVER_TIMING', 'true').lower() in ['true', 'on', '1']  # Report them in a Server-Timing header
+    QUERY_REPEAT_THRESHOLD = int(os.environ.get('QUERY_REPEAT_THRESHOLD', 5))  # Runs of one statement shape per request logged as a likely N+1
+    PROFILER = os.environ.get('PROFILER', 'sampling')  # 'sampling' (folded stacks for flamegraphs) or 'cprofile'
+    PROFILES_DIR = os.environ.get('PROFILES_DIR')  # Where profiles are saved; defaults to instance/profiles
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0))  # Percent of requests profiled at random
+    PROFILE_SAMPLE_INTERVAL_MS = int(os.environ.get('PROFILE_SAMPLE_INTERVAL_MS', 5))  # Stack sampling interval
+    PROFILE_JOBS = tuple(job for job in os.environ.get('PROFILE_JOBS', '').split(',') if job)  # Scheduled job IDs to profile, or 'all'
+    PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', 200))  # Oldest profiles are deleted beyond this
+    
     # Zoho API Configuration
     ZOHO_API_BASE_URL = 'https://www.zohoapis.eu/inventory/v1'
     ZOHO_ACCOUNTS_URL = 'https://accounts.zoho.eu'
@@ -40,6 +76,48 @@ class Config:
     ZOHO_ORGANIZATION_ID = os.environ.get('ZOHO_ORGANIZATION_ID')
     ZOHO_REDIRECT_URI = os.environ.get('ZOHO_REDIRECT_URI', 'http://localhost:5000/auth/zoho/callback')
     ZOHO_TOKEN_EXPIRY = timedelta(hours=1)
+    ZOHO_SYNC_MAX_AGE = int(os.environ.get('ZOHO_SYNC_MAX_AGE', 600))  # Seconds after a sync before the inventory page starts another
+    ZOHO_SYNC_TIMEOUT = int(os.environ.get('ZOHO_SYNC_TIMEOUT', 900))  # Seconds before a sync that never finished is taken over
+    ZOHO_SYNC_WORKERS = int(os.environ.get('ZOHO_SYNC_WORKERS', 2))  # Background syncs running at once per process
+
+    # Dashboard
+    DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 300))  # Seconds a dashboard is cached per process; 0 disables
+    DASHBOARD_CACHE_SIZE = int(os.environ.get('DASHBOARD_CACHE_SIZE', 1024))  # Users' dashboards kept in memory
+    DASHBOARD_ITEMS_LIMIT = int(os.environ.get('DASHBOARD_ITEMS_LIMIT', 20))  # Expiring and expired items listed on the dashboard
+
+    # Reports
+    REPORT_ANALYTICS_BACKEND = os.environ.get('REPORT_ANALYTICS_BACKEND', 'vectorized')  # 'vectorized' (pandas) or 'python'
+    REPORT_BATCH_SHARDS = int(os.environ.get('REPORT_BATCH_SHARDS', 4))  # User shards per batch report run
+    REPORT_BATCH_WORKERS = int(os.environ.get('REPORT_BATCH_WORKERS', 4))  # Worker threads per batch report run
+    REPORT_HTML_CACHE_SIZE = int(os.environ.get('REPORT_HTML_CACHE_SIZE', 256))  # Rendered report bodies kept in memory
+    REPORT_PUBLIC_MAX_AGE = int(os.environ.get('REPORT_PUBLIC_MAX_AGE', 1800))  # Browser cache lifetime of shared report links, in seconds; capped at half WTF_CSRF_TIME_LIMIT
+    
+    # OCR
+    OCR_BACKEND = os.environ.get('OCR_BACKEND', 'auto')  # 'auto', 'azure', 'tesseract' or 'fake'
+    OCR_TESSERACT_CMD = os.environ.get('OCR_TESSERACT_CMD')  # Path to the tesseract binary if not on PATH
+    OCR_FAKE_TEXTS = tuple(os.environ.get('OCR_FAKE_TEXTS', 'EXP 31/12/2026').split('|'))  # Fixture texts the fake backend returns
+    OCR_FAKE_LATENCY_MS = int(os.environ.get('OCR_FAKE_LATENCY_MS', 0))  # Simulated latency per fake OCR call
+    OCR_ALLOWED_TYPES = tuple(os.environ.get('OCR_ALLOWED_TYPES', 'image/jpeg,image/png,image/webp,image/bmp,image/tiff').split(','))  # Upload types sniffed from magic bytes
+    OCR_MAX_PIXELS = int(os.environ.get('OCR_MAX_PIXELS', 60_000_000))  # Larger images, and images whose header gives no size, are refused before decoding
+    OCR_TARGET_SIZE = int(os.environ.get('OCR_TARGET_SIZE', 1600))  # Long side in pixels images are reduced to before preprocessing
+    OCR_PREPROCESS_TIERS = tuple(os.environ.get('OCR_PREPROCESS_TIERS', 'fast,denoise').split(','))  # Tried in order until a date is found
+    OCR_UPLOAD_FORMAT = os.environ.get('OCR_UPLOAD_FORMAT', 'png')  # 'png' (bilevel) or 'jpeg'
+    OCR_UPLOAD_QUALITY = int(os.environ['OCR_UPLOAD_QUALITY']) if os.environ.get('OCR_UPLOAD_QUALITY') else None  # PNG compression 0-9 or JPEG quality 0-100
+    OCR_CACHE_SIZE = int(os.environ.get('OCR_CACHE_SIZE', 1024))  # OCR results kept in memory
+    OCR_CACHE_TTL = int(os.environ.get('OCR_CACHE_TTL', 86400))  # Seconds an OCR result stays valid
+    OCR_CACHE_NEGATIVE_TTL = int(os.environ.get('OCR_CACHE_NEGATIVE_TTL', 300))  # Seconds a "no date found" result stays valid
+    OCR_CACHE_PERCEPTUAL = os.environ.get('OCR_CACHE_PERCEPTUAL', 'false').lower() in ['true', 'on', '1']  # Also match near-duplicate images
+    OCR_CACHE_PHASH_DISTANCE = int(os.environ.get('OCR_CACHE_PHASH_DISTANCE', 4))  # Max differing perceptual hash bits for a match
+    OCR_CACHE_PERSIST = os.environ.get('OCR_CACHE_PERSIST', 'false').lower() in ['true', 'on', '1']  # Persist results to the ocr_results table
+    OCR_WORKERS = int(os.environ.get('OCR_WORKERS', 4))  # Concurrent OCR jobs per process
+    OCR_QUEUE_SIZE = int(os.environ.get('OCR_QUEUE_SIZE', 16))  # OCR jobs allowed to wait for a worker
+    OCR_JOB_TTL = int(os.environ.get('OCR_JOB_TTL', 600))  # Seconds finished OCR jobs can still be polled
+    OCR_SYNC_TIMEOUT = int(os.environ.get('OCR_SYNC_TIMEOUT', 60))  # Seconds /extract waits for its job
+    OCR_BATCH_MAX_IMAGES = int(os.environ.get('OCR_BATCH_MAX_IMAGES', 50))  # Images accepted by one /extract/batch request
+    OCR_DEBUG_IMAGES = os.environ.get('OCR_DEBUG_IMAGES', 'false').lower() in ['true', 'on', '1']  # Save preprocessed images to debug_images/
+    
+    # Exports
+    EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))  # Rows fetched and written per chunk
 
 class DevelopmentConfig(Config):
     """Development configuration."""
@@ -68,6 +146,9 @@ class TestingConfig(Config):
     DEBUG = True
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
+    BCRYPT_ROUNDS = 4  # Minimum cost keeps password tests fast
+    RATE_LIMIT_ENABLED = False  # Tests that exercise limits enable them
+    RATE_LIMIT_STORAGE = 'memory'
     
     # Testing Zoho settings
     ZOHO_CLIENT_ID = 'test-client-id'
@@ -1,4 +1,14 @@
-from flask import jsonify, render_template, request
+from flask import jsonify, make_response, redirect, render_template, request, url_for
+from flask_login import logout_user
+from sqlalchemy.orm.exc import ObjectDeletedError
+from app.core.identity import forget_deleted_users
+
+def _with_retry_after(response, error):
+    """Copy the Retry-After header of a 429 or 503 error onto its response."""
+    retry_after = getattr(error, 'retry_after', None)
+    if retry_after:
+        response.headers['Retry-After'] = str(retry_after)
+    return response
 
 def register_error_handlers(app):
     """Register error handlers for the application."""
@@ -30,6 +40,32 @@ def register_error_handlers(app):
             return jsonify({'error': 'Not Found', 'message': str(error)}), 404
         return render_template('errors/404.html'), 404
     
+    @app.errorhandler(429)
+    def too_many_requests_error(error):
+        if is_api_request():
+            response = jsonify({'error': 'Too Many Requests', 'message': 'Rate limit exceeded. Please retry later.'})
+        else:
+            response = make_response(render_template('errors/429.html'))
+        return _with_retry_after(response, error), 429
+    
+    @app.errorhandler(503)
+    def service_unavailable_error(error):
+        if is_api_request():
+            response = jsonify({'error': 'Service Unavailable', 'message': error.description})
+        else:
+            response = make_response(render_template('errors/503.html'))
+        return _with_retry_after(response, error), 503
+    
+    @app.errorhandler(ObjectDeletedError)
+    def deleted_row_error(error):
+        # A cached user deleted elsewhere is logged out rather than failing the request
+        if not forget_deleted_users():
+            raise error
+        logout_user()
+        if is_api_request():
+            return jsonify({'error': 'Unauthorized', 'message': 'User no longer exists'}), 401
+        return redirect(url_for('auth.login'))
+    
     @app.errorhandler(500)
     def internal_error(error):
         if is_api_request():
@@ -23,6 +23,11 @@ csrf = CSRFProtect()
 def init_extensions(app):
     """Initialize Flask extensions."""
     # Configure session first
+    session_backend = app.config.get('SESSION_BACKEND', 'filesystem')
+    if session_backend == 'database':
+        # Imported here: the session model needs db from this module
+        from app.core.sessions import DatabaseSessionInterface
+        app.session_interface = DatabaseSessionInterface()
     if 'SESSION_TYPE' not in app.config:
         app.config['SESSION_TYPE'] = 'filesystem'
     if 'SESSION_FILE_DIR' not in app.config:
@@ -38,8 +43,9 @@ def init_extensions(app):
     if 'SESSION_COOKIE_EXPIRES' not in app.config:
         app.config['SESSION_COOKIE_EXPIRES'] = timedelta(hours=24)
     
-    # Initialize session
-    Session(app)
+    # Initialize session; the signed cookie mode keeps Flask's own interface
+    if session_backend == 'filesystem':
+        Session(app)
     
     # Initialize database
     db.init_app(app)
@@ -0,0 +1,151 @@
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from flask import current_app, g, has_app_context
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session, make_transient_to_detached, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from app.core.extensions import db
+from app.models.user import User
+
+# Columns cached between requests: they only change on profile or account
+# updates, which invalidate the entry. Everything else (credentials, lockout
+# state, Zoho tokens, last login) is loaded on first access.
+IDENTITY_FIELDS = (
+    'id', 'username', 'email', 'is_active', 'is_admin', 'is_verified',
+    'email_notifications', 'created_at', 'updated_at'
+)
+
+class UserIdentityCache:
+    """Short-lived process cache of users' identity fields.
+
+    A cached user is attached to the current session without a query, with
+    only ``IDENTITY_FIELDS`` loaded; reading any other column loads the rest
+    of the row in one SELECT. Entries expire after ``USER_CACHE_TTL`` seconds
+    and are dropped whenever a user row is updated or deleted through the ORM
+    in this process, both at flush and again after commit. Other processes
+    see such changes once their own entry expires; a row deleted meanwhile
+    makes the first lazy load raise ``ObjectDeletedError``, which
+    ``forget_deleted_users`` turns into a logged out user.
+    """
+
+    def __init__(self) -> None:
+        self._entries: Dict[int, Tuple[float, Dict]] = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation so a lookup racing an update is not stored
+        self._generation = 0
+        self.counters = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def get(self, user_id: int) -> Optional[User]:
+        """The user with this ID, from the session, the cache or the database."""
+        user = db.session.identity_map.get(identity_key(User, user_id))
+        if user is not None:
+            return user
+
+        ttl = current_app.config.get('USER_CACHE_TTL', 30)
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic():
+                self.counters['hits'] += 1
+                fields = entry[1]
+            else:
+                self.counters['misses'] += 1
+                fields = None
+            generation = self._generation
+        if fields is not None:
+            return self._attach(fields)
+
+        user = db.session.get(User, user_id)
+        if user is not None and ttl > 0:
+            fields = {name: getattr(user, name) for name in IDENTITY_FIELDS}
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[user_id] = (time.monotonic() + ttl, fields)
+        return user
+
+    @staticmethod
+    def _attach(fields: Dict) -> User:
+        """A persistent User in the current session holding only the cached fields."""
+        user = User.__mapper__.class_manager.new_instance()
+        for name, value in fields.items():
+            set_committed_value(user, name, value)
+        # Columns that were not set are marked expired and load on access
+        make_transient_to_detached(user)
+        db.session.add(user)
+        return user
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user's entry, e.g. after updating the row with a Core statement."""
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generation += 1
+            self.counters['invalidations'] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self.counters, size=len(self._entries))
+
+user_cache = UserIdentityCache()
+
+def get_user(user_id) -> Optional[User]:
+    """Look up a user by ID, at most once per request.
+
+    Accepts the string identities Flask-Login and JWTs carry. Repeated lookups
+    in one request return the same instance; the first is served from the
+    session or ``user_cache`` when possible.
+    """
+    try:
+        user_id = int(user_id)
+    except (TypeError, ValueError):
+        return None
+
+    users = g.setdefault('identity_users', {})
+    if user_id not in users:
+        users[user_id] = user_cache.get(user_id)
+    return users[user_id]
+
+def forget_deleted_users() -> bool:
+    """Drop this request's users whose rows no longer exist.
+
+    Their cache entries are invalidated and later lookups in the request
+    return None.
+
+    Returns:
+        True if any user looked up in this request has been deleted
+    """
+    users = g.get('identity_users', {})
+    user_ids = [user_id for user_id, user in users.items() if user is not None]
+    if not user_ids:
+        return False
+    existing = set(db.session.scalars(select(User.id).where(User.id.in_(user_ids))))
+    deleted = [user_id for user_id in user_ids if user_id not in existing]
+    for user_id in deleted:
+        user_cache.invalidate(user_id)
+        users[user_id] = None
+    return bool(deleted)
+
+@event.listens_for(User, 'after_update')
+def _user_updated(mapper, connection, target) -> None:
+    user_cache.invalidate(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault('updated_users', set()).add(target.id)
+
+@event.listens_for(User, 'after_delete')
+def _user_deleted(mapper, connection, target) -> None:
+    _user_updated(mapper, connection, target)
+    if has_app_context():
+        g.get('identity_users', {}).pop(target.id, None)
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_soft_rollback')
+def _session_ended(session, *args) -> None:
+    # Drop again in case another request cached the row before this commit
+    for user_id in session.info.pop('updated_users', ()):
+        user_cache.invalidate(user_id)
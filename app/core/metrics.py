@@ -0,0 +1,115 @@
+import hmac
+import os
+import time
+from contextlib import contextmanager
+from flask import Response, abort, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, generate_latest, multiprocess
+)
+from sqlalchemy import event
+from app.core.extensions import db
+
+# Under gunicorn, set PROMETHEUS_MULTIPROC_DIR to an empty directory before the
+# workers start; every worker then writes its samples there and /metrics sums them.
+MULTIPROCESS = bool(os.environ.get('PROMETHEUS_MULTIPROC_DIR'))
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Time spent serving requests, including streamed bodies',
+    ['method', 'endpoint']
+)
+REQUESTS = Counter(
+    'http_requests_total', 'Requests served', ['method', 'endpoint', 'status']
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    'http_requests_in_progress', 'Requests being served', ['endpoint'], multiprocess_mode='livesum'
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    'db_pool_connections_in_use', 'Database connections checked out of the pool', multiprocess_mode='livesum'
+)
+DB_POOL_SIZE = Gauge(
+    'db_pool_size', 'Configured database pool size', multiprocess_mode='livesum'
+)
+OUTBOUND_LATENCY = Histogram(
+    'outbound_request_duration_seconds', 'Time spent calling external services',
+    ['service', 'outcome'], buckets=(.05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60)
+)
+
+@contextmanager
+def track_outbound(service: str):
+    """Time a call to an external service ('zoho', 'azure' or 'smtp').
+
+    Calls that raise are recorded with outcome 'error' and the exception is
+    re-raised.
+    """
+    start = time.perf_counter()
+    outcome = 'error'
+    try:
+        yield
+        outcome = 'ok'
+    finally:
+        OUTBOUND_LATENCY.labels(service, outcome).observe(time.perf_counter() - start)
+
+def track_db_pool(app) -> None:
+    """Record the size and checked out connections of the app's database pool."""
+    with app.app_context():
+        engine = db.engine
+    size = getattr(engine.pool, 'size', None)
+    if callable(size):
+        DB_POOL_SIZE.set(size())
+
+    @event.listens_for(engine, 'checkout')
+    def checkout(dbapi_connection, connection_record, connection_proxy):
+        DB_CONNECTIONS_IN_USE.inc()
+
+    @event.listens_for(engine, 'checkin')
+    def checkin(dbapi_connection, connection_record):
+        DB_CONNECTIONS_IN_USE.dec()
+
+def metrics_registry() -> CollectorRegistry:
+    """Registry to expose: every worker's samples in multiprocess mode, else this process's."""
+    if not MULTIPROCESS:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+def init_metrics(app) -> None:
+    """Record request metrics and serve them at ``/metrics`` in Prometheus text format.
+
+    Requests are labelled by endpoint name rather than path so the number of
+    series stays bounded. If ``METRICS_TOKEN`` is set, scrapes must send it as
+    a bearer token; without one, ``/metrics`` is only served in debug or
+    testing and answers 404 otherwise.
+    """
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_endpoint = request.endpoint or 'unmatched'
+        g.metrics_start = time.perf_counter()
+        REQUESTS_IN_PROGRESS.labels(g.metrics_endpoint).inc()
+
+    @app.after_request
+    def record_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    # Runs once a streamed response has finished, so streams are timed in full
+    @app.teardown_request
+    def finish_request_metrics(exc=None):
+        start = g.pop('metrics_start', None)
+        if start is None:
+            return
+        endpoint = g.metrics_endpoint
+        REQUESTS_IN_PROGRESS.labels(endpoint).dec()
+        REQUEST_LATENCY.labels(request.method, endpoint).observe(time.perf_counter() - start)
+        status = g.get('metrics_status', 500 if exc else 200)
+        REQUESTS.labels(request.method, endpoint, str(status)).inc()
+
+    def metrics():
+        token = app.config.get('METRICS_TOKEN')
+        if not token and not (app.debug or app.testing):
+            abort(404)
+        if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+            abort(401)
+        return Response(generate_latest(metrics_registry()), content_type=CONTENT_TYPE_LATEST)
+
+    app.add_url_rule('/metrics', 'metrics', metrics)
@@ -1,16 +1,16 @@
 from functools import wraps
-from flask import request, g, current_app, jsonify
+from flask import request, g, current_app, jsonify, session
 from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
-from app.models.user import User
+from werkzeug.exceptions import ServiceUnavailable, TooManyRequests
+from app.core.identity import get_user
+from app.core.rate_limit import get_concurrency_limiter, get_rate_limiter
 import time
 
 def log_request(app):
     """Log all requests to the application."""
-    start_times = {}
-    
     @app.before_request
     def before_request():
-        start_times[request.environ['werkzeug.request']] = time.time()
+        g.request_start_time = time.time()
     
     @app.after_request
     def after_request(response):
@@ -21,13 +21,15 @@ def log_request(app):
         elif '/auth' in path:
             path = '/auth/***'  # Hide auth-related paths
         
-        duration = time.time() - start_times.get(request.environ['werkzeug.request'], time.time())
+        duration = time.time() - g.get('request_start_time', time.time())
+        query_stats = g.get('query_stats')
         app.logger.info(
-            'Request: %s %s - Status: %s - Duration: %.2fs',
+            'Request: %s %s - Status: %s - Duration: %.2fs - DB: %s',
             request.method,
             path,
             response.status_code,
-            duration
+            duration,
+            query_stats.summary() if query_stats else 'not tracked'
         )
         return response
 
@@ -36,8 +38,7 @@ def require_auth(f):
     @wraps(f)
     def decorated(*args, **kwargs):
         verify_jwt_in_request()
-        user_id = get_jwt_identity()
-        g.user = User.query.get(user_id)
+        g.user = get_user(get_jwt_identity())
         return f(*args, **kwargs)
     return decorated
 
@@ -46,8 +47,7 @@ def require_admin(f):
     @wraps(f)
     def decorated(*args, **kwargs):
         verify_jwt_in_request()
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = get_user(get_jwt_identity())
         
         if not user or not user.is_admin:
             return jsonify({'error': 'Admin privileges required'}), 403
@@ -78,10 +78,60 @@ def handle_cors(app):
             response.headers.add('Vary', 'Origin')
         return response
 
-def rate_limit():
-    """Rate limiting middleware."""
-    # TODO: Implement rate limiting
-    pass
+def rate_limit(app):
+    """Apply rate limits and concurrency caps by route group.
+
+    Responses to limited requests carry ``RateLimit-Limit``,
+    ``RateLimit-Remaining`` and ``RateLimit-Reset`` headers. Requests over a
+    limit get 429 and requests over a concurrency cap 503, both with
+    ``Retry-After``.
+    """
+    def client_key(group):
+        if group != 'auth':
+            user_id = session.get('_user_id')
+            if user_id is None and 'Authorization' in request.headers:
+                try:
+                    verify_jwt_in_request(optional=True)
+                    user_id = get_jwt_identity()
+                except Exception:
+                    user_id = None
+            if user_id is not None:
+                return f'user:{user_id}'
+        return f'ip:{request.remote_addr}'
+    
+    @app.before_request
+    def check_rate_limit():
+        if not app.config.get('RATE_LIMIT_ENABLED', True) or request.method == 'OPTIONS':
+            return
+        view = app.view_functions.get(request.endpoint)
+        if view is None or request.endpoint == 'static':
+            return
+        group = getattr(view, 'rate_limit_group', 'default')
+        
+        g.rate_limit = get_rate_limiter().hit(group, client_key(group))
+        if g.rate_limit and not g.rate_limit['allowed']:
+            raise TooManyRequests(retry_after=g.rate_limit['retry_after'])
+        
+        if not get_concurrency_limiter().acquire(group):
+            raise ServiceUnavailable('Server is busy. Please retry shortly.', retry_after=1)
+        g.concurrency_group = group
+    
+    @app.after_request
+    def add_rate_limit_headers(response):
+        state = g.get('rate_limit')
+        if state:
+            response.headers['RateLimit-Limit'] = str(state['limit'])
+            response.headers['RateLimit-Remaining'] = str(state['remaining'])
+            response.headers['RateLimit-Reset'] = str(state['reset'])
+            response.headers['RateLimit-Policy'] = f"{state['limit']};w={state['period']}"
+        return response
+    
+    # Runs once a streamed response has finished, so streams hold their slot
+    @app.teardown_request
+    def release_concurrency(exc=None):
+        group = g.pop('concurrency_group', None)
+        if group is not None:
+            get_concurrency_limiter().release(group)
 
 def validate_request(app):
     """Validate request data."""
@@ -0,0 +1,136 @@
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import time
+from typing import Dict, Optional
+import bcrypt
+from flask import current_app
+
+# bcrypt's own default cost
+DEFAULT_ROUNDS = 12
+
+class HasherBusyError(Exception):
+    """Raised when no password hashing slot frees up in time."""
+
+class PasswordHasher:
+    """Bounded pool running bcrypt hashing and verification.
+
+    bcrypt releases the GIL while it works, so running it on a small dedicated
+    pool caps how many cores a burst of logins can take, while request threads
+    simply wait for their result. At most ``workers`` hashes run at once and
+    at most ``queue_size`` more wait; a caller that cannot get a slot within
+    ``timeout`` seconds gets ``HasherBusyError``. Queue depth and timings are
+    kept in ``stats()``.
+    """
+
+    def __init__(self, rounds: int = DEFAULT_ROUNDS, workers: int = 2, queue_size: int = 32,
+                 timeout: float = 10) -> None:
+        self.rounds = rounds
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self.counters = {
+            'queued': 0, 'running': 0, 'max_queued': 0, 'completed': 0, 'rejected': 0,
+            'rehashed': 0, 'wait_seconds': 0.0, 'hash_seconds': 0.0
+        }
+
+    def _submit(self, function, *args):
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.counters['rejected'] += 1
+            raise HasherBusyError('Password hashing is busy')
+
+        submitted = time.perf_counter()
+        with self._lock:
+            self.counters['queued'] += 1
+            self.counters['max_queued'] = max(self.counters['max_queued'], self.counters['queued'])
+
+        def run():
+            started = time.perf_counter()
+            with self._lock:
+                self.counters['queued'] -= 1
+                self.counters['running'] += 1
+                self.counters['wait_seconds'] += started - submitted
+            try:
+                return function(*args)
+            finally:
+                with self._lock:
+                    self.counters['running'] -= 1
+                    self.counters['completed'] += 1
+                    self.counters['hash_seconds'] += time.perf_counter() - started
+                self._slots.release()
+
+        try:
+            return self._executor.submit(run).result()
+        except RuntimeError:
+            # Executor shut down before the job ran
+            self._slots.release()
+            raise
+
+    def hash(self, password: str, rounds: Optional[int] = None) -> str:
+        """Hash a password at the configured cost."""
+        salt = bcrypt.gensalt(rounds or self.rounds)
+        return self._submit(bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        """Check a password against a bcrypt hash; invalid hashes never match."""
+        try:
+            return self._submit(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+        except ValueError:
+            # Handle potential invalid hash format
+            return False
+
+    @staticmethod
+    def cost(password_hash: str) -> Optional[int]:
+        """Cost factor of a bcrypt hash such as ``$2b$12$...``, or None if unreadable."""
+        parts = password_hash.split('$')
+        if len(parts) < 4 or not parts[2].isdigit():
+            return None
+        return int(parts[2])
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Whether a hash was made at a lower cost than the configured one.
+
+        Hashes made at a higher cost are kept, so lowering ``BCRYPT_ROUNDS``
+        (or a worker running with an older config) never weakens stored hashes.
+        """
+        cost = self.cost(password_hash)
+        return cost is not None and cost < self.rounds
+
+    def rehashed(self) -> None:
+        """Record that a stored hash was upgraded to the configured cost."""
+        with self._lock:
+            self.counters['rehashed'] += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Queue depth, counters and mean wait and hash times in milliseconds."""
+        with self._lock:
+            stats = dict(self.counters, rounds=self.rounds, workers=self.workers)
+        completed = stats['completed']
+        stats['mean_wait_ms'] = round(stats.pop('wait_seconds') / completed * 1000, 2) if completed else 0.0
+        stats['mean_hash_ms'] = round(stats.pop('hash_seconds') / completed * 1000, 2) if completed else 0.0
+        return stats
+
+    def shutdown(self) -> None:
+        """Stop the worker threads once queued work has finished."""
+        self._executor.shutdown(wait=True)
+
+_create_lock = threading.Lock()
+
+def get_password_hasher() -> PasswordHasher:
+    """The app's password hasher, created on first use."""
+    hasher = current_app.extensions.get('password_hasher')
+    if hasher is None:
+        with _create_lock:
+            hasher = current_app.extensions.get('password_hasher')
+            if hasher is None:
+                config = current_app.config
+                hasher = current_app.extensions['password_hasher'] = PasswordHasher(
+                    rounds=config.get('BCRYPT_ROUNDS', DEFAULT_ROUNDS),
+                    workers=config.get('PASSWORD_HASH_WORKERS', 2),
+                    queue_size=config.get('PASSWORD_HASH_QUEUE_SIZE', 32),
+                    timeout=config.get('PASSWORD_HASH_TIMEOUT', 10)
+                )
+    return hasher
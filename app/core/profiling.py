@@ -0,0 +1,183 @@
+import cProfile
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List
+from flask import current_app, g, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask_login import current_user
+from app.core.identity import get_user
+
+_LABEL_RE = re.compile(r'[^A-Za-z0-9_.-]+')
+
+class SamplingProfiler:
+    """Samples one thread's call stack at a fixed interval from a helper thread.
+
+    Output is in the folded stack format ("outer;inner;leaf count" per line)
+    read by flamegraph.pl, speedscope and most other flamegraph tools. The
+    profiled code is not instrumented, so the overhead stays small enough for
+    production traffic.
+    """
+
+    extension = '.folded'
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread_id = None
+        self._sampler = None
+
+    def start(self) -> None:
+        self._thread_id = threading.get_ident()
+        self._sampler = threading.Thread(target=self._sample, name='profiler', daemon=True)
+        self._sampler.start()
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is None:
+                return
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                # co_qualname (Class.method) is only there from Python 3.11
+                names.append(f"{frame.f_globals.get('__name__', '?')}.{getattr(code, 'co_qualname', code.co_name)}")
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(names))] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._sampler.join()
+
+    def write(self, path: str) -> None:
+        with open(path, 'w') as output:
+            for stack, count in self.stacks.most_common():
+                output.write(f'{stack} {count}\n')
+
+class CProfileProfiler:
+    """Deterministic cProfile of one thread, saved in pstats format.
+
+    Slower than sampling, but exact call counts; view with snakeviz or turn
+    into a flamegraph with flameprof.
+    """
+
+    extension = '.prof'
+
+    def __init__(self, interval: float = 0) -> None:
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> None:
+        self._profile.disable()
+
+    def write(self, path: str) -> None:
+        self._profile.dump_stats(path)
+
+PROFILERS = {'sampling': SamplingProfiler, 'cprofile': CProfileProfiler}
+
+def profiles_dir() -> str:
+    return current_app.config.get('PROFILES_DIR') or os.path.join(current_app.instance_path, 'profiles')
+
+def _profiler():
+    profiler_class = PROFILERS[current_app.config.get('PROFILER', 'sampling')]
+    return profiler_class(current_app.config.get('PROFILE_SAMPLE_INTERVAL_MS', 5) / 1000)
+
+def _profile_path(profiler, label: str) -> str:
+    directory = profiles_dir()
+    os.makedirs(directory, exist_ok=True)
+    name = f"{datetime.utcnow():%Y%m%d-%H%M%S}-{_LABEL_RE.sub('_', label)}-{secrets.token_hex(3)}{profiler.extension}"
+    return os.path.join(directory, name)
+
+def _save(profiler, path: str) -> None:
+    """Write a profile, removing the oldest ones beyond ``PROFILE_MAX_FILES``."""
+    profiler.write(path)
+    profiles = list_profiles()
+    for stale in profiles[current_app.config.get('PROFILE_MAX_FILES', 200):]:
+        os.remove(os.path.join(profiles_dir(), stale['name']))
+
+def list_profiles() -> List[Dict]:
+    """Saved profiles, newest first."""
+    directory = profiles_dir()
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.name.endswith(('.folded', '.prof')):
+            stat = entry.stat()
+            profiles.append({
+                'name': entry.name,
+                'size': stat.st_size,
+                'created_at': datetime.utcfromtimestamp(stat.st_mtime).isoformat()
+            })
+    return sorted(profiles, key=lambda profile: profile['name'], reverse=True)
+
+@contextmanager
+def profile_job(job_id: str) -> Iterator[None]:
+    """Profile a scheduled job if ``PROFILE_JOBS`` names it (or is 'all')."""
+    jobs = current_app.config.get('PROFILE_JOBS', ())
+    if job_id not in jobs and 'all' not in jobs:
+        yield
+        return
+    profiler = _profiler()
+    path = _profile_path(profiler, f'job-{job_id}')
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        _save(profiler, path)
+        current_app.logger.info('Saved profile of job %s to %s', job_id, path)
+
+def _requested_by_admin() -> bool:
+    if not (request.headers.get('X-Profile') or request.args.get('profile')):
+        return False
+    if current_user.is_authenticated:
+        return bool(current_user.is_admin)
+    try:
+        verify_jwt_in_request(optional=True)
+        user = get_user(get_jwt_identity())
+    except Exception:
+        return False
+    return bool(user and user.is_admin)
+
+def init_profiling(app) -> None:
+    """Profile requests an admin asks for, plus ``PROFILE_SAMPLE_RATE`` percent of all requests.
+
+    Admins ask with an ``X-Profile`` header or a ``profile`` query argument;
+    the saved profile's name comes back in the ``X-Profile-Id`` header.
+    """
+    @app.before_request
+    def start_profiler():
+        if request.endpoint == 'static':
+            return
+        rate = app.config.get('PROFILE_SAMPLE_RATE', 0)
+        if not (rate and random.random() * 100 < rate) and not _requested_by_admin():
+            return
+        profiler = _profiler()
+        g.profile_path = _profile_path(profiler, request.endpoint or 'unmatched')
+        g.profiler = profiler
+        profiler.start()
+
+    @app.after_request
+    def add_profile_header(response):
+        path = g.get('profile_path')
+        if path:
+            response.headers['X-Profile-Id'] = os.path.basename(path)
+        return response
+
+    # Runs once a streamed response has finished, so streams are profiled in full
+    @app.teardown_request
+    def stop_profiler(exc=None):
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.stop()
+            _save(profiler, g.profile_path)
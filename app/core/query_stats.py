@@ -0,0 +1,126 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Tuple
+from flask import current_app, g, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Trackers active in this context; a query counts towards all of them so a
+# test can wrap a request that tracks its own queries
+_active: ContextVar[Tuple['QueryStats', ...]] = ContextVar('query_stats', default=())
+
+# Bound parameter lists, so IN clauses of any length share one shape
+_PARAM_LIST_RE = re.compile(r'\(\s*(?:\?|%s|:\w+|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|:\w+|%\(\w+\)s))*\s*\)')
+_SPACE_RE = re.compile(r'\s+')
+
+def statement_shape(statement: str) -> str:
+    """A statement with whitespace and bound parameter lists normalized."""
+    return _PARAM_LIST_RE.sub('(?)', _SPACE_RE.sub(' ', statement).strip())
+
+class QueryStats:
+    """Queries run and time spent in them, for one request, job or test.
+
+    Attributes:
+        count (int): Statements executed; an executemany counts once
+        duration (float): Seconds spent executing them
+        shapes (Counter): Executions per statement shape
+    """
+
+    def __init__(self, label: str = '') -> None:
+        self.label = label
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes run at least ``threshold`` times, most frequent first; likely N+1 queries."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+    def summary(self) -> str:
+        return f'{self.count} queries in {self.duration * 1000:.1f}ms'
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'duration_ms': round(self.duration * 1000, 3), 'shapes': dict(self.shapes)}
+
+# The start time lives on the execution context, which is dropped with the
+# statement, so one that raises leaves nothing behind on the pooled connection
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _active.get():
+        context._query_start_time = time.perf_counter()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_execute(conn, cursor, statement, parameters, context, executemany):
+    start = getattr(context, '_query_start_time', None)
+    if start is None:
+        return
+    duration = time.perf_counter() - start
+    for stats in _active.get():
+        stats.record(statement, duration)
+
+@contextmanager
+def track_queries(label: str = '') -> Iterator[QueryStats]:
+    """Count the queries run inside the block, on this thread."""
+    stats = QueryStats(label)
+    token = _active.set(_active.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active.reset(token)
+
+def _report(stats: QueryStats) -> None:
+    threshold = current_app.config.get('QUERY_REPEAT_THRESHOLD', 5)
+    for shape, count in stats.repeated(threshold):
+        current_app.logger.warning('Likely N+1 in %s: %d x %s', stats.label, count, shape[:200])
+
+@contextmanager
+def log_queries(label: str, totals: bool = True) -> Iterator[QueryStats]:
+    """Track a background job's queries and log their totals and likely N+1s.
+
+    Pass ``totals=False`` for frequent jobs to log only likely N+1s.
+    """
+    with track_queries(label) as stats:
+        yield stats
+    if totals:
+        current_app.logger.info('Job %s: %s', label, stats.summary())
+    _report(stats)
+
+def init_query_stats(app) -> None:
+    """Track each request's queries.
+
+    Totals go into a ``Server-Timing`` header and the request log, and
+    statement shapes repeated ``QUERY_REPEAT_THRESHOLD`` times or more are
+    logged as likely N+1 queries.
+    """
+    if not app.config.get('QUERY_STATS_ENABLED', True):
+        return
+
+    @app.before_request
+    def start_query_stats():
+        g.query_stats = QueryStats(f'{request.method} {request.endpoint or request.path}')
+        g.query_stats_token = _active.set(_active.get() + (g.query_stats,))
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = g.get('query_stats')
+        if stats is not None:
+            if app.config.get('QUERY_STATS_SERVER_TIMING', True):
+                response.headers.add(
+                    'Server-Timing', f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries"'
+                )
+            _report(stats)
+        return response
+
+    @app.teardown_request
+    def stop_query_stats(exc=None):
+        token = g.pop('query_stats_token', None)
+        if token is not None:
+            _active.reset(token)
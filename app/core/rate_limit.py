@@ -0,0 +1,221 @@
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+from flask import current_app
+
+# Groups of routes sharing a limit; views join one with @rate_limit_group
+RATE_LIMIT_GROUPS = ('default', 'auth', 'ocr', 'sync', 'reports')
+
+# Limits like "30 per minute" or "30/minute"
+_LIMIT_RE = re.compile(r'^\s*(\d+)\s*(?:per|/)\s*(\d*)\s*(second|minute|hour|day)s?\s*$')
+_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Bucket updates between removals of buckets that have refilled completely
+PRUNE_EVERY = 1000
+
+_create_lock = threading.Lock()
+
+@lru_cache(maxsize=64)
+def parse_limit(limit: str) -> Tuple[int, int]:
+    """Parse a limit such as "30 per minute" into (requests, period in seconds)."""
+    match = _LIMIT_RE.match(limit.lower())
+    if not match:
+        raise ValueError(f'Invalid rate limit: {limit}')
+    count, multiple, period = match.groups()
+    return int(count), int(multiple or 1) * _PERIODS[period]
+
+def rate_limit_group(group: str) -> Callable:
+    """Put a view in a rate limit group, giving it that group's limit and concurrency cap."""
+    if group not in RATE_LIMIT_GROUPS:
+        raise ValueError(f'Unknown rate limit group: {group}')
+
+    def decorator(f):
+        f.rate_limit_group = group
+        return f
+    return decorator
+
+def _spend(bucket: Optional[Tuple[float, float]], capacity: int, period: int, now: float) -> Tuple[float, bool]:
+    """Refill a token bucket up to now and take one token from it if it has one.
+
+    Returns:
+        Tuple of (tokens left, whether a token was taken)
+    """
+    tokens, updated = bucket if bucket else (capacity, now)
+    tokens = min(capacity, tokens + max(0.0, now - updated) * capacity / period)
+    if tokens >= 1:
+        return tokens - 1, True
+    return tokens, False
+
+def _full_at(tokens: float, capacity: int, period: int, now: float) -> float:
+    """When a bucket will have refilled completely; after that it equals a missing one."""
+    return now + (capacity - tokens) * period / capacity
+
+class MemoryRateLimitStore:
+    """Token buckets in this process only, for single-worker setups and tests."""
+
+    def __init__(self) -> None:
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+        self._lock = threading.Lock()
+        self._updates = 0
+
+    def take(self, key: str, capacity: int, period: int) -> Tuple[float, bool]:
+        now = time.time()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            tokens, allowed = _spend(bucket[:2] if bucket else None, capacity, period, now)
+            self._buckets[key] = (tokens, now, _full_at(tokens, capacity, period, now))
+            self._updates += 1
+            if self._updates % PRUNE_EVERY == 0:
+                self._buckets = {k: b for k, b in self._buckets.items() if b[2] > now}
+        return tokens, allowed
+
+class SQLiteRateLimitStore:
+    """Token buckets in a SQLite file shared by every worker process on the host.
+
+    Each update is one short ``BEGIN IMMEDIATE`` transaction on a WAL-mode
+    database, so workers see each other's requests without a separate server.
+    Connections are kept per thread.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._updates = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            # Losing the last moments of counts in a crash is acceptable
+            connection.execute('PRAGMA synchronous=OFF')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS buckets '
+                '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL)'
+            )
+            connection.execute('CREATE INDEX IF NOT EXISTS ix_buckets_full_at ON buckets (full_at)')
+            self._local.connection = connection
+        return connection
+
+    def take(self, key: str, capacity: int, period: int) -> Tuple[float, bool]:
+        connection = self._connection()
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            bucket = connection.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens, allowed = _spend(bucket, capacity, period, now)
+            connection.execute(
+                'INSERT OR REPLACE INTO buckets (key, tokens, updated, full_at) VALUES (?, ?, ?, ?)',
+                (key, tokens, now, _full_at(tokens, capacity, period, now))
+            )
+            self._updates += 1
+            if self._updates % PRUNE_EVERY == 0:
+                connection.execute('DELETE FROM buckets WHERE full_at <= ?', (now,))
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return tokens, allowed
+
+class RateLimiter:
+    """Token bucket rate limits per route group and client.
+
+    Each group's limit (``RATE_LIMIT_<GROUP>``, e.g. "30 per minute") is a
+    bucket of that many requests refilling evenly over the period, so clients
+    may burst up to the limit and then continue at its average rate. Signed
+    in users are counted by user ID and everyone else by IP address; the auth
+    group is always counted by IP address.
+    """
+
+    def __init__(self, store) -> None:
+        self.store = store
+
+    def hit(self, group: str, client: str) -> Optional[Dict]:
+        """Count a request, returning its limit state, or None if the group is unlimited.
+
+        The state has ``allowed``, ``limit``, ``remaining``, ``reset`` (seconds
+        until the bucket is full again) and ``retry_after`` (seconds until a
+        refused request would be allowed). Requests are allowed if the store
+        fails, so a broken store never takes the site down.
+        """
+        limit = current_app.config.get(f'RATE_LIMIT_{group.upper()}')
+        if not limit:
+            return None
+        capacity, period = parse_limit(limit)
+        try:
+            tokens, allowed = self.store.take(f'{group}:{client}', capacity, period)
+        except Exception as e:
+            current_app.logger.error(f"Rate limit store error: {str(e)}")
+            return None
+        return {
+            'allowed': allowed,
+            'limit': capacity,
+            'period': period,
+            'remaining': int(tokens),
+            'reset': math.ceil((capacity - tokens) * period / capacity),
+            'retry_after': 0 if allowed else max(1, math.ceil((1 - tokens) * period / capacity))
+        }
+
+class ConcurrencyLimiter:
+    """Caps on requests running at once per route group, in this process.
+
+    A request over its group's ``MAX_CONCURRENT_<GROUP>`` is refused straight
+    away instead of waiting for a worker, so bursts on expensive routes are
+    shed before they pile up into timeouts.
+    """
+
+    def __init__(self) -> None:
+        self._running: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def acquire(self, group: str) -> bool:
+        cap = current_app.config.get(f'MAX_CONCURRENT_{group.upper()}', 0)
+        with self._lock:
+            running = self._running.get(group, 0)
+            if cap and running >= cap:
+                self.rejected += 1
+                return False
+            self._running[group] = running + 1
+        return True
+
+    def release(self, group: str) -> None:
+        with self._lock:
+            self._running[group] -= 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'running': dict(self._running), 'rejected': self.rejected}
+
+def get_rate_limiter() -> RateLimiter:
+    """The app's rate limiter, created on first use."""
+    limiter = current_app.extensions.get('rate_limiter')
+    if limiter is None:
+        with _create_lock:
+            limiter = current_app.extensions.get('rate_limiter')
+            if limiter is None:
+                if current_app.config.get('RATE_LIMIT_STORAGE', 'sqlite') == 'memory':
+                    store = MemoryRateLimitStore()
+                else:
+                    path = current_app.config.get('RATE_LIMIT_STORAGE_PATH') or os.path.join(
+                        current_app.instance_path, 'rate_limits.sqlite'
+                    )
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    store = SQLiteRateLimitStore(path)
+                limiter = current_app.extensions['rate_limiter'] = RateLimiter(store)
+    return limiter
+
+def get_concurrency_limiter() -> ConcurrencyLimiter:
+    """The app's concurrency limiter, created on first use."""
+    limiter = current_app.extensions.get('concurrency_limiter')
+    if limiter is None:
+        with _create_lock:
+            limiter = current_app.extensions.get('concurrency_limiter')
+            if limiter is None:
+                limiter = current_app.extensions['concurrency_limiter'] = ConcurrencyLimiter()
+    return limiter
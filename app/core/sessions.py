@@ -0,0 +1,144 @@
+import hashlib
+import secrets
+from datetime import datetime, timedelta
+from typing import Optional
+from flask import Flask
+from flask.sessions import SessionInterface, SessionMixin, session_json_serializer
+from sqlalchemy import delete, insert, select, update
+from werkzeug.datastructures import CallbackDict
+from app.core.extensions import db
+from app.models.server_session import ServerSession
+
+# Expired sessions removed per DELETE by the sweeper
+SWEEP_BATCH_SIZE = 1000
+
+class DatabaseSession(CallbackDict, SessionMixin):
+    """Session contents, tracking whether they changed during the request."""
+
+    def __init__(self, initial=None, token: Optional[str] = None, expires_at: Optional[datetime] = None) -> None:
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.token = token
+        self.expires_at = expires_at
+        self.new = token is None
+        self.modified = False
+
+class DatabaseSessionInterface(SessionInterface):
+    """Server-side sessions stored in the ``sessions`` table.
+
+    The cookie holds a random token and the table row is keyed by its SHA-256,
+    so any web node can serve any request and a leaked table cannot be used to
+    forge cookies. Rows are written only when the session changes, or at most
+    once every ``SESSION_TOUCH_SECONDS`` to push back the expiry of a session
+    in use; other requests neither write nor resend the cookie. Expired rows
+    are ignored when read and deleted by ``delete_expired_sessions``.
+
+    Session I/O runs on its own connection so it never commits the request's
+    ORM session.
+    """
+
+    serializer = session_json_serializer
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def open_session(self, app: Flask, request) -> DatabaseSession:
+        token = request.cookies.get(self.get_cookie_name(app))
+        if not token:
+            return DatabaseSession()
+
+        table = ServerSession.__table__
+        with db.engine.connect() as connection:
+            row = connection.execute(
+                select(table.c.data, table.c.expires_at).where(
+                    table.c.id == self._key(token),
+                    table.c.expires_at > datetime.utcnow()
+                )
+            ).first()
+        if row is None:
+            return DatabaseSession()
+        try:
+            data = self.serializer.loads(row.data)
+        except ValueError:
+            return DatabaseSession()
+        return DatabaseSession(data, token, row.expires_at)
+
+    def save_session(self, app: Flask, session: DatabaseSession, response) -> None:
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        response.vary.add('Cookie')
+        table = ServerSession.__table__
+
+        if not session:
+            # Emptied, e.g. on logout: drop the row and the cookie
+            if session.token is not None and session.modified:
+                with db.engine.begin() as connection:
+                    connection.execute(delete(table).where(table.c.id == self._key(session.token)))
+                response.delete_cookie(
+                    name, domain=domain, path=path, secure=self.get_cookie_secure(app),
+                    samesite=self.get_cookie_samesite(app), httponly=self.get_cookie_httponly(app)
+                )
+            return
+
+        now = datetime.utcnow()
+        expires_at = now + app.permanent_session_lifetime
+        touch_after = session.expires_at and session.expires_at + timedelta(
+            seconds=app.config.get('SESSION_TOUCH_SECONDS', 300)
+        )
+        with db.engine.begin() as connection:
+            if session.new:
+                session.token = secrets.token_urlsafe(32)
+                self._insert(connection, session, expires_at, now)
+            elif session.modified:
+                updated = connection.execute(
+                    update(table).where(table.c.id == self._key(session.token)).values(
+                        data=self.serializer.dumps(dict(session)), expires_at=expires_at
+                    )
+                )
+                if not updated.rowcount:
+                    # Swept or deleted by another request meanwhile
+                    self._insert(connection, session, expires_at, now)
+            elif touch_after <= expires_at:
+                connection.execute(
+                    update(table).where(table.c.id == self._key(session.token)).values(expires_at=expires_at)
+                )
+            else:
+                return
+
+        response.set_cookie(
+            name,
+            session.token,
+            expires=self.get_expiration_time(app, session),
+            httponly=self.get_cookie_httponly(app),
+            domain=domain,
+            path=path,
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app)
+        )
+
+    def _insert(self, connection, session: DatabaseSession, expires_at: datetime, now: datetime) -> None:
+        connection.execute(insert(ServerSession.__table__).values(
+            id=self._key(session.token),
+            data=self.serializer.dumps(dict(session)),
+            expires_at=expires_at,
+            created_at=now
+        ))
+
+def delete_expired_sessions(batch_size: int = SWEEP_BATCH_SIZE) -> int:
+    """Delete expired sessions in batches so no single statement holds a long lock.
+
+    Returns:
+        Number of sessions deleted
+    """
+    table = ServerSession.__table__
+    deleted = 0
+    while True:
+        expired = select(table.c.id).where(table.c.expires_at <= datetime.utcnow()).limit(batch_size)
+        with db.engine.begin() as connection:
+            removed = connection.execute(delete(table).where(table.c.id.in_(expired))).rowcount
+        deleted += removed
+        if removed < batch_size:
+            return deleted
@@ -3,5 +3,10 @@ from app.models.base import BaseModel
 from app.models.user import User
 from app.models.item import Item
 from app.models.notification import Notification
+from app.models.inventory_stats import UserInventoryStats
+from app.models.inventory_snapshot import InventorySnapshot
+from app.models.ocr_result import OCRResult
+from app.models.server_session import ServerSession
+from app.models.zoho_sync_state import ZohoSyncState
 
-__all__ = ['BaseModel', 'User', 'Item', 'Notification'] 
\ No newline at end of file
+__all__ = ['BaseModel', 'User', 'Item', 'Notification', 'UserInventoryStats', 'InventorySnapshot', 'OCRResult', 'ServerSession', 'ZohoSyncState'] 
\ No newline at end of file
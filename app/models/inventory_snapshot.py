@@ -0,0 +1,171 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import delete, insert, select
+from app.core.extensions import db
+
+PERIODS = ('day', 'week', 'month')
+
+# Per-snapshot measures; rollups carry the closing values of their last day
+SNAPSHOT_FIELDS = (
+    'total_items', 'expired_items', 'expiring_items', 'low_stock_items', 'critical_items',
+    'expires_today', 'expires_next_week', 'expires_next_month', 'expires_next_quarter',
+    'expires_later', 'no_expiry', 'total_value'
+)
+
+class InventorySnapshot(db.Model):
+    """Daily inventory snapshot per user, with weekly and monthly rollups.
+
+    Daily rows are append-only: one is written per user per day and never
+    changed afterwards. Week and month rows are rebuilt from the daily rows of
+    their period each time a new day is added, and hold the closing values of
+    the latest day along with the number of days sampled.
+
+    Attributes:
+        period (str): 'day', 'week' or 'month'
+        period_start (date): Snapshot day, Monday of the week or first of the month
+        period_end (date): Last day sampled in the period
+        samples (int): Number of daily snapshots in the period
+    """
+
+    __tablename__ = 'inventory_snapshots'
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    period = db.Column(db.String(5), nullable=False, default='day')
+    period_start = db.Column(db.Date, nullable=False)
+    period_end = db.Column(db.Date, nullable=False)
+    samples = db.Column(db.Integer, nullable=False, default=1)
+    total_items = db.Column(db.Integer, nullable=False, default=0)
+    expired_items = db.Column(db.Integer, nullable=False, default=0)
+    expiring_items = db.Column(db.Integer, nullable=False, default=0)
+    low_stock_items = db.Column(db.Integer, nullable=False, default=0)
+    critical_items = db.Column(db.Integer, nullable=False, default=0)
+    expires_today = db.Column(db.Integer, nullable=False, default=0)
+    expires_next_week = db.Column(db.Integer, nullable=False, default=0)
+    expires_next_month = db.Column(db.Integer, nullable=False, default=0)
+    expires_next_quarter = db.Column(db.Integer, nullable=False, default=0)
+    expires_later = db.Column(db.Integer, nullable=False, default=0)
+    no_expiry = db.Column(db.Integer, nullable=False, default=0)
+    total_value = db.Column(db.Float, nullable=False, default=0.0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'period', 'period_start', name='uq_inventory_snapshots_period'),
+        db.CheckConstraint("period IN ('day', 'week', 'month')", name='check_inventory_snapshot_period'),
+    )
+
+    @staticmethod
+    def snapshot_values(analytics) -> Dict[str, float]:
+        """Snapshot measures computed from a user's ``InventoryAnalytics``."""
+        summary = analytics.summary()
+        histogram = analytics.expiry_histogram()
+        return {
+            'total_items': summary['total_items'],
+            'expired_items': summary['expired_items'],
+            'expiring_items': summary['expiring_items'],
+            'low_stock_items': summary['low_stock_items'],
+            'critical_items': summary['critical_items'],
+            'expires_today': histogram['today'],
+            'expires_next_week': histogram['next_week'],
+            'expires_next_month': histogram['next_month'],
+            'expires_next_quarter': histogram['next_quarter'],
+            'expires_later': histogram['later'],
+            'no_expiry': histogram['no_expiry'],
+            'total_value': float(analytics.frame['value'].sum())
+        }
+
+    @classmethod
+    def record_day(cls, values_by_user: Dict[int, Dict[str, float]], day: date) -> int:
+        """Append daily snapshots for users without one for ``day`` and refresh their rollups.
+
+        Returns:
+            Number of daily snapshots written
+        """
+        table = cls.__table__
+        existing = set(db.session.execute(
+            select(table.c.user_id).where(
+                table.c.user_id.in_(list(values_by_user)),
+                table.c.period == 'day',
+                table.c.period_start == day
+            )
+        ).scalars())
+        rows = [
+            dict(values, user_id=user_id, period='day', period_start=day, period_end=day,
+                 samples=1, created_at=datetime.utcnow())
+            for user_id, values in values_by_user.items() if user_id not in existing
+        ]
+        if rows:
+            db.session.execute(insert(table), rows)
+        cls.roll_up(list(values_by_user), day)
+        return len(rows)
+
+    @classmethod
+    def roll_up(cls, user_ids: List[int], day: date) -> None:
+        """Rebuild the week and month rows containing ``day`` from their daily rows."""
+        table = cls.__table__
+        starts = {'week': day - timedelta(days=day.weekday()), 'month': day.replace(day=1)}
+        daily = db.session.execute(
+            select(table).where(
+                table.c.user_id.in_(user_ids),
+                table.c.period == 'day',
+                table.c.period_start >= min(starts.values()),
+                table.c.period_start <= day
+            ).order_by(table.c.user_id, table.c.period_start)
+        ).mappings().all()
+
+        rows = []
+        for period, start in starts.items():
+            by_user = {}
+            for snapshot in daily:
+                if snapshot['period_start'] >= start:
+                    by_user.setdefault(snapshot['user_id'], []).append(snapshot)
+            for user_id, snapshots in by_user.items():
+                closing = snapshots[-1]
+                rows.append(dict(
+                    {field: closing[field] for field in SNAPSHOT_FIELDS},
+                    user_id=user_id, period=period, period_start=start,
+                    period_end=closing['period_start'], samples=len(snapshots),
+                    created_at=datetime.utcnow()
+                ))
+            db.session.execute(
+                delete(table).where(
+                    table.c.user_id.in_(list(by_user)),
+                    table.c.period == period,
+                    table.c.period_start == start
+                )
+            )
+        if rows:
+            db.session.execute(insert(table), rows)
+
+    @classmethod
+    def series(cls, user_id: int, period: str, start: date, end: date,
+               fields: Optional[Iterable[str]] = None) -> Dict[str, List]:
+        """Columnar time series of a user's snapshots for charting."""
+        fields = list(fields or SNAPSHOT_FIELDS)
+        table = cls.__table__
+        rows = db.session.execute(
+            select(table.c.period_start, *[table.c[field] for field in fields]).where(
+                table.c.user_id == user_id,
+                table.c.period == period,
+                table.c.period_start >= start,
+                table.c.period_start <= end
+            ).order_by(table.c.period_start)
+        ).all()
+        series = {'dates': [row.period_start.isoformat() for row in rows]}
+        for index, field in enumerate(fields, start=1):
+            series[field] = [row[index] for row in rows]
+        return series
+
+    def to_dict(self) -> Dict:
+        """Convert snapshot to dictionary."""
+        data = {field: getattr(self, field) for field in SNAPSHOT_FIELDS}
+        data.update({
+            'period': self.period,
+            'period_start': self.period_start.isoformat(),
+            'period_end': self.period_end.isoformat(),
+            'samples': self.samples
+        })
+        return data
+
+    def __repr__(self):
+        return f'<InventorySnapshot user={self.user_id} {self.period} {self.period_start}>'
@@ -0,0 +1,222 @@
+from datetime import datetime, date, time, timedelta
+from typing import Dict, Optional
+from sqlalchemy import and_, case, event, func, insert, inspect, select, update
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
+from app.core.extensions import db
+from app.models.item import Item, EXPIRING_SOON_DAYS
+
+# Thresholds shared with reports and item statuses
+LOW_STOCK_THRESHOLD = 10
+EXPIRING_STATUS_DAYS = 7
+
+# Item attributes that affect the counters
+TRACKED_FIELDS = ('user_id', 'quantity', 'cost_price', 'expiry_date')
+
+COUNTER_FIELDS = (
+    'total_items', 'expiring_items', 'expiring_soon_items',
+    'expired_items', 'low_stock_items', 'total_value'
+)
+
+class UserInventoryStats(db.Model):
+    """Per-user inventory counters kept current by item insert/update/delete events.
+
+    Counts that depend on today's date are only valid for ``as_of``. A row with
+    an older ``as_of`` is rebuilt on first use, and every row is rebuilt by the
+    midnight ``rebuild_inventory_stats`` job.
+
+    Attributes:
+        total_items (int): Number of items
+        expiring_items (int): Items expiring in 1-30 days (report definition)
+        expiring_soon_items (int): Items expiring in 0-7 days (item status definition)
+        expired_items (int): Items past their expiry date
+        low_stock_items (int): Items with quantity below ``LOW_STOCK_THRESHOLD``
+        total_value (float): Sum of quantity * cost price
+        as_of (date): Day the date-based counts were computed for
+    """
+
+    __tablename__ = 'user_inventory_stats'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    total_items = db.Column(db.Integer, nullable=False, default=0)
+    expiring_items = db.Column(db.Integer, nullable=False, default=0)
+    expiring_soon_items = db.Column(db.Integer, nullable=False, default=0)
+    expired_items = db.Column(db.Integer, nullable=False, default=0)
+    low_stock_items = db.Column(db.Integer, nullable=False, default=0)
+    total_value = db.Column(db.Float, nullable=False, default=0.0)
+    as_of = db.Column(db.Date, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    @classmethod
+    def for_user(cls, user_id: int) -> 'UserInventoryStats':
+        """Get a user's counters, rebuilding them first if missing or stale."""
+        stats = db.session.get(cls, user_id)
+        if stats is None or stats.as_of != datetime.now().date():
+            cls.rebuild(user_id)
+            db.session.commit()
+            stats = db.session.get(cls, user_id, populate_existing=True)
+        return stats
+
+    @classmethod
+    def rebuild(cls, user_id: Optional[int] = None, connection=None) -> int:
+        """Recompute counters from the items table for one user, or for everyone.
+
+        Returns:
+            Number of users whose counters were written
+        """
+        connection = connection or db.session.connection()
+        today = datetime.now().date()
+        stmt = _aggregate_query(today)
+        if user_id is not None:
+            stmt = stmt.where(Item.user_id == user_id)
+        rows = {row.user_id: row._asdict() for row in connection.execute(stmt)}
+        if user_id is not None and user_id not in rows:
+            rows[user_id] = dict({field: 0 for field in COUNTER_FIELDS}, user_id=user_id, total_value=0.0)
+
+        table = cls.__table__
+        if user_id is None:
+            # Users whose last item was deleted keep a row; zero it
+            reset = update(table).values(
+                as_of=today, updated_at=datetime.utcnow(),
+                **{field: 0 for field in COUNTER_FIELDS}
+            )
+            if rows:
+                reset = reset.where(table.c.user_id.not_in(list(rows)))
+            connection.execute(reset)
+        for values in rows.values():
+            values = dict(values, as_of=today, updated_at=datetime.utcnow())
+            result = connection.execute(
+                update(table).where(table.c.user_id == values['user_id']).values(**values)
+            )
+            if result.rowcount == 0:
+                connection.execute(insert(table).values(**values))
+        return len(rows)
+
+    def to_dict(self) -> Dict:
+        """Convert counters to dictionary."""
+        return {
+            'user_id': self.user_id,
+            'total_items': self.total_items,
+            'expiring_items': self.expiring_items,
+            'expiring_soon_items': self.expiring_soon_items,
+            'expired_items': self.expired_items,
+            'low_stock_items': self.low_stock_items,
+            'total_value': self.total_value,
+            'as_of': self.as_of.isoformat() if self.as_of else None
+        }
+
+    def __repr__(self):
+        return f'<UserInventoryStats user={self.user_id} total={self.total_items}>'
+
+def _day_start(day: date, offset: int = 0) -> datetime:
+    return datetime.combine(day + timedelta(days=offset), time.min)
+
+def _aggregate_query(today: date):
+    """Per-user counter aggregates over the items table."""
+    def count_between(start: int, end: int):
+        # Items whose expiry day is within [today + start, today + end)
+        return func.sum(case((and_(
+            Item.expiry_date >= _day_start(today, start),
+            Item.expiry_date < _day_start(today, end)
+        ), 1), else_=0))
+
+    return select(
+        Item.user_id,
+        func.count(Item.id).label('total_items'),
+        count_between(1, EXPIRING_SOON_DAYS + 1).label('expiring_items'),
+        count_between(0, EXPIRING_STATUS_DAYS + 1).label('expiring_soon_items'),
+        func.sum(case((Item.expiry_date < _day_start(today), 1), else_=0)).label('expired_items'),
+        func.sum(case((func.coalesce(Item.quantity, 0) < LOW_STOCK_THRESHOLD, 1), else_=0)).label('low_stock_items'),
+        func.coalesce(func.sum(func.coalesce(Item.quantity, 0) * func.coalesce(Item.cost_price, 0)), 0.0).label('total_value')
+    ).group_by(Item.user_id)
+
+def item_contribution(quantity, cost_price, expiry_date, today: date) -> Dict[str, float]:
+    """Counter values contributed by a single item."""
+    days = None
+    if expiry_date:
+        expiry_day = expiry_date.date() if isinstance(expiry_date, datetime) else expiry_date
+        days = (expiry_day - today).days
+    return {
+        'total_items': 1,
+        'expiring_items': int(days is not None and 0 < days <= EXPIRING_SOON_DAYS),
+        'expiring_soon_items': int(days is not None and 0 <= days <= EXPIRING_STATUS_DAYS),
+        'expired_items': int(days is not None and days < 0),
+        'low_stock_items': int((quantity or 0) < LOW_STOCK_THRESHOLD),
+        'total_value': (quantity or 0) * (cost_price or 0)
+    }
+
+def _apply_delta(connection, user_id: int, delta: Dict[str, float], today: date) -> None:
+    """Add accumulated item contributions to a user's counters."""
+    table = UserInventoryStats.__table__
+    result = connection.execute(
+        update(table).where(table.c.user_id == user_id, table.c.as_of == today).values(
+            updated_at=datetime.utcnow(),
+            **{field: table.c[field] + delta[field] for field in COUNTER_FIELDS}
+        )
+    )
+    if result.rowcount == 0:
+        # No current row yet: compute it from scratch, this flush included
+        UserInventoryStats.rebuild(user_id, connection=connection)
+
+def _record_change(target: Item, user_id: int, quantity, cost_price, expiry_date, sign: int) -> None:
+    """Queue an item's contribution on its session, to be applied once the flush finishes."""
+    session = object_session(target)
+    today = datetime.now().date()
+    pending = session.info.setdefault('inventory_stats_deltas', {})
+    delta = pending.setdefault(user_id, {field: 0 for field in COUNTER_FIELDS})
+    for field, value in item_contribution(quantity, cost_price, expiry_date, today).items():
+        delta[field] += sign * value
+
+def _track_old_value(target, value, oldvalue, initiator):
+    return value
+
+# Keep the replaced value of tracked attributes in their history, loading it if needed
+for _field in TRACKED_FIELDS:
+    event.listen(getattr(Item, _field), 'set', _track_old_value, retval=True, active_history=True)
+
+@event.listens_for(Item, 'before_update')
+@event.listens_for(Item, 'before_delete')
+def _load_tracked_values(mapper, connection, target):
+    # Make sure values expired by an earlier commit are loaded while the row still exists
+    for field in TRACKED_FIELDS:
+        getattr(target, field)
+
+@event.listens_for(Item, 'after_insert')
+def _item_inserted(mapper, connection, target):
+    _record_change(target, target.user_id, target.quantity, target.cost_price, target.expiry_date, 1)
+
+@event.listens_for(Item, 'after_delete')
+def _item_deleted(mapper, connection, target):
+    values = inspect(target).dict
+    _record_change(target, values['user_id'], values['quantity'], values['cost_price'], values['expiry_date'], -1)
+
+@event.listens_for(Item, 'after_update')
+def _item_updated(mapper, connection, target):
+    histories = {field: get_history(target, field) for field in TRACKED_FIELDS}
+    if not any(history.has_changes() for history in histories.values()):
+        return
+
+    def value(history, old):
+        changed = history.deleted if old else history.added
+        if changed:
+            return changed[0]
+        return history.unchanged[0] if history.unchanged else None
+
+    old = {field: value(history, True) for field, history in histories.items()}
+    new = {field: value(history, False) for field, history in histories.items()}
+    _record_change(target, old['user_id'], old['quantity'], old['cost_price'], old['expiry_date'], -1)
+    _record_change(target, new['user_id'], new['quantity'], new['cost_price'], new['expiry_date'], 1)
+
+@event.listens_for(Session, 'after_flush')
+def _apply_pending_changes(session, flush_context):
+    pending = session.info.pop('inventory_stats_deltas', None)
+    if not pending:
+        return
+    connection = session.connection()
+    today = datetime.now().date()
+    for user_id, delta in pending.items():
+        _apply_delta(connection, user_id, delta, today)
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending_changes(session, previous_transaction):
+    session.info.pop('inventory_stats_deltas', None)
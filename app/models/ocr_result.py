@@ -0,0 +1,23 @@
+from datetime import datetime
+from app.core.extensions import db
+
+class OCRResult(db.Model):
+    """Persisted OCR result for an image, keyed by the SHA-256 of its bytes.
+
+    Attributes:
+        image_hash (str): Hex SHA-256 of the raw image bytes
+        perceptual_hash (int): 64-bit difference hash of the decoded image
+        date (str): Extracted date as YYYY-MM-DD, or None if no date was found
+        confidence (float): Confidence of the extracted date
+    """
+
+    __tablename__ = 'ocr_results'
+
+    image_hash = db.Column(db.String(64), primary_key=True)
+    perceptual_hash = db.Column(db.BigInteger)
+    date = db.Column(db.String(10))
+    confidence = db.Column(db.Float, nullable=False, default=0.0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f'<OCRResult {self.image_hash[:12]} {self.date}>'
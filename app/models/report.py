@@ -1,14 +1,64 @@
 from datetime import datetime
+import json
+import zlib
+from typing import Any, Dict, Optional
 from app.core.extensions import db
 from app.models.base import BaseModel
 
+# Bumped whenever the stored payload layout changes
+REPORT_PAYLOAD_VERSION = 1
+
+def encode_report_data(report_data: Optional[Dict]) -> Optional[bytes]:
+    """Pack report details into a compact, compressed payload.
+
+    Item records that appear in several sections of a report are stored once
+    in an ``items`` table and replaced by references to their IDs. Records are
+    only shared when identical, so decoding always returns the original data.
+    """
+    if report_data is None:
+        return None
+    items = {}
+
+    def pack(value: Any) -> Any:
+        if isinstance(value, dict):
+            return {key: pack(child) for key, child in value.items()}
+        if isinstance(value, list):
+            if value and all(isinstance(child, dict) and 'id' in child for child in value):
+                keys = [str(child['id']) for child in value]
+                if all(items.setdefault(key, child) == child for key, child in zip(keys, value)):
+                    return {'$items': keys}
+            return [pack(child) for child in value]
+        return value
+
+    sections = pack(report_data)
+    payload = {'v': REPORT_PAYLOAD_VERSION, 'items': items, 'data': sections}
+    return zlib.compress(json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8'))
+
+def decode_report_data(payload: Optional[bytes]) -> Optional[Dict]:
+    """Expand a payload written by ``encode_report_data``."""
+    if payload is None:
+        return None
+    packed = json.loads(zlib.decompress(payload).decode('utf-8'))
+    items = packed['items']
+
+    def unpack(value: Any) -> Any:
+        if isinstance(value, dict):
+            if set(value) == {'$items'}:
+                return [dict(items[key]) for key in value['$items']]
+            return {key: unpack(child) for key, child in value.items()}
+        if isinstance(value, list):
+            return [unpack(child) for child in value]
+        return value
+
+    return unpack(packed['data'])
+
 class Report(BaseModel):
     """Model for storing daily inventory reports."""
     
     __tablename__ = 'reports'
     
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    date = db.Column(db.Date, nullable=False, unique=True)
+    date = db.Column(db.Date, nullable=False)
     total_items = db.Column(db.Integer, default=0)
     total_value = db.Column(db.Float, default=0.0)
     expiring_items = db.Column(db.Integer, default=0)
@@ -16,10 +66,16 @@ class Report(BaseModel):
     low_stock_items = db.Column(db.Integer, default=0)
     total_sales = db.Column(db.Float, default=0.0)
     total_purchases = db.Column(db.Float, default=0.0)
-    report_data = db.Column(db.JSON)  # Store detailed report data
+    # Detailed report data, normalized and compressed; only loaded when accessed
+    report_payload = db.deferred(db.Column(db.LargeBinary))
     is_public = db.Column(db.Boolean, default=False)  # Whether report is publicly accessible
     public_token = db.Column(db.String(64), unique=True)  # Token for public access
     
+    # One report per user per day
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'date', name='uq_reports_user_date'),
+    )
+    
     # Add relationship to User model
     user = db.relationship('User', backref=db.backref('reports', lazy=True))
     
@@ -30,6 +86,20 @@ class Report(BaseModel):
             if hasattr(self, key):
                 setattr(self, key, value)
     
+    @property
+    def report_data(self) -> Optional[Dict]:
+        """Detailed report data, decoded from the stored payload."""
+        payload = self.report_payload
+        cached = self.__dict__.get('_report_data')
+        if cached is None or cached[0] is not payload:
+            cached = self._report_data = (payload, decode_report_data(payload))
+        return cached[1]
+    
+    @report_data.setter
+    def report_data(self, value: Optional[Dict]) -> None:
+        self.report_payload = encode_report_data(value)
+        self._report_data = (self.report_payload, value)
+    
     def to_dict(self):
         """Convert report to dictionary."""
         data = super().to_dict()
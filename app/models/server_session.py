@@ -0,0 +1,21 @@
+from datetime import datetime
+from app.core.extensions import db
+
+class ServerSession(db.Model):
+    """Server-side web session, looked up by a hash of its cookie value.
+
+    Attributes:
+        id (str): Hex SHA-256 of the session cookie value
+        data (str): Session contents serialized as tagged JSON
+        expires_at (datetime): When the session stops being valid
+    """
+
+    __tablename__ = 'sessions'
+
+    id = db.Column(db.String(64), primary_key=True)
+    data = db.Column(db.Text, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ServerSession {self.id[:12]} expires {self.expires_at}>'
@@ -2,6 +2,7 @@ from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 from app.core.extensions import db
 from app.models.base import BaseModel
+from app.core.passwords import get_password_hasher
 from datetime import datetime, timedelta
 import jwt
 from flask import current_app
@@ -9,7 +10,6 @@ from time import time
 import secrets
 import string
 import re
-import bcrypt
 from typing import Optional
 
 class User(UserMixin, BaseModel):
@@ -77,40 +77,43 @@ class User(UserMixin, BaseModel):
                 "- At least one number\n"
                 "- At least one special character"
             )
-        # Generate a new salt for each password
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        # Hash with a new salt at the configured cost, off the request thread
+        self.password_hash = get_password_hasher().hash(password)
     
     def verify_password(self, password: str) -> bool:
-        """Verify a password against the stored hash."""
+        """Verify a password against the stored hash.
+
+        A hash made at an outdated bcrypt cost is replaced with one at the
+        configured cost when the password matches. Nothing is committed; the
+        login path writes the row at most once and buffers ``last_login``.
+
+        Raises:
+            HasherBusyError: If the password hashing pool is saturated
+        """
         if not self.password_hash:
             return False
             
-        # Verify password using bcrypt
-        try:
-            is_valid = bcrypt.checkpw(
-                password.encode('utf-8'),
-                self.password_hash.encode('utf-8')
-            )
-        except ValueError:
-            # Handle potential invalid hash format
-            return False
+        hasher = get_password_hasher()
+        is_valid = hasher.verify(password, self.password_hash)
         
         if is_valid:
-            self.last_login = datetime.utcnow()
-            db.session.commit()
+            if hasher.needs_rehash(self.password_hash):
+                self.password_hash = hasher.hash(password)
+                hasher.rehashed()
             
         return is_valid
     
     def is_locked(self) -> bool:
-        """Check if the account is currently locked."""
+        """Check if the account is currently locked.
+
+        An expired lock is cleared on the instance; the caller commits it.
+        """
         if not self.locked_until:
             return False
         # If lockout has expired, clear the lock
         if datetime.utcnow() > self.locked_until:
             self.locked_until = None
             self.login_attempts = 0
-            db.session.commit()
             return False
         return True
     
@@ -122,10 +125,16 @@ class User(UserMixin, BaseModel):
         if now > self.locked_until:
             self.locked_until = None
             self.login_attempts = 0
-            db.session.commit()
             return None
         return self.locked_until - now
     
+    def reset_login_attempts(self) -> None:
+        """Clear failed login attempts and any lock, touching only fields that change."""
+        if self.login_attempts:
+            self.login_attempts = 0
+        if self.locked_until is not None:
+            self.locked_until = None
+    
     def _is_strong_password(self, password: str) -> bool:
         """Check if password meets strength requirements."""
         if len(password) < 8:
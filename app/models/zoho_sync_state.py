@@ -0,0 +1,50 @@
+from datetime import datetime
+from typing import Dict, Optional
+from app.core.extensions import db
+
+class ZohoSyncState(db.Model):
+    """Progress and outcome of a user's background Zoho sync.
+
+    A sync is running while ``started_at`` is set. Workers claim a sync by
+    setting it with a conditional UPDATE, so each user has at most one sync
+    running across every process.
+
+    Attributes:
+        started_at (datetime): When the running sync started, or None when idle
+        finished_at (datetime): When the last sync finished, successfully or not
+        last_synced_at (datetime): When the last successful sync finished
+        last_error (str): Why the last sync failed, or None if it succeeded
+        progress_done (int): Items checked so far by the running sync
+        progress_total (int): Items the running sync has to check
+    """
+
+    __tablename__ = 'zoho_sync_states'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    last_synced_at = db.Column(db.DateTime)
+    last_error = db.Column(db.String(255))
+    progress_done = db.Column(db.Integer, nullable=False, default=0)
+    progress_total = db.Column(db.Integer, nullable=False, default=0)
+
+    def age(self, now: Optional[datetime] = None) -> Optional[float]:
+        """Seconds since the last successful sync, or None if there has not been one."""
+        if not self.last_synced_at:
+            return None
+        return ((now or datetime.utcnow()) - self.last_synced_at).total_seconds()
+
+    def to_dict(self) -> Dict:
+        """Convert sync state to dictionary."""
+        age = self.age()
+        return {
+            'running': self.started_at is not None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'last_synced_at': self.last_synced_at.isoformat() if self.last_synced_at else None,
+            'age_seconds': int(age) if age is not None else None,
+            'last_error': self.last_error,
+            'progress': {'done': self.progress_done, 'total': self.progress_total}
+        }
+
+    def __repr__(self):
+        return f'<ZohoSyncState user={self.user_id} last_synced_at={self.last_synced_at}>'
@@ -1,9 +1,13 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, session, current_app, jsonify
 from flask_login import login_user, logout_user, login_required, current_user
 from app.core.extensions import db, login_manager
+from app.core.identity import get_user
+from app.core.rate_limit import rate_limit_group
+from app.core.passwords import HasherBusyError
 from app.models.user import User
 from app.services.zoho_service import ZohoService
 from app.services.email_service import EmailService
+from app.services.user_activity import last_logins
 from datetime import datetime, timedelta
 import jwt
 from typing import Optional
@@ -16,10 +20,11 @@ auth_bp = Blueprint('auth', __name__)
 
 @login_manager.user_loader
 def load_user(user_id):
-    """Load user by ID."""
-    return User.query.get(int(user_id))
+    """Load user by ID, from the identity cache when possible."""
+    return get_user(user_id)
 
 @auth_bp.route('/login', methods=['GET', 'POST'])
+@rate_limit_group('auth')
 def login():
     """Handle user login."""
     if current_user.is_authenticated:
@@ -44,7 +49,14 @@ def login():
                 flash(f'Account is locked. Please try again in {minutes} minutes.', 'danger')
                 return render_template('auth/login.html', title='Login', form=form)
             
-        if not user.verify_password(form.password.data):
+        try:
+            password_ok = user.verify_password(form.password.data)
+        except HasherBusyError:
+            current_app.logger.warning("Login rejected: password hashing is saturated")
+            flash('Too many login attempts right now. Please try again shortly.', 'danger')
+            return render_template('auth/login.html', title='Login', form=form), 503
+
+        if not password_ok:
             current_app.logger.warning(f"Login failed: Invalid password for user {user.username}")
             # Increment login attempts
             user.login_attempts += 1
@@ -74,8 +86,7 @@ def login():
             return redirect(url_for('auth.verify_email'))
         
         # Reset login attempts on successful login
-        user.login_attempts = 0
-        user.locked_until = None
+        user.reset_login_attempts()
         
         # Set session to permanent if remember me is checked
         if form.remember_me.data:
@@ -85,9 +96,11 @@ def login():
         # Login user and set session cookie
         login_user(user, remember=form.remember_me.data)
         
-        # Update last login
-        user.last_login = datetime.utcnow()
-        db.session.commit()
+        # One write at most, for a cleared lock or an upgraded hash; the
+        # last login time is buffered and written in batches
+        if db.session.dirty:
+            db.session.commit()
+        last_logins.record(user.id)
         
         # Get the next URL from the query parameters
         next_page = request.args.get('next')
@@ -99,6 +112,7 @@ def login():
     return render_template('auth/login.html', title='Login', form=form)
 
 @auth_bp.route('/register', methods=['GET', 'POST'])
+@rate_limit_group('auth')
 def register():
     """Register a new user."""
     if current_user.is_authenticated:
@@ -171,6 +185,7 @@ def register():
     return render_template('auth/register.html')
 
 @auth_bp.route('/verify-email', methods=['GET', 'POST'])
+@rate_limit_group('auth')
 def verify_email():
     """Email verification."""
     if current_user.is_authenticated and current_user.is_verified:
@@ -208,6 +223,7 @@ def verify_email():
     return render_template('auth/verify_email.html', form=form)
 
 @auth_bp.route('/resend-verification', methods=['GET', 'POST'])
+@rate_limit_group('auth')
 def resend_verification():
     """Resend verification email."""
     # Get email from session
@@ -379,6 +395,7 @@ def verify_password_reset_token(token: str, invalidate: bool = True) -> Optional
         return None
 
 @auth_bp.route('/forgot-password', methods=['GET', 'POST'])
+@rate_limit_group('auth')
 def forgot_password():
     """Handle forgot password request."""
     if current_user.is_authenticated:
@@ -422,6 +439,7 @@ def forgot_password():
     return render_template('auth/forgot_password.html', form=form)
 
 @auth_bp.route('/reset_password_request', methods=['GET', 'POST'])
+@rate_limit_group('auth')
 def reset_password_request():
     """Handle password reset request."""
     if current_user.is_authenticated:
@@ -445,6 +463,7 @@ def reset_password_request():
     return render_template('auth/reset_password_request.html', title='Reset Password', form=form)
 
 @auth_bp.route('/reset_password/<token>', methods=['GET', 'POST'])
+@rate_limit_group('auth')
 def reset_password(token):
     """Reset password with token."""
     if current_user.is_authenticated:
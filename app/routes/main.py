@@ -1,10 +1,14 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, current_app
 from flask_login import login_required, current_user
 from app.core.extensions import db
+from app.core.rate_limit import rate_limit_group
 from app.models.item import Item, STATUS_ACTIVE, STATUS_EXPIRED, STATUS_EXPIRING_SOON, STATUS_PENDING
 from app.models.notification import Notification
+from app.services.dashboard_cache import dashboard_cache
+from app.services.export_service import ExportService, ITEM_EXPORT_FIELDS, column_types
 from app.services.notification_service import NotificationService
 from app.services.zoho_service import ZohoService
+from app.services.zoho_sync import get_sync_state, get_zoho_sync
 from datetime import datetime, timedelta
 from flask import session
 from app.models.user import User
@@ -24,33 +28,14 @@ def index():
 def dashboard():
     """Dashboard route."""
     try:
-        current_app.logger.info(f"User authenticated: {current_user.id}")
-        
-        # Get user's inventory items
-        items = Item.query.filter_by(user_id=current_user.id).all()
-        current_app.logger.info(f"Found {len(items)} items for user {current_user.id}")
-        
-        # Update item statuses with force_update to ensure consistency
-        for item in items:
-            current_app.logger.info(f"Updating status for item {item.id} ({item.name})")
-            item.update_status(force_update=True)
-            current_app.logger.info(f"Item {item.id} ({item.name}) current status: {item.status}")
-        
-        # Get expiring and expired items
-        expiring_items = [item.to_dict() for item in items if item.status == STATUS_EXPIRING_SOON]
-        expired_items = [item.to_dict() for item in items if item.status == STATUS_EXPIRED]
-        
-        current_app.logger.info(f"Expiring items: {len(expiring_items)}, Expired items: {len(expired_items)}")
-        
-        # Get recent notifications using NotificationService
-        notification_service = NotificationService()
-        notifications = notification_service.get_user_notifications(current_user.id, limit=5)
-        
+        dashboard = dashboard_cache.get(current_user.id)
         return render_template('dashboard.html',
-                            items=[item.to_dict() for item in items],
-                            expiring_items=expiring_items,
-                            expired_items=expired_items,
-                            notifications=notifications)
+                            stats=dashboard['stats'],
+                            expiring_items=dashboard['expiring_items'],
+                            expired_items=dashboard['expired_items'],
+                            expiring_by_day=dashboard['expiring_by_day'],
+                            expiring_by_category=dashboard['expiring_by_category'],
+                            notifications=dashboard['notifications'])
         
     except Exception as e:
         current_app.logger.error(f"Dashboard error: {str(e)}")
@@ -62,37 +47,15 @@ def dashboard():
 def inventory():
     """Inventory management page."""
     try:
-        # Try to sync with Zoho if connected
+        # Render from local data; refresh it from Zoho in the background when stale
+        sync_status = None
         if current_user.zoho_access_token:
-            zoho_service = ZohoService(current_user)
-            if current_user.zoho_token_expires_at and datetime.now() >= current_user.zoho_token_expires_at:
-                if not zoho_service.refresh_token():
-                    flash('Failed to refresh Zoho connection. Please reconnect in Settings.', 'error')
-            else:
-                # Get all items with Zoho IDs
-                items_with_zoho = Item.query.filter(
-                    Item.user_id == current_user.id,
-                    Item.zoho_item_id.isnot(None)
-                ).all()
-                
-                # Check status in Zoho for each item but don't delete immediately
-                for item in items_with_zoho:
-                    zoho_status = zoho_service.get_item_status(item.zoho_item_id)
-                    if zoho_status == 'inactive' and item.status != STATUS_PENDING:
-                        current_app.logger.info(f"Item {item.id} ({item.name}) is inactive in Zoho")
-                        item.status = STATUS_PENDING
-                        db.session.add(item)
-                
-                db.session.commit()
-                
-                # Now sync remaining items
-                sync_success = zoho_service.sync_inventory(current_user)
-                if not sync_success:
-                    flash('Failed to sync with Zoho inventory. Please check your connection in Settings.', 'error')
+            get_zoho_sync().request_sync(current_user.id)
+            sync_status = get_sync_state(current_user.id).to_dict()
         else:
             flash('Zoho sync is not available. Please connect in Settings to sync your inventory.', 'info')
         
-        # Get user's items after potential updates
+        # Get user's items
         items = Item.query.filter_by(user_id=current_user.id).all()
         current_app.logger.info(f"Found {len(items)} items for user {current_user.id}")
         
@@ -141,6 +104,7 @@ def inventory():
                             STATUS_EXPIRED=STATUS_EXPIRED,
                             STATUS_EXPIRING_SOON=STATUS_EXPIRING_SOON,
                             STATUS_PENDING=STATUS_PENDING,
+                            sync_status=sync_status,
                             today_date=datetime.now().date().strftime('%Y-%m-%d'))
         
     except Exception as e:
@@ -148,6 +112,29 @@ def inventory():
         flash('An error occurred while loading the inventory.', 'error')
         return redirect(url_for('main.dashboard'))
 
+@main_bp.route('/inventory/sync-status')
+@login_required
+def inventory_sync_status():
+    """Age and progress of the user's background Zoho sync, polled by the inventory page."""
+    return jsonify(get_sync_state(current_user.id).to_dict())
+
+@main_bp.route('/inventory/export')
+@login_required
+def export_inventory():
+    """Stream the user's inventory as CSV, NDJSON or Parquet."""
+    export_format = request.args.get('format', 'csv')
+    export_service = ExportService()
+    if export_format not in export_service.available_formats():
+        return jsonify({'error': f'Unsupported export format: {export_format}'}), 400
+    
+    return export_service.response(
+        export_service.item_batches(current_user.id),
+        ITEM_EXPORT_FIELDS,
+        export_format,
+        filename=f"inventory-{datetime.now().strftime('%Y%m%d')}",
+        types=column_types(Item, ITEM_EXPORT_FIELDS)
+    )
+
 @main_bp.route('/notifications')
 @login_required
 def notifications():
@@ -627,6 +614,7 @@ def bulk_delete_items():
 
 @main_bp.route('/sync-inventory', methods=['GET', 'POST'])
 @login_required
+@rate_limit_group('sync')
 def sync_inventory():
     """Sync inventory with Zoho."""
     user = current_user
@@ -1,8 +1,16 @@
 from datetime import datetime, timedelta
-from flask import Blueprint, render_template, jsonify, request, current_app, url_for
+import time
+from flask import Blueprint, render_template, jsonify, request, current_app, url_for, make_response, session
 from flask_login import login_required, current_user
 from app.services.report_service import ReportService
+from app.services.export_service import (
+    ExportService, REPORT_EXPORT_FIELDS, REPORT_DETAIL_FIELDS, REPORT_DETAIL_TYPES, column_types
+)
+from app.models.report import Report
 from app.core.extensions import db
+from app.core.rate_limit import rate_limit_group
+from app.models.inventory_stats import UserInventoryStats
+from app.models.inventory_snapshot import InventorySnapshot, PERIODS, SNAPSHOT_FIELDS
 
 reports_bp = Blueprint('reports', __name__)
 report_service = ReportService()
@@ -16,10 +24,90 @@ def reports():
     start_date = end_date - timedelta(days=30)
     
     reports = report_service.get_reports_by_date_range(start_date, end_date, current_user.id)
-    return render_template('reports.html', reports=reports)
+    stats = UserInventoryStats.for_user(current_user.id)
+    return render_template('reports.html', reports=reports, stats=stats)
+
+# Default chart window per period
+TIMESERIES_WINDOWS = {'day': 90, 'week': 365, 'month': 730}
+
+@reports_bp.route('/reports/timeseries')
+@login_required
+def timeseries():
+    """Inventory trend data from daily snapshots or their weekly/monthly rollups."""
+    period = request.args.get('period', 'day')
+    if period not in PERIODS:
+        return jsonify({'error': f'period must be one of {", ".join(PERIODS)}'}), 400
+    
+    fields = request.args.get('fields')
+    fields = fields.split(',') if fields else list(SNAPSHOT_FIELDS)
+    unknown = [field for field in fields if field not in SNAPSHOT_FIELDS]
+    if unknown:
+        return jsonify({'error': f'Unknown fields: {", ".join(unknown)}'}), 400
+    
+    try:
+        end_date = datetime.strptime(request.args['end'], '%Y-%m-%d').date() if 'end' in request.args else datetime.now().date()
+        start_date = (
+            datetime.strptime(request.args['start'], '%Y-%m-%d').date() if 'start' in request.args
+            else end_date - timedelta(days=TIMESERIES_WINDOWS[period])
+        )
+    except ValueError:
+        return jsonify({'error': 'Dates must be in YYYY-MM-DD format'}), 400
+    
+    series = InventorySnapshot.series(current_user.id, period, start_date, end_date, fields)
+    return jsonify({
+        'period': period,
+        'start': start_date.isoformat(),
+        'end': end_date.isoformat(),
+        'series': series
+    })
+
+@reports_bp.route('/reports/export')
+@login_required
+def export_reports():
+    """Stream report summaries in a date range as CSV, NDJSON or Parquet."""
+    export_format = request.args.get('format', 'csv')
+    export_service = ExportService()
+    if export_format not in export_service.available_formats():
+        return jsonify({'error': f'Unsupported export format: {export_format}'}), 400
+    
+    try:
+        end_date = datetime.strptime(request.args['end'], '%Y-%m-%d').date() if 'end' in request.args else datetime.now().date()
+        start_date = datetime.strptime(request.args['start'], '%Y-%m-%d').date() if 'start' in request.args else end_date - timedelta(days=365)
+    except ValueError:
+        return jsonify({'error': 'Dates must be in YYYY-MM-DD format'}), 400
+    
+    return export_service.response(
+        export_service.report_batches(current_user.id, start_date, end_date),
+        REPORT_EXPORT_FIELDS,
+        export_format,
+        filename=f'reports-{start_date:%Y%m%d}-{end_date:%Y%m%d}',
+        types=column_types(Report, REPORT_EXPORT_FIELDS)
+    )
+
+@reports_bp.route('/reports/<int:report_id>/export')
+@login_required
+def export_report(report_id):
+    """Stream a report's item details as CSV, NDJSON or Parquet."""
+    export_format = request.args.get('format', 'csv')
+    export_service = ExportService()
+    if export_format not in export_service.available_formats():
+        return jsonify({'error': f'Unsupported export format: {export_format}'}), 400
+    
+    report = db.session.get(Report, report_id)
+    if not report or report.user_id != current_user.id:
+        return jsonify({'error': 'Report not found'}), 404
+    
+    return export_service.response(
+        export_service.report_detail_batches(report),
+        REPORT_DETAIL_FIELDS,
+        export_format,
+        filename=f'report-{report.date:%Y%m%d}',
+        types=REPORT_DETAIL_TYPES
+    )
 
 @reports_bp.route('/reports/generate', methods=['POST'])
 @login_required
+@rate_limit_group('reports')
 def generate_report():
     """Generate a new report for the current user."""
     try:
@@ -38,6 +126,39 @@ def generate_report():
         current_app.logger.error(f"Error generating report: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def _report_page(report, is_public):
+    """Render a report page, answering revalidations with 304 before any rendering."""
+    viewer = current_user.get_id() or 'anonymous'
+    # The page's CSRF token must stay valid while a cached copy is in use, so
+    # cached copies are replaced after half the token's lifetime
+    csrf_lifetime = current_app.config.get('WTF_CSRF_TIME_LIMIT', 3600)
+    token_window = int(csrf_lifetime // 2) if csrf_lifetime else None
+    period = int(time.time() // token_window) if token_window else 0
+    etag = report_service.report_etag(report, viewer, is_public, period)
+    
+    # Pending flash messages are part of the page, so never serve it from cache then
+    if request.if_none_match.contains_weak(etag) and not session.get('_flashes'):
+        response = current_app.response_class(status=304)
+    else:
+        response = make_response(render_template(
+            'view_report.html',
+            report=report,
+            report_body=report_service.render_report_body(report),
+            is_public=is_public
+        ))
+    
+    response.set_etag(etag, weak=True)
+    if is_public:
+        # Shared links may be cached by the browser but not by shared caches, as the page carries a session
+        response.cache_control.private = True
+        max_age = current_app.config.get('REPORT_PUBLIC_MAX_AGE', 1800)
+        response.cache_control.max_age = min(max_age, token_window) if token_window else max_age
+    else:
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+    response.vary.add('Cookie')
+    return response
+
 @reports_bp.route('/reports/<int:report_id>')
 @login_required
 def view_report(report_id):
@@ -45,7 +166,15 @@ def view_report(report_id):
     report = report_service.get_report(report_id)
     if not report or report.user_id != current_user.id:
         return jsonify({'error': 'Report not found'}), 404
-    return render_template('view_report.html', report=report, is_public=report.is_public)
+    return _report_page(report, is_public=False)
+
+@reports_bp.route('/reports/public/<token>')
+def view_public_report(token):
+    """View a report shared through its public link."""
+    report = report_service.get_public_report(token)
+    if not report:
+        return jsonify({'error': 'Report not found'}), 404
+    return _report_page(report, is_public=True)
 
 @reports_bp.route('/reports/<int:report_id>/delete', methods=['POST'])
 @login_required
@@ -0,0 +1,222 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from app.core.extensions import db
+from app.models.item import Item, EXPIRING_SOON_DAYS
+
+# Columns loaded for analytics; nothing else is read from the items table
+ANALYTICS_COLUMNS = [
+    'id', 'name', 'quantity', 'unit', 'expiry_date',
+    'location', 'batch_number', 'cost_price'
+]
+
+# Thresholds shared with the Python report path
+LOW_STOCK_THRESHOLD = 10
+CRITICAL_QUANTITY = 10
+HIGH_VALUE_THRESHOLD = 1000
+
+# Expiry histogram buckets as (label, lower bound, upper bound) in days, inclusive
+EXPIRY_BUCKETS = [
+    ('expired', None, -1),
+    ('today', 0, 0),
+    ('next_week', 1, 7),
+    ('next_month', 8, 30),
+    ('next_quarter', 31, 90),
+    ('later', 91, None),
+]
+
+# Horizon in days over which an item's risk score ramps up to its full value
+RISK_HORIZON_DAYS = 90
+
+def _nullable(series: pd.Series) -> List[Any]:
+    """Convert a column to a list with missing values as None."""
+    if not series.hasnans:
+        return series.tolist()
+    return series.astype(object).where(series.notna(), None).tolist()
+
+class InventoryAnalytics:
+    """Vectorized inventory analytics over a columnar frame of a user's items.
+
+    The frame is loaded with a single column-only query and every metric is
+    computed with NumPy/pandas operations instead of per-item Python loops.
+    Results match the ones produced by ``ReportService.build_report_metrics``.
+    """
+
+    def __init__(self, frame: pd.DataFrame, today: Optional[datetime] = None) -> None:
+        """Initialize analytics over an items frame with ``ANALYTICS_COLUMNS``."""
+        self.today = pd.Timestamp(today or datetime.now()).normalize()
+        self.frame = self._prepare(frame)
+
+    @classmethod
+    def for_user(cls, user_id: int, today: Optional[datetime] = None) -> 'InventoryAnalytics':
+        """Load a user's items as a frame and build analytics for them."""
+        return cls(cls.load_frame(user_id), today=today)
+
+    @staticmethod
+    def load_frame(user_id: int) -> pd.DataFrame:
+        """Load a user's items as a columnar frame from one column-only query."""
+        stmt = select(*[getattr(Item, column) for column in ANALYTICS_COLUMNS]).where(
+            Item.user_id == user_id
+        ).order_by(Item.id)
+        rows = db.session.execute(stmt).all()
+        return pd.DataFrame.from_records(rows, columns=ANALYTICS_COLUMNS)
+
+    @classmethod
+    def for_users(cls, user_ids: List[int], today: Optional[datetime] = None) -> Dict[int, 'InventoryAnalytics']:
+        """Build analytics for several users from a single snapshot query."""
+        stmt = select(Item.user_id, *[getattr(Item, column) for column in ANALYTICS_COLUMNS]).where(
+            Item.user_id.in_(user_ids)
+        ).order_by(Item.id)
+        rows = db.session.execute(stmt).all()
+        snapshot = pd.DataFrame.from_records(rows, columns=['user_id'] + ANALYTICS_COLUMNS)
+        groups = dict(tuple(snapshot.groupby('user_id', sort=False)))
+        empty = snapshot.iloc[0:0]
+        return {
+            user_id: cls(groups.get(user_id, empty)[ANALYTICS_COLUMNS], today=today)
+            for user_id in user_ids
+        }
+
+    def _prepare(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Add the derived columns every metric is computed from."""
+        frame = frame.reset_index(drop=True).copy()
+        expiry = pd.to_datetime(frame['expiry_date']).dt.normalize()
+        quantity = pd.to_numeric(frame['quantity']).fillna(0.0)
+        cost = pd.to_numeric(frame['cost_price']).fillna(0.0)
+
+        frame['expiry_date'] = expiry
+        frame['days_until_expiry'] = (expiry - self.today).dt.days
+        frame['value'] = quantity * cost
+
+        days = frame['days_until_expiry']
+        frame['is_expired'] = (days < 0).to_numpy()
+        frame['is_near_expiry'] = ((days > 0) & (days <= EXPIRING_SOON_DAYS)).to_numpy()
+        frame['is_low_stock'] = (quantity < LOW_STOCK_THRESHOLD).to_numpy()
+        frame['is_critical'] = frame['is_near_expiry'] & (quantity > CRITICAL_QUANTITY).to_numpy()
+        frame['is_high_value'] = frame['is_near_expiry'] & (frame['value'] > HIGH_VALUE_THRESHOLD).to_numpy()
+        return frame
+
+    def summary(self) -> Dict[str, int]:
+        """Count totals, expiring, expired, low stock and risk items."""
+        frame = self.frame
+        return {
+            'total_items': int(len(frame)),
+            'expiring_items': int(frame['is_near_expiry'].sum()),
+            'expired_items': int(frame['is_expired'].sum()),
+            'low_stock_items': int(frame['is_low_stock'].sum()),
+            'critical_items': int(frame['is_critical'].sum()),
+            'high_value_expiring': int(frame['is_high_value'].sum())
+        }
+
+    def timeframe_masks(self) -> Dict[str, pd.Series]:
+        """Boolean masks for the report's expiry timeframes."""
+        days = self.frame['days_until_expiry']
+        return {
+            'next_week': (days > 0) & (days <= 7),
+            'next_month': (days > 7) & (days <= 30),
+            'next_quarter': (days > 30) & (days <= 90)
+        }
+
+    def item_records(self, mask: pd.Series) -> List[Dict[str, Any]]:
+        """Serialize the items selected by a mask the way reports store them."""
+        selected = self.frame.loc[mask]
+        if selected.empty:
+            return []
+        # Build plain Python columns once, restoring None where values are missing
+        columns = {
+            'id': selected['id'].astype(int).tolist(),
+            'name': selected['name'].tolist(),
+            'quantity': _nullable(selected['quantity']),
+            'unit': _nullable(selected['unit']),
+            'expiry_date': selected['expiry_date'].dt.strftime('%Y-%m-%d').tolist(),
+            'days_until_expiry': selected['days_until_expiry'].astype(int).tolist(),
+            'location': _nullable(selected['location']),
+            'batch_number': _nullable(selected['batch_number']),
+            'value': selected['value'].tolist()
+        }
+        keys = list(columns)
+        return [dict(zip(keys, row)) for row in zip(*columns.values())]
+
+    def item_ids(self, mask: pd.Series) -> List[int]:
+        """IDs of the items selected by a mask."""
+        return self.frame.loc[mask, 'id'].astype(int).tolist()
+
+    def report_metrics(self) -> Dict[str, Any]:
+        """Compute the summary, expiry, risk and recommendation sections of a report."""
+        timeframes = self.timeframe_masks()
+        critical = self.frame['is_critical']
+        high_value = self.frame['is_high_value']
+
+        return {
+            'summary': self.summary(),
+            'expiry_analysis': {
+                name: {
+                    'count': int(mask.sum()),
+                    'items': self.item_records(mask)
+                }
+                for name, mask in timeframes.items()
+            },
+            'risk_analysis': {
+                'critical_items': self.item_records(critical),
+                'high_value_expiring': self.item_records(high_value)
+            },
+            'action_recommendations': [
+                {
+                    'type': 'urgent',
+                    'message': f'Take immediate action on {int(timeframes["next_week"].sum())} items expiring in the next week',
+                    'item_ids': self.item_ids(timeframes['next_week'])
+                },
+                {
+                    'type': 'high_priority',
+                    'message': f'Review {int(critical.sum())} critical items with high quantity and near expiry',
+                    'item_ids': self.item_ids(critical)
+                },
+                {
+                    'type': 'value_protection',
+                    'message': f'Consider discounting {int(high_value.sum())} high-value items approaching expiry',
+                    'item_ids': self.item_ids(high_value)
+                }
+            ]
+        }
+
+    def expiry_histogram(self) -> Dict[str, int]:
+        """Count items per expiry bucket, plus items without an expiry date."""
+        days = self.frame['days_until_expiry']
+        histogram = {}
+        for label, low, high in EXPIRY_BUCKETS:
+            mask = days.notna()
+            if low is not None:
+                mask &= days >= low
+            if high is not None:
+                mask &= days <= high
+            histogram[label] = int(mask.sum())
+        histogram['no_expiry'] = int(days.isna().sum())
+        return histogram
+
+    def risk_scores(self) -> pd.Series:
+        """Score each item by stock value weighted by how close it is to expiry.
+
+        The weight ramps linearly from 0 at ``RISK_HORIZON_DAYS`` out to 1 on the
+        expiry date, and stays at 1 once expired. Items without an expiry date
+        score 0. The series is indexed by item ID and sorted by score.
+        """
+        days = self.frame['days_until_expiry'].to_numpy(dtype=float)
+        urgency = np.clip(1.0 - days / RISK_HORIZON_DAYS, 0.0, 1.0)
+        urgency = np.nan_to_num(urgency, nan=0.0)
+        scores = pd.Series(
+            self.frame['value'].to_numpy() * urgency,
+            index=self.frame['id'].astype(int),
+            name='risk_score'
+        )
+        return scores.sort_values(ascending=False, kind='stable')
+
+    def top_risks(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """Highest-scoring items with their risk score."""
+        scores = self.risk_scores()
+        scores = scores[scores > 0].head(limit)
+        names = self.frame.set_index('id')['name']
+        return [
+            {'id': int(item_id), 'name': names.loc[item_id], 'risk_score': round(float(score), 2)}
+            for item_id, score in scores.items()
+        ]
@@ -0,0 +1,164 @@
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+import threading
+import time
+from typing import Dict
+from flask import current_app
+from sqlalchemy import and_, case, event, func, select
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.orm.attributes import get_history
+from app.core.extensions import db
+from app.models.item import Item
+from app.models.inventory_stats import EXPIRING_STATUS_DAYS, UserInventoryStats
+from app.models.notification import Notification
+from app.services.notification_service import NotificationService
+
+# Recent notifications shown on the dashboard
+DASHBOARD_NOTIFICATIONS = 5
+
+# Chart label for items without a category; items have no category column yet
+UNCATEGORIZED = 'Uncategorized'
+
+def _expiring_by_day(user_id: int, today: date) -> Dict[str, int]:
+    """Count of every expiring item per expiry day, keyed by ISO date, in one query."""
+    today_start = datetime.combine(today, datetime.min.time())
+    days = [today + timedelta(days=offset) for offset in range(EXPIRING_STATUS_DAYS + 1)]
+    counts = db.session.execute(select(*[
+        func.coalesce(func.sum(case((and_(
+            Item.expiry_date >= today_start + timedelta(days=offset),
+            Item.expiry_date < today_start + timedelta(days=offset + 1)
+        ), 1), else_=0)), 0)
+        for offset in range(len(days))
+    ]).where(
+        Item.user_id == user_id,
+        Item.expiry_date >= today_start,
+        Item.expiry_date < today_start + timedelta(days=len(days))
+    )).one()
+    return {day.isoformat(): int(count) for day, count in zip(days, counts)}
+
+def build_dashboard(user_id: int) -> Dict:
+    """Build a user's dashboard view-model from the database.
+
+    Expiring and expired items are chosen by expiry date rather than stored
+    status, so the lists are right for today even before the nightly status
+    update has run.
+
+    The item lists are capped at ``DASHBOARD_ITEMS_LIMIT``; the charts use
+    ``expiring_by_day`` and ``expiring_by_category``, which count every
+    expiring item.
+
+    Returns:
+        Dict with ``stats`` (counters), ``expiring_items`` (soonest first),
+        ``expired_items`` (most recently expired first), ``expiring_by_day``
+        (ISO date to count), ``expiring_by_category`` (category to count),
+        ``notifications`` and ``as_of`` (the day it was built for)
+    """
+    today = datetime.now().date()
+    today_start = datetime.combine(today, datetime.min.time())
+    limit = current_app.config.get('DASHBOARD_ITEMS_LIMIT', 20)
+
+    expiring = Item.query.filter(
+        Item.user_id == user_id,
+        Item.expiry_date >= today_start,
+        Item.expiry_date < today_start + timedelta(days=EXPIRING_STATUS_DAYS + 1)
+    ).order_by(Item.expiry_date, Item.id).limit(limit).all()
+    expired = Item.query.filter(
+        Item.user_id == user_id,
+        Item.expiry_date < today_start
+    ).order_by(Item.expiry_date.desc(), Item.id).limit(limit).all()
+    notifications = NotificationService().get_user_notifications(user_id, limit=DASHBOARD_NOTIFICATIONS)
+    expiring_by_day = _expiring_by_day(user_id, today)
+
+    return {
+        'as_of': today,
+        'stats': UserInventoryStats.for_user(user_id).to_dict(),
+        'expiring_items': [item.to_dict() for item in expiring],
+        'expired_items': [item.to_dict() for item in expired],
+        'expiring_by_day': expiring_by_day,
+        'expiring_by_category': {UNCATEGORIZED: sum(expiring_by_day.values())},
+        # created_at stays a datetime so the page shows it as the ORM object did
+        'notifications': [
+            dict(notification.to_dict(), created_at=notification.created_at) for notification in notifications
+        ]
+    }
+
+class DashboardCache:
+    """LRU cache of users' dashboard view-models.
+
+    Entries are dropped whenever one of the user's items or notifications is
+    inserted, updated or deleted through the ORM in this process, both at
+    flush and again after commit. An entry built on an earlier day is never
+    served, so items move from expiring to expired at midnight without being
+    touched. Changes made by other processes show up once the entry is
+    ``DASHBOARD_CACHE_TTL`` seconds old. Code that changes items or
+    notifications with bulk statements must call ``invalidate`` itself.
+    """
+
+    def __init__(self) -> None:
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation so a build racing a change is not stored
+        self._generation = 0
+        self.counters = {'hits': 0, 'misses': 0, 'invalidations': 0}
+
+    def get(self, user_id: int) -> Dict:
+        """A user's dashboard view-model, from the cache or freshly built."""
+        ttl = current_app.config.get('DASHBOARD_CACHE_TTL', 300)
+        today = datetime.now().date()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[0] > time.monotonic() and entry[1]['as_of'] == today:
+                self._entries.move_to_end(user_id)
+                self.counters['hits'] += 1
+                return entry[1]
+            self.counters['misses'] += 1
+            generation = self._generation
+
+        dashboard = build_dashboard(user_id)
+        if ttl > 0:
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[user_id] = (time.monotonic() + ttl, dashboard)
+                    self._entries.move_to_end(user_id)
+                    while len(self._entries) > current_app.config.get('DASHBOARD_CACHE_SIZE', 1024):
+                        self._entries.popitem(last=False)
+        return dashboard
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._generation += 1
+            self.counters['invalidations'] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self.counters, size=len(self._entries))
+
+dashboard_cache = DashboardCache()
+
+def _record_change(mapper, connection, target) -> None:
+    user_ids = {target.user_id}
+    # An item moved to another user changes both dashboards
+    user_ids.update(get_history(target, 'user_id').deleted)
+    session = object_session(target)
+    for user_id in user_ids:
+        dashboard_cache.invalidate(user_id)
+        if session is not None:
+            session.info.setdefault('dashboard_users', set()).add(user_id)
+
+# Deletes are recorded before the row goes, while expired attributes can still load
+for _model in (Item, Notification):
+    for _event in ('after_insert', 'after_update', 'before_delete'):
+        event.listen(_model, _event, _record_change)
+
+@event.listens_for(Session, 'after_commit')
+@event.listens_for(Session, 'after_soft_rollback')
+def _session_ended(session, *args) -> None:
+    # Drop again in case another request cached the old rows before this commit
+    for user_id in session.info.pop('dashboard_users', ()):
+        dashboard_cache.invalidate(user_id)
@@ -1,79 +1,257 @@
-from typing import Optional
+from typing import Dict, Optional, Tuple
 import cv2
 import numpy as np
-from azure.cognitiveservices.vision.computervision import ComputerVisionClient
-from azure.cognitiveservices.vision.computervision.models import OperationStatusCodes
-from msrest.authentication import CognitiveServicesCredentials
-import re
 from datetime import datetime
 import os
+import threading
+import time
+import uuid
 from flask import current_app
-from io import BytesIO
+from app.services.date_parser import correct_ocr_errors, parse_date
+from app.services.ocr_backends import OCRBackend, create_ocr_backend
+from app.services.ocr_cache import content_hash, ocr_cache, perceptual_hash
+
+# Long side, in pixels, that images are reduced to before preprocessing
+DEFAULT_TARGET_SIZE = 1600
+
+# Preprocessing tiers, cheapest first; later tiers only run when earlier ones find no date
+PREPROCESS_TIERS = ('fast', 'denoise')
+
+# Reduced-size decode flags, largest reduction first
+REDUCED_GRAYSCALE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+    (4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+    (2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+)
+
+# JPEG start-of-frame markers, which carry the image size
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# TIFF byte order marks and the tags holding the image size
+TIFF_BYTE_ORDERS = {b'II*\x00': 'little', b'MM\x00*': 'big'}
+TIFF_WIDTH_TAG = 256
+TIFF_HEIGHT_TAG = 257
+
+class _Workspace(threading.local):
+    """Per-thread image buffers reused by the preprocessing stages."""
+
+    def __init__(self) -> None:
+        self.buffers = {}
+
+    def buffer(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        """A uint8 buffer of the given shape, reallocated only when the shape changes."""
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape):
+            buffer = self.buffers[name] = np.empty(shape, np.uint8)
+        return buffer
+
+_workspace = _Workspace()
+
+def image_dimensions(image_data: bytes) -> Optional[Tuple[int, int]]:
+    """Read (width, height) from a PNG, JPEG, WebP, BMP or TIFF header without decoding the image.
+
+    A TIFF's size is only found if its first directory lies within
+    ``image_data``; see ``tiff_directory_offset``.
+    """
+    if image_data[:8] == b'\x89PNG\r\n\x1a\n' and len(image_data) >= 24:
+        return int.from_bytes(image_data[16:20], 'big'), int.from_bytes(image_data[20:24], 'big')
+    if image_data[:2] == b'\xff\xd8':
+        return _jpeg_dimensions(image_data)
+    if image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        return _webp_dimensions(image_data)
+    if image_data[:2] == b'BM' and len(image_data) >= 26:
+        if int.from_bytes(image_data[14:18], 'little') == 12:
+            # OS/2 header with 16-bit sizes
+            return int.from_bytes(image_data[18:20], 'little'), int.from_bytes(image_data[20:22], 'little')
+        # Negative heights mark top-down rows
+        width = int.from_bytes(image_data[18:22], 'little', signed=True)
+        height = int.from_bytes(image_data[22:26], 'little', signed=True)
+        return abs(width), abs(height)
+    offset = tiff_directory_offset(image_data)
+    if offset is not None:
+        return tiff_dimensions(image_data[:4], image_data[offset:])
+    return None
+
+def _jpeg_dimensions(image_data: bytes) -> Optional[Tuple[int, int]]:
+    offset = 2
+    while offset + 9 <= len(image_data):
+        if image_data[offset] != 0xFF:
+            return None
+        marker = image_data[offset + 1]
+        if marker == 0xFF:
+            # Fill byte
+            offset += 1
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            height = int.from_bytes(image_data[offset + 5:offset + 7], 'big')
+            width = int.from_bytes(image_data[offset + 7:offset + 9], 'big')
+            return width, height
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            # Markers without a length
+            offset += 2
+            continue
+        offset += 2 + int.from_bytes(image_data[offset + 2:offset + 4], 'big')
+    return None
+
+def _webp_dimensions(image_data: bytes) -> Optional[Tuple[int, int]]:
+    if len(image_data) < 30:
+        return None
+    chunk = image_data[12:16]
+    if chunk == b'VP8X':
+        # Extended format: 24-bit canvas size minus one
+        return 1 + int.from_bytes(image_data[24:27], 'little'), 1 + int.from_bytes(image_data[27:30], 'little')
+    if chunk == b'VP8L' and image_data[20] == 0x2F:
+        # Lossless: 14-bit width and height minus one
+        bits = int.from_bytes(image_data[21:25], 'little')
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8 ' and image_data[23:26] == b'\x9d\x01\x2a':
+        # Lossy key frame: 14-bit width and height after the start code
+        return int.from_bytes(image_data[26:28], 'little') & 0x3FFF, int.from_bytes(image_data[28:30], 'little') & 0x3FFF
+    return None
+
+def tiff_directory_offset(image_data: bytes) -> Optional[int]:
+    """Offset of a TIFF's first image directory, which writers often put after the pixels, or None if not a TIFF."""
+    byte_order = TIFF_BYTE_ORDERS.get(bytes(image_data[:4]))
+    if byte_order is None or len(image_data) < 8:
+        return None
+    return int.from_bytes(image_data[4:8], byte_order)
+
+def tiff_dimensions(signature: bytes, directory: bytes) -> Optional[Tuple[int, int]]:
+    """Read (width, height) from a TIFF image directory, given the file's first four bytes."""
+    byte_order = TIFF_BYTE_ORDERS.get(bytes(signature))
+    if byte_order is None or len(directory) < 2:
+        return None
+    sizes = {}
+    entries = int.from_bytes(directory[:2], byte_order)
+    for offset in range(2, min(2 + 12 * entries, len(directory) - 11), 12):
+        tag = int.from_bytes(directory[offset:offset + 2], byte_order)
+        if tag in (TIFF_WIDTH_TAG, TIFF_HEIGHT_TAG):
+            # SHORT (3) values sit in the first two bytes of the value field, LONG (4) fill it
+            field_type = int.from_bytes(directory[offset + 2:offset + 4], byte_order)
+            length = 2 if field_type == 3 else 4
+            sizes[tag] = int.from_bytes(directory[offset + 8:offset + 8 + length], byte_order)
+    if TIFF_WIDTH_TAG not in sizes or TIFF_HEIGHT_TAG not in sizes:
+        return None
+    return sizes[TIFF_WIDTH_TAG], sizes[TIFF_HEIGHT_TAG]
 
 class DateOCRService:
-    """Service for extracting dates from images using Azure Computer Vision."""
+    """Service for extracting dates from images.
+
+    Text recognition is delegated to an ``OCRBackend``: Azure Computer Vision,
+    a local Tesseract engine or a fake for offline benchmarks, chosen with
+    ``OCR_BACKEND``.
+    """
     
-    def __init__(self):
-        """Initialize the Azure Computer Vision service."""
-        # Get Azure credentials from environment variables
-        self.subscription_key = os.getenv('AZURE_VISION_KEY')
-        self.endpoint = os.getenv('AZURE_VISION_ENDPOINT')
-        
-        # Initialize vision client only if credentials are available
-        self.vision_client = None
-        if self.subscription_key and self.endpoint:
-            try:
-                # Ensure endpoint ends with a slash
-                if not self.endpoint.endswith('/'):
-                    self.endpoint = self.endpoint + '/'
-                
-                self.vision_client = ComputerVisionClient(
-                    endpoint=self.endpoint,
-                    credentials=CognitiveServicesCredentials(self.subscription_key)
-                )
-                print(f"Azure Computer Vision service initialized successfully with endpoint: {self.endpoint}")
-            except Exception as e:
-                print(f"Error initializing Azure Computer Vision: {str(e)}")
+    def __init__(self, backend: Optional[OCRBackend] = None):
+        """Initialize the service with the given OCR backend, or the configured one."""
+        self.backend = backend if backend is not None else create_ocr_backend()
+        # Azure client, when that is the backend, for connection tests
+        self.vision_client = getattr(self.backend, 'client', None)
+
+    @property
+    def available(self) -> bool:
+        """Whether an OCR backend is available."""
+        return self.backend is not None
+
+    def load_image(self, image_data: bytes, target_size: Optional[int] = None) -> np.ndarray:
+        """Decode an image as grayscale, reduced to about ``target_size`` pixels on its long side.
+
+        When the header gives the image size, JPEGs are decoded straight at
+        1/2, 1/4 or 1/8 scale with ``IMREAD_REDUCED_GRAYSCALE_*``, so a full
+        resolution frame is never materialized. The result is then resized
+        down to the target if it is still larger.
+        """
+        target_size = target_size or current_app.config.get('OCR_TARGET_SIZE', DEFAULT_TARGET_SIZE)
+        flag = cv2.IMREAD_GRAYSCALE
+        dimensions = image_dimensions(image_data)
+        if dimensions:
+            long_side = max(dimensions)
+            for factor, reduced_flag in REDUCED_GRAYSCALE_FLAGS:
+                if long_side // factor >= target_size:
+                    flag = reduced_flag
+                    break
+
+        gray = cv2.imdecode(np.frombuffer(image_data, np.uint8), flag)
+        if gray is None:
+            raise ValueError('Could not decode image')
+
+        height, width = gray.shape[:2]
+        long_side = max(height, width)
+        if long_side > target_size:
+            scale = target_size / long_side
+            size = (max(1, round(width * scale)), max(1, round(height * scale)))
+            resized = _workspace.buffer('resized', (size[1], size[0]))
+            gray = cv2.resize(gray, size, dst=resized, interpolation=cv2.INTER_AREA)
+        return gray
+
+    def preprocess(self, gray: np.ndarray, tier: str = 'fast', timings: Optional[Dict[str, float]] = None) -> np.ndarray:
+        """Clean up a grayscale image for OCR using the given preprocessing tier.
+
+        The ``fast`` tier uses a median blur, which costs a few milliseconds.
+        The ``denoise`` tier uses non-local means denoising, which is far slower
+        and only worth running when the fast tier did not yield a date.
+
+        Stages write into per-thread buffers that are reused across requests,
+        so the returned image is only valid until the next call on this thread.
+        """
+        started = time.perf_counter()
+        denoised = _workspace.buffer('denoised', gray.shape)
+        if tier == 'fast':
+            cv2.medianBlur(gray, 3, dst=denoised)
+        elif tier == 'denoise':
+            cv2.fastNlMeansDenoising(gray, denoised, 10, 7, 21)
         else:
-            print("Azure credentials not found. OCR service will not be available.")
-            if not self.subscription_key:
-                print("Missing AZURE_VISION_KEY")
-            if not self.endpoint:
-                print("Missing AZURE_VISION_ENDPOINT")
+            raise ValueError(f'Unknown preprocessing tier: {tier}')
+        denoised_at = time.perf_counter()
+
+        # Apply adaptive thresholding with gentler parameters
+        thresh = cv2.adaptiveThreshold(
+            denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+            cv2.THRESH_BINARY, 11, 2, dst=_workspace.buffer('thresh', gray.shape)
+        )
+        if timings is not None:
+            timings[f'{tier}_denoise'] = denoised_at - started
+            timings[f'{tier}_threshold'] = time.perf_counter() - denoised_at
+        return thresh
 
-    def preprocess_image(self, image_data: bytes) -> bytes:
+    def save_debug_image(self, image: np.ndarray, tier: str = 'fast') -> None:
+        """Save a preprocessed image for debugging, when ``OCR_DEBUG_IMAGES`` is enabled."""
+        if not current_app.config.get('OCR_DEBUG_IMAGES'):
+            return
+        debug_dir = os.path.join(current_app.root_path, 'debug_images')
+        os.makedirs(debug_dir, exist_ok=True)
+        # Unique name per image so concurrent requests do not overwrite each other
+        debug_path = os.path.join(debug_dir, f"preprocessed-{datetime.now():%Y%m%d-%H%M%S}-{tier}-{uuid.uuid4().hex[:8]}.png")
+        cv2.imwrite(debug_path, image)
+        print(f"Saved preprocessed image to {debug_path}")
+
+    def encode_image(self, image: np.ndarray) -> np.ndarray:
+        """Encode a preprocessed image for upload to the OCR service.
+
+        Thresholded images are written as bilevel PNG by default, which is
+        lossless, small and fast to produce. ``OCR_UPLOAD_FORMAT`` can switch to
+        JPEG, with ``OCR_UPLOAD_QUALITY`` as the PNG compression level (0-9) or
+        the JPEG quality (0-100). The encoded buffer is returned without copying.
+        """
+        upload_format = current_app.config.get('OCR_UPLOAD_FORMAT', 'png')
+        quality = current_app.config.get('OCR_UPLOAD_QUALITY')
+        if upload_format == 'jpeg':
+            params = [cv2.IMWRITE_JPEG_QUALITY, 90 if quality is None else quality]
+            extension = '.jpg'
+        else:
+            params = [cv2.IMWRITE_PNG_BILEVEL, 1, cv2.IMWRITE_PNG_COMPRESSION, 3 if quality is None else quality]
+            extension = '.png'
+        ok, img_encoded = cv2.imencode(extension, image, params)
+        if not ok:
+            raise ValueError(f'Could not encode image as {upload_format}')
+        return img_encoded
+
+    def preprocess_image(self, image_data: bytes, tier: str = 'fast') -> bytes:
         """Preprocess the image to improve OCR accuracy."""
         try:
-            # Convert bytes to numpy array
-            nparr = np.frombuffer(image_data, np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            # Convert to grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            
-            # Apply gentle noise reduction
-            denoised = cv2.fastNlMeansDenoising(gray, None, 10, 7, 21)
-            
-            # Apply adaptive thresholding with gentler parameters
-            thresh = cv2.adaptiveThreshold(
-                denoised, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, 
-                cv2.THRESH_BINARY, 11, 2
-            )
-            
-            # Apply gentle morphological operations
-            kernel = np.ones((1,1), np.uint8)
-            cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
-            
-            # Save debug image
-            debug_dir = os.path.join(current_app.root_path, 'debug_images')
-            os.makedirs(debug_dir, exist_ok=True)
-            debug_path = os.path.join(debug_dir, 'preprocessed.png')
-            cv2.imwrite(debug_path, cleaned)
-            print(f"Saved preprocessed image to {debug_path}")
-            
-            # Convert back to bytes
-            _, img_encoded = cv2.imencode('.png', cleaned)
-            return img_encoded.tobytes()
+            cleaned = self.preprocess(self.load_image(image_data), tier)
+            self.save_debug_image(cleaned, tier)
+            return self.encode_image(cleaned).tobytes()
             
         except Exception as e:
             print(f"Error in image preprocessing: {str(e)}")
@@ -81,106 +259,106 @@ class DateOCRService:
 
     def correct_ocr_errors(self, text: str) -> str:
         """Correct common OCR misreads."""
-        corrections = {
-            'マ': 'M', '了': 'L', 'ー': '-', 'つ': 'T', 'Ⅵ': '6', '「': '(',
-            'see': 'exp', 'beee': 'date', 'expiry': 'exp', 'date': 'date',
-            'jan': '01', 'feb': '02', 'mar': '03', 'apr': '04', 'may': '05',
-            'jun': '06', 'jul': '07', 'aug': '08', 'sep': '09', 'oct': '10',
-            'nov': '11', 'dec': '12'
-        }
-        
-        corrected = text.lower()
-        for wrong, right in corrections.items():
-            corrected = corrected.replace(wrong.lower(), right.lower())
-        return corrected
+        return correct_ocr_errors(text)
 
     def extract_date(self, image_data: bytes) -> Optional[str]:
         """
         Extract date from image data using Azure Computer Vision OCR.
         Returns the date in YYYY-MM-DD format if found, None otherwise.
         """
+        return self.extract_date_result(image_data)['date']
+
+    def extract_date_result(self, image_data: bytes) -> Dict:
+        """Extract a date from image data along with its confidence.
+
+        Results are cached by a hash of the image bytes and, when enabled, by a
+        perceptual hash so near-duplicate scans of a label are also served from
+        cache. On a miss the image is decoded once at reduced size, then run
+        through the preprocessing tiers cheapest first until one of them yields
+        a date. Confidence is 1.0 for a date found by the first tier and lower
+        for dates that needed later tiers.
+
+        Returns:
+            Dict with ``date`` (YYYY-MM-DD or None), ``confidence`` and ``cache``,
+            the cache tier that answered or None
+        """
+        key = content_hash(image_data)
+        cached = ocr_cache.get(key)
+        if cached is not None:
+            return dict(cached, cache='content')
+
+        not_found = {'date': None, 'confidence': 0.0, 'cache': None}
         try:
-            # Check if Azure service is available
-            if not self.vision_client:
-                print("Azure Computer Vision service not available")
-                return None
+            # Check if an OCR backend is available
+            if not self.available:
+                print("OCR service not available")
+                return not_found
 
-            # Preprocess image
-            processed_image = self.preprocess_image(image_data)
-            
-            # Create a file-like object from the bytes
-            image_stream = BytesIO(processed_image)
-            
-            # Call Azure OCR
-            ocr_result = self.vision_client.recognize_printed_text_in_stream(
-                image=image_stream
-            )
-            
-            # Extract all text from OCR results
-            text_blocks = []
-            for region in ocr_result.regions:
-                for line in region.lines:
-                    text = ' '.join([word.text for word in line.words])
-                    text_blocks.append(text)
-                    print(f"Detected text: {text}")
-            
-            # Join all text blocks and clean up
-            full_text = ' '.join(text_blocks)
-            full_text = self.correct_ocr_errors(full_text)
-            print(f"Full text after correction: {full_text}")
-            
-            # Date patterns to look for
-            date_patterns = [
-                # Numeric formats
-                r'\d{1,2}[-/]\d{1,2}[-/]\d{2,4}',  # DD-MM-YYYY or DD/MM/YYYY
-                r'\d{2,4}[-/]\d{1,2}[-/]\d{1,2}',  # YYYY-MM-DD or YYYY/MM/DD
-                r'\d{1,2}[-/]\d{1,2}[-/]\d{2}',    # DD-MM-YY or DD/MM/YY
-                r'\d{2}[-/]\d{1,2}[-/]\d{2,4}',    # YY-MM-DD or YY/MM/YYYY
-                # Expiry date specific patterns
-                r'exp(?:iry)?\s*date\s*[:]?\s*(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
-                r'exp(?:iry)?\s*date\s*[:]?\s*(\d{2,4}[-/]\d{1,2}[-/]\d{1,2})',
-                r'exp(?:iry)?\s*date\s*[:]?\s*(\d{1,2}[-/]\d{1,2}[-/]\d{2})',
-                r'exp(?:iry)?\s*date\s*[:]?\s*(\d{2}[-/]\d{1,2}[-/]\d{2,4})',
-                # Month name formats
-                r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{2,4}',
-                # Expiry with month names
-                r'exp(?:iry)?\s*date\s*[:]?\s*(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{2,4}'
-            ]
-            
-            # Try each pattern
-            for pattern in date_patterns:
-                matches = re.findall(pattern, full_text)
-                if matches:
-                    date_str = matches[0] if isinstance(matches[0], str) else matches[0][0]
-                    print(f"Found potential date: {date_str}")
-                    try:
-                        # Try different date formats
-                        formats = [
-                            '%d-%m-%Y', '%d/%m/%Y',  # DD-MM-YYYY or DD/MM/YYYY
-                            '%Y-%m-%d', '%Y/%m/%d',  # YYYY-MM-DD or YYYY/MM/DD
-                            '%d-%m-%y', '%d/%m/%y',  # DD-MM-YY or DD/MM/YY
-                            '%y-%m-%d', '%y/%m/%d',  # YY-MM-DD or YY/MM/DD
-                            '%B %d, %Y', '%b %d, %Y' # Month name formats
-                        ]
-                        
-                        for fmt in formats:
-                            try:
-                                date_obj = datetime.strptime(date_str, fmt)
-                                # Validate year is reasonable
-                                if 2000 <= date_obj.year <= 2100:
-                                    formatted_date = date_obj.strftime('%Y-%m-%d')
-                                    print(f"Successfully parsed date: {formatted_date}")
-                                    return formatted_date
-                            except ValueError:
-                                continue
-                            
-                    except Exception as e:
-                        print(f"Error parsing date {date_str}: {str(e)}")
-                        continue
-            
-            print("No valid date found in text")
-            return None
+            try:
+                gray = self.load_image(image_data)
+            except Exception as e:
+                print(f"Error decoding image, sending original: {str(e)}")
+                ocr_cache.miss()
+                date = self.parse_date(self.recognize_text(image_data))
+                result = {'date': date, 'confidence': 1.0 if date else 0.0}
+                ocr_cache.put(key, result)
+                return dict(result, cache=None)
+
+            phash = perceptual_hash(gray)
+            similar = ocr_cache.get_similar(phash)
+            if similar is not None:
+                ocr_cache.put(key, similar, phash)
+                return dict(similar, cache='perceptual')
+            ocr_cache.miss()
+
+            result = {'date': None, 'confidence': 0.0}
+            tiers = current_app.config.get('OCR_PREPROCESS_TIERS', PREPROCESS_TIERS)
+            for index, tier in enumerate(tiers):
+                cleaned = self.preprocess(gray, tier)
+                self.save_debug_image(cleaned, tier)
+                processed_image = self.encode_image(cleaned)
+                date = self.parse_date(self.recognize_text(processed_image))
+                if date:
+                    result = {'date': date, 'confidence': round(1.0 / (index + 1), 2)}
+                    break
+                print(f"No date found with {tier} preprocessing")
+
+            ocr_cache.put(key, result, phash)
+            return dict(result, cache=None)
             
         except Exception as e:
             print(f"Error in OCR processing: {str(e)}")
-            return None 
\ No newline at end of file
+            return not_found
+
+    def recognize_text(self, image_data) -> str:
+        """Run the OCR backend on an image and return the detected text, corrected."""
+        text_blocks = self.backend.recognize(image_data)
+        for text in text_blocks:
+            print(f"Detected text: {text}")
+        
+        # Join all text blocks and clean up
+        full_text = ' '.join(text_blocks)
+        full_text = self.correct_ocr_errors(full_text)
+        print(f"Full text after correction: {full_text}")
+        return full_text
+
+    def parse_date(self, full_text: str) -> Optional[str]:
+        """Find the most likely expiry date in OCR text, formatted as YYYY-MM-DD."""
+        date = parse_date(full_text)
+        if date:
+            print(f"Successfully parsed date: {date}")
+        else:
+            print("No valid date found in text")
+        return date
+
+_service_lock = threading.Lock()
+
+def get_ocr_service() -> DateOCRService:
+    """The app's shared DateOCRService, created on first use."""
+    service = current_app.extensions.get('date_ocr_service')
+    if service is None:
+        with _service_lock:
+            service = current_app.extensions.get('date_ocr_service')
+            if service is None:
+                service = current_app.extensions['date_ocr_service'] = DateOCRService()
+    return service
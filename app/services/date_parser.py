@@ -0,0 +1,202 @@
+import re
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+# Years accepted as expiry dates
+MIN_YEAR = 2000
+MAX_YEAR = 2100
+
+# Characters a keyword may precede a date by and still label it
+CONTEXT_WINDOW = 40
+
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'oct': 10, 'nov': 11, 'dec': 12
+}
+
+_MONTH = (
+    r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+    r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)'
+)
+
+# Every date shape starts with a digit, so the scan can skip straight to digits.
+# The lookbehind comes after the first digit to keep that skip. Every branch
+# after the leading number needs a non-digit next, so the number is taken whole
+# and checked for that before any branch is tried; plain numbers such as "450kj"
+# fail at once. Month-first dates are found from their day and checked for a
+# month name before it. ASCII classes are cheaper to test than Unicode digits
+# and spaces, and OCR backends return ASCII digits.
+_DATE_RE = re.compile(rf'''
+    (?P<first>\d(?<!\d\d)\d{{0,3}})(?!\d)(?:
+        [-/.](?P<num_b>\d{{1,2}})[-/.](?P<num_c>\d{{4}}|\d{{1,2}})
+      | (?:st|nd|rd|th)?[\s/.-]*(?P<dmy_m>{_MONTH})\.?[\s/.,-]*(?P<dmy_y>\d{{4}}|\d{{2}})
+      | (?:st|nd|rd|th)?,?\s+(?P<mdy_y>\d{{4}}|\d{{2}})
+    )(?!\d)
+''', re.VERBOSE | re.ASCII)
+
+_MONTH_BEFORE_RE = re.compile(rf'(?<![a-z])(?P<month>{_MONTH})\.?\s*\Z', re.ASCII)
+
+# Keywords labelling the date after them; no leading anchor so the scan can skip
+# to their first letters, word starts are checked afterwards
+_CONTEXT_RE = re.compile(
+    r'(?:exp(?:iry|ires|iration|\.)?|best\s*before|best\s*by|use\s*by|bbe?'
+    r'|mfg|mfd|manufactured|made|packed|pkd|prod(?:uced)?)(?![a-z])',
+    re.ASCII
+)
+_EXPIRY_PREFIXES = ('exp', 'best', 'use', 'bb')
+
+# Longest month name plus separators that can precede a month-first day
+_MONTH_LOOKBEHIND = 12
+
+# Characters OCR returns for look-alike Latin letters and digits
+_CHARACTER_CORRECTIONS = str.maketrans({
+    'マ': 'm', '了': 'l', 'ー': '-', 'つ': 't', 'Ⅵ': '6', '「': '('
+})
+
+# Whole words OCR is known to misread on labels
+_WORD_CORRECTIONS = {'see': 'exp', 'beee': 'date'}
+_WORD_RE = re.compile(r'\b(?:' + '|'.join(_WORD_CORRECTIONS) + r')\b')
+
+# Numeric date tokens with letters misread for digits, e.g. "3l/12/2O26"
+_DIGIT_LOOKALIKES = str.maketrans({'o': '0', 'i': '1', 'l': '1', '|': '1', 's': '5'})
+_NUMERIC_TOKEN_RE = re.compile(r'(?<![\w|])[\doil|s]{1,4}[-/.][\doil|s]{1,2}[-/.][\doil|s]{2,4}(?![\w|])')
+
+def correct_ocr_errors(text: str) -> str:
+    """Lowercase OCR text and correct common misreads.
+
+    Only whole words and numeric date tokens are corrected, so words that
+    merely contain a correction (such as "seed" or "mayonnaise") are left as
+    they are.
+    """
+    corrected = text.lower().translate(_CHARACTER_CORRECTIONS)
+    corrected = _WORD_RE.sub(lambda match: _WORD_CORRECTIONS[match.group()], corrected)
+    return _NUMERIC_TOKEN_RE.sub(
+        lambda match: match.group().translate(_DIGIT_LOOKALIKES) if any(c.isdigit() for c in match.group()) else match.group(),
+        corrected
+    )
+
+def _year(digits: str) -> int:
+    return int(digits) if len(digits) == 4 else 2000 + int(digits)
+
+def _valid_date(year: int, month: int, day: int) -> Optional[date]:
+    if not MIN_YEAR <= year <= MAX_YEAR or not 1 <= month <= 12 or not 1 <= day <= 31:
+        return None
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+def _match_date(text: str, match: re.Match) -> Optional[date]:
+    """The date a candidate match stands for, or None if it is not a valid date."""
+    first, num_b, num_c, dmy_m, dmy_y, mdy_y = match.groups()
+    if num_c:
+        second = int(num_b)
+        if len(first) == 4:
+            # YYYY-MM-DD
+            return _valid_date(int(first), second, int(num_c)) if len(num_c) <= 2 else None
+        if len(first) > 2:
+            return None
+        if len(num_c) == 4:
+            # Day first, falling back to month first when that is the only valid reading
+            return _valid_date(int(num_c), second, int(first)) or _valid_date(int(num_c), int(first), second)
+        if len(num_c) == 2:
+            # DD-MM-YY, then YY-MM-DD
+            return _valid_date(_year(num_c), second, int(first)) or _valid_date(_year(first), second, int(num_c))
+        return None
+    if len(first) > 2:
+        return None
+    if dmy_m:
+        return _valid_date(_year(dmy_y), MONTHS[dmy_m[:3]], int(first))
+    month = _MONTH_BEFORE_RE.search(text, max(0, match.start() - _MONTH_LOOKBEHIND), match.start())
+    if month is None:
+        return None
+    return _valid_date(_year(mdy_y), MONTHS[month.group('month')[:3]], int(first))
+
+# Today's date and the time.time() it stops being today
+_today = (0.0, date.min)
+
+def _current_date() -> date:
+    """Today's date, re-read after midnight rather than on every parse."""
+    global _today
+    now = time.time()
+    if now >= _today[0]:
+        today = date.today()
+        _today = (time.mktime((today + timedelta(days=1)).timetuple()), today)
+    return _today[1]
+
+def _keywords(text: str, end: int) -> List[Tuple[int, str]]:
+    """End position and type ('expiry' or 'made') of every labelling keyword before ``end``, in text order."""
+    keywords = []
+    for match in _CONTEXT_RE.finditer(text, 0, end):
+        start = match.start()
+        if start == 0 or not text[start - 1].isalpha():
+            keywords.append((match.end(), 'expiry' if match.group().startswith(_EXPIRY_PREFIXES) else 'made'))
+    return keywords
+
+def _dates(text: str) -> List[Tuple[int, date, bool]]:
+    """Position, date and whether the year has four digits, for every valid date in the text."""
+    dates = []
+    for match in _DATE_RE.finditer(text):
+        parsed = _match_date(text, match)
+        if parsed is not None:
+            four_digit_year = len(match.group(1)) == 4 or len(match.group(3) or match.group(5) or match.group(6)) == 4
+            dates.append((match.start(), parsed, four_digit_year))
+    return dates
+
+def _score(text: str, dates: List[Tuple[int, date, bool]], today: Optional[date]) -> List[Tuple[int, int, date, Optional[str]]]:
+    """(score, position, date, context) for each date found by ``_dates``."""
+    keywords = _keywords(text, dates[-1][0]) if dates else []
+    today = today or _current_date()
+    scored = []
+    for start, parsed, four_digit_year in dates:
+        context = None
+        for end, kind in keywords:
+            if end > start:
+                break
+            if start - end <= CONTEXT_WINDOW:
+                context = kind
+
+        score = 0
+        if context == 'expiry':
+            score += 4
+        elif context == 'made':
+            score -= 4
+        if parsed >= today:
+            score += 2
+        if four_digit_year:
+            score += 1
+        scored.append((score, start, parsed, context))
+    return scored
+
+def date_candidates(text: str, today: Optional[date] = None) -> List[Dict]:
+    """Every date in OCR text, with a score for how likely it is the expiry date.
+
+    The text is scanned once for dates and once for keywords. Dates labelled by an expiry keyword ("exp", "best before",
+    "use by") shortly before them score highest and dates labelled as
+    manufacturing or packing dates lowest; dates in the future and dates with
+    a four-digit year score higher.
+
+    Returns:
+        List of dicts with ``date``, ``score``, ``position`` and ``context``
+        (the labelling keyword type or None), in text order
+    """
+    return [
+        {'date': parsed, 'score': score, 'position': position, 'context': context}
+        for score, position, parsed, context in _score(text, _dates(text), today)
+    ]
+
+def parse_date(text: str, today: Optional[date] = None) -> Optional[str]:
+    """The most likely expiry date in OCR text as YYYY-MM-DD, or None.
+
+    The highest scoring candidate wins; ties go to the one earliest in the text.
+    A single candidate is returned without scoring.
+    """
+    dates = _dates(text)
+    if len(dates) <= 1:
+        return dates[0][1].isoformat() if dates else None
+    best = None
+    for candidate in _score(text, dates, today):
+        if best is None or candidate[0] > best[0]:
+            best = candidate
+    return best[2].isoformat()
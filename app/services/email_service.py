@@ -1,6 +1,7 @@
 from flask import current_app, render_template
 from flask_mail import Message
 from app.core.extensions import mail
+from app.core.metrics import track_outbound
 from app.models.user import User
 from typing import List, Dict, Any, Optional, Union, Literal
 import logging
@@ -81,7 +82,8 @@ class EmailService:
                 return False
             
             try:
-                self.mail.send(msg)
+                with track_outbound('smtp'):
+                    self.mail.send(msg)
                 logger.info(f"Email sent successfully to {recipients}")
                 return True
             except smtplib.SMTPAuthenticationError as auth_error:
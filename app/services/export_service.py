@@ -0,0 +1,203 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+from flask import Response, current_app, stream_with_context
+from sqlalchemy import select
+from app.core.extensions import db
+from app.models.item import Item
+from app.models.report import Report
+
+# Content type per export format
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet'
+}
+
+ITEM_EXPORT_FIELDS = [
+    'id', 'name', 'description', 'quantity', 'unit', 'batch_number', 'purchase_date',
+    'expiry_date', 'purchase_price', 'selling_price', 'cost_price', 'discounted_price',
+    'location', 'status', 'zoho_item_id', 'created_at', 'updated_at'
+]
+
+REPORT_EXPORT_FIELDS = [
+    'id', 'date', 'total_items', 'total_value', 'expiring_items',
+    'expired_items', 'low_stock_items', 'is_public'
+]
+
+REPORT_DETAIL_FIELDS = [
+    'section', 'id', 'name', 'quantity', 'unit', 'expiry_date',
+    'days_until_expiry', 'location', 'batch_number', 'value'
+]
+
+REPORT_DETAIL_TYPES = [str, int, str, float, str, str, int, str, str, float]
+
+def column_types(model, fields: List[str]) -> List[type]:
+    """Python types of a model's columns, used to type Parquet exports."""
+    return [model.__table__.c[field].type.python_type for field in fields]
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what has been written since the last drain."""
+
+    def __init__(self) -> None:
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+class ExportService:
+    """Service for streaming inventory and report exports.
+
+    Rows are read with ``yield_per`` so only one batch is held in memory at a
+    time, and every batch is encoded and handed to the response as soon as it
+    is fetched.
+    """
+
+    def __init__(self, batch_size: Optional[int] = None) -> None:
+        """Initialize the service with the number of rows fetched per batch."""
+        self.batch_size = batch_size or current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+
+    @staticmethod
+    def available_formats() -> List[str]:
+        """Formats that can be produced with the installed packages."""
+        formats = ['csv', 'ndjson']
+        try:
+            import pyarrow  # noqa: F401
+            formats.append('parquet')
+        except ImportError:
+            pass
+        return formats
+
+    def item_batches(self, user_id: int) -> Iterator[Sequence]:
+        """Batches of a user's item rows, in ``ITEM_EXPORT_FIELDS`` order."""
+        stmt = select(*[getattr(Item, field) for field in ITEM_EXPORT_FIELDS]).where(
+            Item.user_id == user_id
+        ).order_by(Item.id).execution_options(yield_per=self.batch_size)
+        yield from db.session.execute(stmt).partitions()
+
+    def report_batches(self, user_id: int, start_date: date, end_date: date) -> Iterator[Sequence]:
+        """Batches of a user's report summary rows, in ``REPORT_EXPORT_FIELDS`` order."""
+        stmt = select(*[getattr(Report, field) for field in REPORT_EXPORT_FIELDS]).where(
+            Report.user_id == user_id,
+            Report.date >= start_date,
+            Report.date <= end_date
+        ).order_by(Report.date).execution_options(yield_per=self.batch_size)
+        yield from db.session.execute(stmt).partitions()
+
+    def report_detail_batches(self, report: Report) -> Iterator[List[tuple]]:
+        """Batches of the item rows in each section of a report's details."""
+        report_data = report.report_data or {}
+        sections = [
+            (f'expiry_{name}', bucket.get('items', []))
+            for name, bucket in report_data.get('expiry_analysis', {}).items()
+        ] + [
+            (f'risk_{name}', items)
+            for name, items in report_data.get('risk_analysis', {}).items()
+        ]
+        batch = []
+        for section, items in sections:
+            for item in items:
+                batch.append((section,) + tuple(item.get(field) for field in REPORT_DETAIL_FIELDS[1:]))
+                if len(batch) >= self.batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def stream(self, batches: Iterable[Sequence], fields: List[str], export_format: str,
+               types: Optional[List[type]] = None) -> Iterator[bytes]:
+        """Encode row batches as a stream of ``export_format`` chunks.
+
+        Args:
+            batches: Iterable of row batches, each row in ``fields`` order
+            fields: Column names
+            export_format: One of ``EXPORT_FORMATS``
+            types: Python type per column; required for Parquet
+        """
+        if export_format == 'csv':
+            return self._stream_csv(batches, fields)
+        if export_format == 'ndjson':
+            return self._stream_ndjson(batches, fields)
+        if export_format == 'parquet':
+            return self._stream_parquet(batches, fields, types)
+        raise ValueError(f'Unsupported export format: {export_format}')
+
+    def response(self, batches: Iterable[Sequence], fields: List[str], export_format: str,
+                 filename: str, types: Optional[List[type]] = None) -> Response:
+        """Chunked download response streaming the encoded batches."""
+        chunks = self.stream(batches, fields, export_format, types)
+        return Response(
+            stream_with_context(chunks),
+            mimetype=EXPORT_FORMATS[export_format],
+            headers={
+                'Content-Disposition': f'attachment; filename="{filename}.{export_format}"',
+                'X-Content-Type-Options': 'nosniff'
+            }
+        )
+
+    @staticmethod
+    def _stream_csv(batches: Iterable[Sequence], fields: List[str]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        yield buffer.getvalue().encode('utf-8')
+        for batch in batches:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(batch)
+            yield buffer.getvalue().encode('utf-8')
+
+    @staticmethod
+    def _stream_ndjson(batches: Iterable[Sequence], fields: List[str]) -> Iterator[bytes]:
+        for batch in batches:
+            lines = [
+                json.dumps(dict(zip(fields, row)), default=_json_value)
+                for row in batch
+            ]
+            yield ('\n'.join(lines) + '\n').encode('utf-8')
+
+    @staticmethod
+    def _stream_parquet(batches: Iterable[Sequence], fields: List[str], types: List[type]) -> Iterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        arrow_types = {
+            int: pa.int64(), float: pa.float64(), str: pa.string(), bool: pa.bool_(),
+            datetime: pa.timestamp('us'), date: pa.date32()
+        }
+        schema = pa.schema([(field, arrow_types.get(kind, pa.string())) for field, kind in zip(fields, types)])
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema)
+        for batch in batches:
+            columns = list(zip(*batch))
+            table = pa.Table.from_arrays(
+                [pa.array(column, type=schema.field(index).type) for index, column in enumerate(columns)],
+                schema=schema
+            )
+            # Each batch becomes one row group, sent as soon as it is written
+            writer.write_table(table)
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
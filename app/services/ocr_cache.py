@@ -0,0 +1,145 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import hashlib
+import threading
+import time
+from typing import Dict, Optional
+import cv2
+import numpy as np
+from flask import current_app
+from app.core.extensions import db
+from app.models.ocr_result import OCRResult
+
+def content_hash(image_data: bytes) -> str:
+    """SHA-256 of the raw image bytes."""
+    return hashlib.sha256(image_data).hexdigest()
+
+def perceptual_hash(gray: np.ndarray) -> int:
+    """64-bit difference hash of a grayscale image, as a signed integer.
+
+    Re-encoded, resized or slightly re-exposed copies of the same photo hash to
+    the same or nearby values, unlike the content hash.
+    """
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(np.packbits(bits).view('>i8')[0])
+
+def hash_distance(first: int, second: int) -> int:
+    """Number of differing bits between two perceptual hashes."""
+    return bin((first ^ second) & 0xFFFFFFFFFFFFFFFF).count('1')
+
+class OCRResultCache:
+    """LRU cache of OCR results with a TTL, keyed by image content hash.
+
+    Entries hold the extracted date (or None when no date was found) and its
+    confidence. An optional perceptual-hash tier matches near-duplicate images
+    within ``OCR_CACHE_PHASH_DISTANCE`` bits, and results can also be persisted
+    to the ``ocr_results`` table so they survive restarts and are shared
+    between processes.
+    """
+
+    def __init__(self) -> None:
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {'hits': 0, 'perceptual_hits': 0, 'persisted_hits': 0, 'misses': 0, 'stores': 0}
+
+    @staticmethod
+    def _config(key: str, default):
+        return current_app.config.get(key, default)
+
+    def _fresh(self, entry: Dict) -> bool:
+        # "No date found" may just be a blurry shot, so it is only kept briefly
+        if entry['result']['date'] is None:
+            ttl = self._config('OCR_CACHE_NEGATIVE_TTL', 300)
+        else:
+            ttl = self._config('OCR_CACHE_TTL', 86400)
+        return time.time() - entry['stored_at'] < ttl
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            self.counters[counter] += 1
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Look up a result by content hash, in memory then in the persisted table."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._fresh(entry):
+                    self._entries.move_to_end(key)
+                    self.counters['hits'] += 1
+                    return entry['result']
+                del self._entries[key]
+
+        if self._config('OCR_CACHE_PERSIST', False):
+            stored = db.session.get(OCRResult, key)
+            max_age = timedelta(seconds=self._config('OCR_CACHE_TTL', 86400))
+            if stored is not None and stored.created_at >= datetime.utcnow() - max_age:
+                result = {'date': stored.date, 'confidence': stored.confidence}
+                self._remember(key, stored.perceptual_hash, result, stored.created_at.timestamp())
+                self._count('persisted_hits')
+                return result
+        return None
+
+    def get_similar(self, phash: int) -> Optional[Dict]:
+        """Look up a result for a near-duplicate image by perceptual hash."""
+        if not self._config('OCR_CACHE_PERCEPTUAL', False):
+            return None
+        distance = self._config('OCR_CACHE_PHASH_DISTANCE', 4)
+        with self._lock:
+            for key in reversed(self._entries):
+                entry = self._entries[key]
+                if entry['phash'] is None or not self._fresh(entry):
+                    continue
+                if hash_distance(entry['phash'], phash) <= distance:
+                    self._entries.move_to_end(key)
+                    self.counters['perceptual_hits'] += 1
+                    return entry['result']
+        return None
+
+    def miss(self) -> None:
+        """Record a lookup that found nothing in any tier."""
+        self._count('misses')
+
+    def put(self, key: str, result: Dict, phash: Optional[int] = None) -> None:
+        """Store a result in memory and, when enabled, in the persisted table.
+
+        Only results the backend actually returned belong here; backend errors
+        are never cached. Results without a date are kept for
+        ``OCR_CACHE_NEGATIVE_TTL`` seconds and are not persisted.
+        """
+        self._remember(key, phash, result, time.time())
+        self._count('stores')
+        if self._config('OCR_CACHE_PERSIST', False) and result['date'] is not None:
+            try:
+                db.session.merge(OCRResult(
+                    image_hash=key, perceptual_hash=phash, date=result['date'],
+                    confidence=result['confidence'], created_at=datetime.utcnow()
+                ))
+                db.session.commit()
+            except Exception as e:
+                current_app.logger.error(f"Error persisting OCR result: {str(e)}")
+                db.session.rollback()
+
+    def _remember(self, key: str, phash: Optional[int], result: Dict, stored_at: float) -> None:
+        with self._lock:
+            self._entries[key] = {'result': result, 'phash': phash, 'stored_at': stored_at}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._config('OCR_CACHE_SIZE', 1024):
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and the current number of cached entries."""
+        with self._lock:
+            stats = dict(self.counters, size=len(self._entries))
+        lookups = stats['hits'] + stats['perceptual_hits'] + stats['persisted_hits'] + stats['misses']
+        stats['hit_rate'] = round((lookups - stats['misses']) / lookups, 3) if lookups else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Drop every in-memory entry and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            for counter in self.counters:
+                self.counters[counter] = 0
+
+ocr_cache = OCRResultCache()
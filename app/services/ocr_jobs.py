@@ -0,0 +1,175 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import threading
+import time
+import uuid
+from typing import Callable, Dict, Optional
+from flask import current_app
+from app.core.extensions import db
+from app.services.date_ocr_service import get_ocr_service
+
+# Job states
+JOB_QUEUED = 'queued'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+
+class QueueFullError(Exception):
+    """Raised when the OCR queue cannot take another job.
+
+    Attributes:
+        retry_after (int): Suggested number of seconds before retrying
+    """
+
+    def __init__(self, retry_after: int) -> None:
+        super().__init__('OCR queue is full')
+        self.retry_after = retry_after
+
+class OCRJobQueue:
+    """Bounded pool running date extraction jobs in the background.
+
+    At most ``workers`` jobs run at once and at most ``queue_size`` more wait;
+    beyond that ``submit`` raises ``QueueFullError`` instead of letting work
+    pile up. Finished jobs are kept for ``job_ttl`` seconds so clients can
+    poll for their result.
+    """
+
+    def __init__(self, app, service, workers: int = 4, queue_size: int = 16, job_ttl: int = 600) -> None:
+        self.app = app
+        self.service = service
+        self.workers = workers
+        self.queue_size = queue_size
+        self.job_ttl = job_ttl
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='ocr-job')
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._durations = []
+
+    def submit(self, image_data: bytes, timeout: Optional[float] = None,
+               on_done: Optional[Callable[[Dict], None]] = None) -> Dict:
+        """Queue a job for an image.
+
+        Args:
+            image_data: Raw image bytes
+            timeout: Seconds to wait for a free slot; by default fail at once
+            on_done: Called with the job once it has finished
+
+        Raises:
+            QueueFullError: If every worker is busy and the queue is full
+        """
+        acquired = self._slots.acquire(timeout=timeout) if timeout else self._slots.acquire(blocking=False)
+        if not acquired:
+            raise QueueFullError(self.retry_after())
+
+        job = {
+            'id': uuid.uuid4().hex,
+            'status': JOB_QUEUED,
+            'result': None,
+            'error': None,
+            'created_at': datetime.utcnow(),
+            'finished_at': None,
+            'done': threading.Event(),
+            'on_done': on_done
+        }
+        with self._lock:
+            self._expire_jobs()
+            self._jobs[job['id']] = job
+        try:
+            self._executor.submit(self._run, job, image_data)
+        except Exception:
+            self._slots.release()
+            with self._lock:
+                self._jobs.pop(job['id'], None)
+            raise
+        return job
+
+    def _run(self, job: Dict, image_data: bytes) -> None:
+        started = time.perf_counter()
+        job['status'] = JOB_RUNNING
+        try:
+            with self.app.app_context():
+                try:
+                    job['result'] = self.service.extract_date_result(image_data)
+                finally:
+                    db.session.remove()
+            job['status'] = JOB_DONE
+        except Exception as e:
+            self.app.logger.error(f"OCR job {job['id']} failed: {str(e)}")
+            job['error'] = str(e)
+            job['status'] = JOB_FAILED
+        finally:
+            job['finished_at'] = datetime.utcnow()
+            with self._lock:
+                self._durations = (self._durations + [time.perf_counter() - started])[-50:]
+            self._slots.release()
+            job['done'].set()
+            if job['on_done']:
+                job['on_done'](job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Get a job by ID, or None if it is unknown or has expired."""
+        with self._lock:
+            self._expire_jobs()
+            return self._jobs.get(job_id)
+
+    def wait(self, job: Dict, timeout: Optional[float] = None) -> bool:
+        """Wait for a job to finish; returns False on timeout."""
+        return job['done'].wait(timeout)
+
+    def pending(self) -> int:
+        """Number of jobs queued or running."""
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job['status'] in (JOB_QUEUED, JOB_RUNNING))
+
+    def retry_after(self) -> int:
+        """Estimated seconds until a slot frees up, based on recent job durations."""
+        with self._lock:
+            durations = list(self._durations)
+        average = sum(durations) / len(durations) if durations else 1.0
+        return max(1, round(average * (self.queue_size + self.workers) / self.workers))
+
+    def _expire_jobs(self) -> None:
+        # Called with the lock held
+        cutoff = datetime.utcnow().timestamp() - self.job_ttl
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job['finished_at'] is not None and job['finished_at'].timestamp() < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def to_dict(job: Dict) -> Dict:
+        """Public view of a job."""
+        data = {
+            'id': job['id'],
+            'status': job['status'],
+            'created_at': job['created_at'].isoformat(),
+            'finished_at': job['finished_at'].isoformat() if job['finished_at'] else None
+        }
+        if job['status'] == JOB_DONE:
+            data['result'] = job['result']
+        elif job['status'] == JOB_FAILED:
+            data['error'] = job['error']
+        return data
+
+_create_lock = threading.Lock()
+
+def get_ocr_jobs() -> OCRJobQueue:
+    """The app's OCR job queue, created on first use."""
+    jobs = current_app.extensions.get('ocr_jobs')
+    if jobs is None:
+        service = get_ocr_service()
+        with _create_lock:
+            jobs = current_app.extensions.get('ocr_jobs')
+            if jobs is None:
+                config = current_app.config
+                jobs = current_app.extensions['ocr_jobs'] = OCRJobQueue(
+                    current_app._get_current_object(),
+                    service,
+                    workers=config.get('OCR_WORKERS', 4),
+                    queue_size=config.get('OCR_QUEUE_SIZE', 16),
+                    job_ttl=config.get('OCR_JOB_TTL', 600)
+                )
+    return jobs
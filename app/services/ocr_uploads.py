@@ -0,0 +1,81 @@
+import os
+import magic
+from flask import current_app
+from werkzeug.datastructures import FileStorage
+from app.services.date_ocr_service import image_dimensions, tiff_directory_offset, tiff_dimensions
+
+# Image types OpenCV can decode for OCR
+DEFAULT_ALLOWED_TYPES = ('image/jpeg', 'image/png', 'image/webp', 'image/bmp', 'image/tiff')
+
+# Bytes read up front: enough for libmagic and for a JPEG header behind typical EXIF data
+HEADER_BYTES = 64 * 1024
+
+# Bytes libmagic needs to identify an image
+SNIFF_BYTES = 2048
+
+# Bytes read from a TIFF image directory stored past the header; the size tags come first
+TIFF_DIRECTORY_BYTES = 4096
+
+class UploadRejected(Exception):
+    """Raised when an uploaded image is refused before it is read in full.
+
+    Attributes:
+        status_code (int): HTTP status for the response
+    """
+
+    def __init__(self, message: str, status_code: int = 400) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+def read_image_upload(upload: FileStorage) -> bytearray:
+    """Validate an uploaded image from its header, then read it into one buffer.
+
+    The upload stays in Werkzeug's spooled temporary file while its type is
+    sniffed from the magic bytes and its dimensions are read from the image
+    header, so unsupported files and decompression bombs are rejected without
+    loading the body. Uploads whose dimensions cannot be read from the header
+    are refused too, rather than left for a full decode to size. Accepted uploads are read straight into a buffer of
+    their exact size, which ``np.frombuffer`` and ``cv2.imdecode`` use as is.
+
+    Raises:
+        UploadRejected: For empty, non-image, unsupported or oversized uploads
+    """
+    stream = upload.stream
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    if not size:
+        raise UploadRejected('Empty image file')
+
+    header = stream.read(HEADER_BYTES)
+    content_type = magic.from_buffer(header[:SNIFF_BYTES], mime=True)
+    if content_type not in current_app.config.get('OCR_ALLOWED_TYPES', DEFAULT_ALLOWED_TYPES):
+        raise UploadRejected(f'Unsupported file type: {content_type}', 415)
+
+    dimensions = image_dimensions(header)
+    directory = tiff_directory_offset(header)
+    if dimensions is None and directory is not None and len(header) <= directory < size:
+        stream.seek(directory)
+        dimensions = tiff_dimensions(header[:4], stream.read(TIFF_DIRECTORY_BYTES))
+        stream.seek(len(header))
+    if dimensions is None:
+        raise UploadRejected('Could not read the image dimensions from its header', 415)
+    max_pixels = current_app.config.get('OCR_MAX_PIXELS', 60_000_000)
+    if dimensions[0] * dimensions[1] > max_pixels:
+        raise UploadRejected(
+            f'Image is {dimensions[0]}x{dimensions[1]}; at most {max_pixels} pixels are accepted', 413
+        )
+
+    buffer = bytearray(size)
+    buffer[:len(header)] = header
+    view = memoryview(buffer)
+    position = len(header)
+    while position < size:
+        read = stream.readinto(view[position:])
+        if not read:
+            break
+        position += read
+    view.release()
+    if position < size:
+        del buffer[position:]
+    return buffer
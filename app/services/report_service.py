@@ -1,11 +1,56 @@
+from collections import OrderedDict
 from datetime import datetime, timedelta
+import hashlib
 import secrets
+import threading
 from typing import Dict, List, Optional
-from flask import current_app
+from flask import current_app, render_template
+from markupsafe import Markup
+from sqlalchemy.orm import load_only
 from app.core.extensions import db
 from app.models.report import Report
 from app.models.item import Item
 from app.models.user import User
+from app.services.analytics_service import InventoryAnalytics
+
+# Templates a report page is rendered from; their contents version cached pages
+REPORT_TEMPLATES = ('base.html', 'view_report.html', 'view_report_body.html')
+_template_versions = []
+
+class RenderedReportCache:
+    """Thread-safe LRU cache of rendered report HTML."""
+    
+    def __init__(self, max_size: int = 256) -> None:
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key) -> Optional[Markup]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is not None:
+                self._entries.move_to_end(key)
+            return body
+    
+    def put(self, key, body: Markup) -> None:
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            max_size = current_app.config.get('REPORT_HTML_CACHE_SIZE', self.max_size)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+rendered_reports = RenderedReportCache()
+
+# Columns needed to list reports; the detailed payload is left unloaded
+REPORT_SUMMARY_COLUMNS = (
+    Report.id, Report.user_id, Report.date, Report.total_items, Report.total_value,
+    Report.expiring_items, Report.expired_items, Report.low_stock_items, Report.is_public
+)
 
 class ReportService:
     """Service for generating and managing inventory reports."""
@@ -22,169 +67,23 @@ class ReportService:
                 db.session.delete(existing_report)
                 db.session.commit()
             
-            # Get all items for the user
-            items = Item.query.filter_by(user_id=user_id).all()
-            current_app.logger.info(f"Found {len(items)} items for user {user_id}")
-            
-            # Calculate report metrics
-            total_items = len(items)
-            expiring_items = len([item for item in items if item.is_near_expiry])
-            expired_items = len([item for item in items if item.is_expired])
-            low_stock_items = len([item for item in items if (item.quantity or 0) < 10])
-            
-            current_app.logger.info(f"Calculated metrics - Total: {total_items}, Expiring: {expiring_items}, Expired: {expired_items}, Low Stock: {low_stock_items}")
-            
-            # Calculate expiry risk metrics
-            critical_items = [item for item in items if item.is_near_expiry and (item.quantity or 0) > 10]
-            high_value_expiring = [item for item in items if item.is_near_expiry and (item.quantity or 0) * (item.cost_price or 0) > 1000]
-            
-            current_app.logger.info(f"Risk metrics - Critical: {len(critical_items)}, High Value: {len(high_value_expiring)}")
-            
-            # Group items by expiry timeframes
-            expiry_timeframes = {
-                'next_week': [],
-                'next_month': [],
-                'next_quarter': []
-            }
-            
-            for item in items:
-                if not item.expiry_date:
-                    continue
-                days = item.days_until_expiry
-                if days is None:
-                    continue
-                    
-                if 0 < days <= 7:
-                    expiry_timeframes['next_week'].append(item)
-                elif 7 < days <= 30:
-                    expiry_timeframes['next_month'].append(item)
-                elif 30 < days <= 90:
-                    expiry_timeframes['next_quarter'].append(item)
+            backend = current_app.config.get('REPORT_ANALYTICS_BACKEND', 'vectorized')
+            if backend == 'vectorized':
+                # Load the user's items as one columnar frame and compute metrics vectorized
+                metrics = InventoryAnalytics.for_user(user_id).report_metrics()
+            else:
+                items = Item.query.filter_by(user_id=user_id).order_by(Item.id).all()
+                current_app.logger.info(f"Found {len(items)} items for user {user_id}")
+                metrics = self.build_report_metrics(items)
             
-            current_app.logger.info(f"Expiry timeframes - Week: {len(expiry_timeframes['next_week'])}, Month: {len(expiry_timeframes['next_month'])}, Quarter: {len(expiry_timeframes['next_quarter'])}")
+            summary = metrics['summary']
+            current_app.logger.info(f"Calculated metrics ({backend}) - Total: {summary['total_items']}, Expiring: {summary['expiring_items']}, Expired: {summary['expired_items']}, Low Stock: {summary['low_stock_items']}")
             
             # Calculate historical comparison (last 7 days)
             last_week = datetime.now().date() - timedelta(days=7)
             last_week_report = Report.query.filter_by(user_id=user_id, date=last_week).first()
             
-            # Prepare detailed report data
-            report_data = {
-                'summary': {
-                    'total_items': total_items,
-                    'expiring_items': expiring_items,
-                    'expired_items': expired_items,
-                    'low_stock_items': low_stock_items,
-                    'critical_items': len(critical_items),
-                    'high_value_expiring': len(high_value_expiring)
-                },
-                'expiry_analysis': {
-                    'next_week': {
-                        'count': len(expiry_timeframes['next_week']),
-                        'items': [
-                            {
-                                'id': item.id,
-                                'name': item.name,
-                                'quantity': item.quantity,
-                                'unit': item.unit,
-                                'expiry_date': item.expiry_date.strftime('%Y-%m-%d'),
-                                'days_until_expiry': item.days_until_expiry,
-                                'location': item.location,
-                                'batch_number': item.batch_number,
-                                'value': (item.quantity or 0) * (item.cost_price or 0)
-                            }
-                            for item in expiry_timeframes['next_week']
-                        ]
-                    },
-                    'next_month': {
-                        'count': len(expiry_timeframes['next_month']),
-                        'items': [
-                            {
-                                'id': item.id,
-                                'name': item.name,
-                                'quantity': item.quantity,
-                                'unit': item.unit,
-                                'expiry_date': item.expiry_date.strftime('%Y-%m-%d'),
-                                'days_until_expiry': item.days_until_expiry,
-                                'location': item.location,
-                                'batch_number': item.batch_number,
-                                'value': (item.quantity or 0) * (item.cost_price or 0)
-                            }
-                            for item in expiry_timeframes['next_month']
-                        ]
-                    },
-                    'next_quarter': {
-                        'count': len(expiry_timeframes['next_quarter']),
-                        'items': [
-                            {
-                                'id': item.id,
-                                'name': item.name,
-                                'quantity': item.quantity,
-                                'unit': item.unit,
-                                'expiry_date': item.expiry_date.strftime('%Y-%m-%d'),
-                                'days_until_expiry': item.days_until_expiry,
-                                'location': item.location,
-                                'batch_number': item.batch_number,
-                                'value': (item.quantity or 0) * (item.cost_price or 0)
-                            }
-                            for item in expiry_timeframes['next_quarter']
-                        ]
-                    }
-                },
-                'risk_analysis': {
-                    'critical_items': [
-                        {
-                            'id': item.id,
-                            'name': item.name,
-                            'quantity': item.quantity,
-                            'unit': item.unit,
-                            'expiry_date': item.expiry_date.strftime('%Y-%m-%d'),
-                            'days_until_expiry': item.days_until_expiry,
-                            'location': item.location,
-                            'batch_number': item.batch_number,
-                            'value': (item.quantity or 0) * (item.cost_price or 0)
-                        }
-                        for item in critical_items
-                    ],
-                    'high_value_expiring': [
-                        {
-                            'id': item.id,
-                            'name': item.name,
-                            'quantity': item.quantity,
-                            'unit': item.unit,
-                            'expiry_date': item.expiry_date.strftime('%Y-%m-%d'),
-                            'days_until_expiry': item.days_until_expiry,
-                            'location': item.location,
-                            'batch_number': item.batch_number,
-                            'value': (item.quantity or 0) * (item.cost_price or 0)
-                        }
-                        for item in high_value_expiring
-                    ]
-                },
-                'historical_comparison': {
-                    'last_week': {
-                        'expiring_items': last_week_report.expiring_items if last_week_report else 0,
-                        'expired_items': last_week_report.expired_items if last_week_report else 0,
-                        'low_stock_items': last_week_report.low_stock_items if last_week_report else 0
-                    } if last_week_report else None
-                },
-                'action_recommendations': [
-                    {
-                        'type': 'urgent',
-                        'message': f'Take immediate action on {len(expiry_timeframes["next_week"])} items expiring in the next week',
-                        'item_ids': [item.id for item in expiry_timeframes['next_week']]
-                    },
-                    {
-                        'type': 'high_priority',
-                        'message': f'Review {len(critical_items)} critical items with high quantity and near expiry',
-                        'item_ids': [item.id for item in critical_items]
-                    },
-                    {
-                        'type': 'value_protection',
-                        'message': f'Consider discounting {len(high_value_expiring)} high-value items approaching expiry',
-                        'item_ids': [item.id for item in high_value_expiring]
-                    }
-                ]
-            }
+            report_data = self.build_report_data(metrics, last_week_report)
             
             current_app.logger.info(f"Generated report data with {len(report_data['action_recommendations'])} recommendations")
             
@@ -192,11 +91,11 @@ class ReportService:
             report = Report(
                 date=current_date,
                 user_id=user_id,
-                total_items=total_items,
+                total_items=summary['total_items'],
                 total_value=0.0,
-                expiring_items=expiring_items,
-                expired_items=expired_items,
-                low_stock_items=low_stock_items,
+                expiring_items=summary['expiring_items'],
+                expired_items=summary['expired_items'],
+                low_stock_items=summary['low_stock_items'],
                 total_sales=0.0,
                 total_purchases=0.0,
                 report_data=report_data,
@@ -215,26 +114,173 @@ class ReportService:
             db.session.rollback()
             return None
     
+    def build_report_data(self, metrics: Dict, last_week_report=None) -> Dict:
+        """Assemble stored report data from computed metrics and last week's report.
+        
+        Args:
+            metrics: Sections computed by ``build_report_metrics`` or ``InventoryAnalytics``
+            last_week_report: Report (or row with the same count columns) from seven days earlier
+        """
+        return {
+            'summary': metrics['summary'],
+            'expiry_analysis': metrics['expiry_analysis'],
+            'risk_analysis': metrics['risk_analysis'],
+            'historical_comparison': {
+                'last_week': {
+                    'expiring_items': last_week_report.expiring_items if last_week_report else 0,
+                    'expired_items': last_week_report.expired_items if last_week_report else 0,
+                    'low_stock_items': last_week_report.low_stock_items if last_week_report else 0
+                } if last_week_report else None
+            },
+            'action_recommendations': metrics['action_recommendations']
+        }
+    
+    def build_report_metrics(self, items: List[Item]) -> Dict:
+        """Compute report summary, expiry, risk and recommendation sections item by item."""
+        # Calculate report metrics
+        total_items = len(items)
+        expiring_items = len([item for item in items if item.is_near_expiry])
+        expired_items = len([item for item in items if item.is_expired])
+        low_stock_items = len([item for item in items if (item.quantity or 0) < 10])
+        
+        # Calculate expiry risk metrics
+        critical_items = [item for item in items if item.is_near_expiry and (item.quantity or 0) > 10]
+        high_value_expiring = [item for item in items if item.is_near_expiry and (item.quantity or 0) * (item.cost_price or 0) > 1000]
+        
+        current_app.logger.info(f"Risk metrics - Critical: {len(critical_items)}, High Value: {len(high_value_expiring)}")
+        
+        # Group items by expiry timeframes
+        expiry_timeframes = {
+            'next_week': [],
+            'next_month': [],
+            'next_quarter': []
+        }
+        
+        for item in items:
+            if not item.expiry_date:
+                continue
+            days = item.days_until_expiry
+            if days is None:
+                continue
+                
+            if 0 < days <= 7:
+                expiry_timeframes['next_week'].append(item)
+            elif 7 < days <= 30:
+                expiry_timeframes['next_month'].append(item)
+            elif 30 < days <= 90:
+                expiry_timeframes['next_quarter'].append(item)
+        
+        current_app.logger.info(f"Expiry timeframes - Week: {len(expiry_timeframes['next_week'])}, Month: {len(expiry_timeframes['next_month'])}, Quarter: {len(expiry_timeframes['next_quarter'])}")
+        
+        return {
+            'summary': {
+                'total_items': total_items,
+                'expiring_items': expiring_items,
+                'expired_items': expired_items,
+                'low_stock_items': low_stock_items,
+                'critical_items': len(critical_items),
+                'high_value_expiring': len(high_value_expiring)
+            },
+            'expiry_analysis': {
+                timeframe: {
+                    'count': len(timeframe_items),
+                    'items': [self._report_item(item) for item in timeframe_items]
+                }
+                for timeframe, timeframe_items in expiry_timeframes.items()
+            },
+            'risk_analysis': {
+                'critical_items': [self._report_item(item) for item in critical_items],
+                'high_value_expiring': [self._report_item(item) for item in high_value_expiring]
+            },
+            'action_recommendations': [
+                {
+                    'type': 'urgent',
+                    'message': f'Take immediate action on {len(expiry_timeframes["next_week"])} items expiring in the next week',
+                    'item_ids': [item.id for item in expiry_timeframes['next_week']]
+                },
+                {
+                    'type': 'high_priority',
+                    'message': f'Review {len(critical_items)} critical items with high quantity and near expiry',
+                    'item_ids': [item.id for item in critical_items]
+                },
+                {
+                    'type': 'value_protection',
+                    'message': f'Consider discounting {len(high_value_expiring)} high-value items approaching expiry',
+                    'item_ids': [item.id for item in high_value_expiring]
+                }
+            ]
+        }
+    
+    @staticmethod
+    def _report_item(item: Item) -> Dict:
+        """Serialize an item for the detailed sections of a report."""
+        return {
+            'id': item.id,
+            'name': item.name,
+            'quantity': item.quantity,
+            'unit': item.unit,
+            'expiry_date': item.expiry_date.strftime('%Y-%m-%d'),
+            'days_until_expiry': item.days_until_expiry,
+            'location': item.location,
+            'batch_number': item.batch_number,
+            'value': (item.quantity or 0) * (item.cost_price or 0)
+        }
+    
     def get_report(self, report_id: int) -> Optional[Report]:
-        """Get report by ID."""
-        report = Report.query.get(report_id)
+        """Get report by ID, leaving its details unloaded until they are used."""
+        report = db.session.get(Report, report_id)
         if report:
-            if report.report_data is None:
-                current_app.logger.warning(f"Report {report_id} has no report_data, initializing empty dict")
-                report.report_data = {}
-            else:
-                current_app.logger.info(f"Retrieved report {report_id} with data: {report.report_data}")
+            current_app.logger.debug(f"Retrieved report {report_id}")
         else:
             current_app.logger.warning(f"Report {report_id} not found")
         return report
     
+    def report_etag(self, report: Report, viewer: str, is_public: bool, period: int = 0) -> str:
+        """Weak ETag for a report page as seen by a given viewer.
+        
+        Reports never change after generation, so the report's identity, the
+        templates it is rendered with and who is viewing it determine the page
+        content. The page also embeds a CSRF token, so the bytes differ between
+        renders; ``period`` changes the tag often enough that a revalidated
+        page never keeps an expired token.
+        """
+        key = f"{report.id}:{report.created_at.isoformat()}:{self.template_version()}:{viewer}:{int(is_public)}:{period}"
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+    
+    def render_report_body(self, report: Report) -> Markup:
+        """Rendered report details, served from the rendered report cache when possible."""
+        key = (report.id, report.created_at, self.template_version())
+        body = rendered_reports.get(key)
+        if body is None:
+            body = Markup(render_template('view_report_body.html', report=report))
+            rendered_reports.put(key, body)
+        return body
+    
+    @staticmethod
+    def template_version() -> str:
+        """Hash of the templates a report page is rendered from."""
+        cache_sources = not (current_app.debug or current_app.config.get('TEMPLATES_AUTO_RELOAD'))
+        if cache_sources and _template_versions:
+            return _template_versions[0]
+        env = current_app.jinja_env
+        digest = hashlib.sha256()
+        for name in REPORT_TEMPLATES:
+            digest.update(env.loader.get_source(env, name)[0].encode('utf-8'))
+        version = digest.hexdigest()[:12]
+        if cache_sources:
+            _template_versions[:] = [version]
+        return version
+    
     def get_latest_report(self, user_id: int) -> Optional[Report]:
         """Get the most recent report for a user."""
         return Report.query.filter_by(user_id=user_id).order_by(Report.date.desc()).first()
     
     def get_reports_by_date_range(self, start_date: datetime.date, end_date: datetime.date, user_id: int) -> List[Report]:
-        """Get reports within a date range for a specific user."""
-        return Report.query.filter(
+        """Get reports within a date range for a specific user.
+        
+        Only the summary columns are loaded; report details stay deferred.
+        """
+        return Report.query.options(load_only(*REPORT_SUMMARY_COLUMNS)).filter(
             Report.date >= start_date,
             Report.date <= end_date,
             Report.user_id == user_id
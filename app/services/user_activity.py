@@ -0,0 +1,72 @@
+from datetime import datetime
+import threading
+from typing import Dict, Optional
+from flask import current_app
+from sqlalchemy import bindparam, or_, update
+from app.core.extensions import db
+from app.models.user import User
+
+class LastLoginBuffer:
+    """Write-behind buffer for users' last login times.
+
+    Logins record the time here instead of updating their ``users`` row; the
+    buffer is flushed in one batched UPDATE every ``LAST_LOGIN_FLUSH_SECONDS``
+    by a scheduled job, or straight away once ``LAST_LOGIN_BUFFER_SIZE`` users
+    are waiting. Repeated logins by one user between flushes become a single
+    write, and a flush never moves a stored time backwards.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[int, datetime] = {}
+        self._lock = threading.Lock()
+
+    def record(self, user_id: int, when: Optional[datetime] = None) -> None:
+        """Buffer a login, flushing at once if the buffer is full."""
+        when = when or datetime.utcnow()
+        with self._lock:
+            if when > self._pending.get(user_id, datetime.min):
+                self._pending[user_id] = when
+            full = len(self._pending) >= current_app.config.get('LAST_LOGIN_BUFFER_SIZE', 500)
+        if full:
+            self.flush()
+
+    def pending(self, user_id: int) -> Optional[datetime]:
+        """Last login of a user that has not been written yet."""
+        with self._lock:
+            return self._pending.get(user_id)
+
+    def flush(self) -> int:
+        """Write every buffered login in one batched UPDATE.
+
+        Returns:
+            Number of users written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        table = User.__table__
+        stmt = update(table).where(
+            table.c.id == bindparam('user_id'),
+            or_(table.c.last_login.is_(None), table.c.last_login < bindparam('when'))
+        ).values(
+            last_login=bindparam('when'),
+            # Activity is not a profile change
+            updated_at=table.c.updated_at
+        )
+        try:
+            db.session.execute(stmt, [{'user_id': user_id, 'when': when} for user_id, when in pending.items()])
+            db.session.commit()
+        except Exception as e:
+            current_app.logger.error(f"Error writing last login times: {str(e)}")
+            db.session.rollback()
+            # Keep the logins for the next flush, unless newer ones arrived meanwhile
+            with self._lock:
+                for user_id, when in pending.items():
+                    if when > self._pending.get(user_id, datetime.min):
+                        self._pending[user_id] = when
+            return 0
+        return len(pending)
+
+last_logins = LastLoginBuffer()
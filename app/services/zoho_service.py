@@ -7,10 +7,16 @@ from typing import Dict, List, Optional, Any, Union, Literal
 from flask import current_app, session, request
 from flask_login import current_user
 from app.core.extensions import db
+from app.core.metrics import track_outbound
 from app.models.item import Item, STATUS_EXPIRED, STATUS_ACTIVE, STATUS_EXPIRING_SOON, STATUS_PENDING
 from app.models.user import User
 from urllib.parse import urlencode
 
+def _zoho_request(method: str, url: str, **kwargs) -> requests.Response:
+    """Call Zoho, recording how long the call took."""
+    with track_outbound('zoho'):
+        return requests.request(method, url, **kwargs)
+
 class ZohoService:
     """Service for interacting with Zoho Inventory API."""
     
@@ -56,7 +62,8 @@ class ZohoService:
             return False
         
         try:
-            response = requests.post(
+            response = _zoho_request(
+                'POST',
                 f"{self.accounts_url}/oauth/v2/token",
                 data={
                     'refresh_token': refresh_token,
@@ -96,7 +103,8 @@ class ZohoService:
             current_app.logger.info("Fetching inventory data from Zoho")
             
             # Get items
-            response = requests.get(
+            response = _zoho_request(
+                'GET',
                 f"{self.base_url}/items",
                 headers={
                     'Authorization': f'Bearer {access_token}',
@@ -147,7 +155,8 @@ class ZohoService:
                 return {"success": False, "synced": 0}
             
             # Fetch inventory data from Zoho
-            response = requests.get(
+            response = _zoho_request(
+                'GET',
                 f"{self.base_url}/items",
                 headers={
                     'Authorization': f'Bearer {access_token}',
@@ -277,7 +286,7 @@ class ZohoService:
                 'access_type': 'offline'
             }
             
-            response = requests.post(token_url, data=data)
+            response = _zoho_request('POST', token_url, data=data)
             
             if response.status_code != 200:
                 current_app.logger.error(f"Failed to get Zoho token: {response.status_code}")
@@ -307,7 +316,8 @@ class ZohoService:
             
             # Try to get organization ID, but don't fail if we can't
             try:
-                org_response = requests.get(
+                org_response = _zoho_request(
+                    'GET',
                     f"{self.base_url}/organizations",
                     headers={
                         'Authorization': f'Bearer {token_data["access_token"]}',
@@ -348,7 +358,8 @@ class ZohoService:
             
         try:
             # First try to find active items
-            response = requests.get(
+            response = _zoho_request(
+                'GET',
                 f"{self.base_url}/items",
                 headers={
                     'Authorization': f'Bearer {access_token}',
@@ -368,7 +379,8 @@ class ZohoService:
                     return items[0]
             
             # If no active items found, check inactive items
-            response = requests.get(
+            response = _zoho_request(
+                'GET',
                 f"{self.base_url}/items",
                 headers={
                     'Authorization': f'Bearer {access_token}',
@@ -426,7 +438,8 @@ class ZohoService:
                 if existing_item.get('status') == 'inactive':
                     current_app.logger.info(f"Found inactive item '{item_data['name']}' in Zoho. Reactivating it.")
                     # Reactivate the item and update all details including stock
-                    response = requests.put(
+                    response = _zoho_request(
+                        'PUT',
                         f"{self.base_url}/items/{existing_item['item_id']}",
                         headers={
                             'Authorization': f'Bearer {access_token}',
@@ -474,7 +487,8 @@ class ZohoService:
             
             current_app.logger.info(f"Creating item in Zoho with data: {request_data}")
             
-            response = requests.post(
+            response = _zoho_request(
+                'POST',
                 f"{self.base_url}/items",
                 headers={
                     'Authorization': f'Bearer {access_token}',
@@ -523,7 +537,8 @@ class ZohoService:
             
             current_app.logger.info(f"Updating item details: {update_data}")
             
-            response = requests.put(
+            response = _zoho_request(
+                'PUT',
                 f"{self.base_url}/items/{item_id}",
                 headers={
                     'Authorization': f'Bearer {access_token}',
@@ -556,7 +571,8 @@ class ZohoService:
         
         try:
             # First check if the item exists in Zoho
-            response = requests.get(
+            response = _zoho_request(
+                'GET',
                 f"{self.base_url}/items/{zoho_item_id}",
                 headers={
                     'Authorization': f'Bearer {access_token}',
@@ -581,7 +597,8 @@ class ZohoService:
                 return False
             
             # If item exists, mark it as inactive
-            response = requests.put(
+            response = _zoho_request(
+                'PUT',
                 f"{self.base_url}/items/{zoho_item_id}",
                 headers={
                     'Authorization': f'Bearer {access_token}',
@@ -650,7 +667,8 @@ class ZohoService:
             return None
         
         try:
-            response = requests.get(
+            response = _zoho_request(
+                'GET',
                 f"{self.base_url}/items/{zoho_item_id}",
                 headers={
                     'Authorization': f'Bearer {access_token}',
@@ -697,7 +715,8 @@ class ZohoService:
         try:
             current_app.logger.info(f"Updating item {zoho_item_id} status to {status} in Zoho")
             
-            response = requests.put(
+            response = _zoho_request(
+                'PUT',
                 f"{self.base_url}/items/{zoho_item_id}",
                 headers={
                     'Authorization': f'Bearer {access_token}',
@@ -730,7 +749,7 @@ class ZohoService:
             return None
             
         try:
-            response = requests.request(
+            response = _zoho_request(
                 method,
                 f"{self.base_url}{endpoint}",
                 headers={
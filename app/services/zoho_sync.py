@@ -0,0 +1,170 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timedelta
+import threading
+import time
+from typing import Callable, Optional
+from flask import current_app
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from app.core.extensions import db
+from app.core.query_stats import log_queries
+from app.models.item import Item, STATUS_PENDING
+from app.models.user import User
+from app.models.zoho_sync_state import ZohoSyncState
+from app.services.zoho_service import ZohoService
+
+# Seconds between progress writes of a running sync
+PROGRESS_INTERVAL = 1.0
+
+def get_sync_state(user_id: int) -> ZohoSyncState:
+    """A user's sync state; a blank, unsaved one if they have never synced."""
+    state = db.session.get(ZohoSyncState, user_id)
+    if state is None:
+        state = ZohoSyncState(user_id=user_id, progress_done=0, progress_total=0)
+    return state
+
+def reconcile_inventory(user: User, progress: Callable[[int, int], None]) -> Optional[str]:
+    """Bring a user's items in line with Zoho.
+
+    Items inactive in Zoho are marked pending, then Zoho's active items are
+    imported. ``progress`` is called with (items checked, items to check).
+
+    Returns:
+        None if the sync succeeded, else a message saying why it failed
+    """
+    zoho_service = ZohoService(user)
+    if user.zoho_token_expires_at and datetime.now() >= user.zoho_token_expires_at:
+        if not zoho_service.refresh_token():
+            return 'Failed to refresh Zoho connection. Please reconnect in Settings.'
+
+    items_with_zoho = Item.query.filter(
+        Item.user_id == user.id,
+        Item.zoho_item_id.isnot(None)
+    ).all()
+    progress(0, len(items_with_zoho))
+
+    # Check status in Zoho for each item but don't delete immediately
+    for checked, item in enumerate(items_with_zoho, 1):
+        zoho_status = zoho_service.get_item_status(item.zoho_item_id)
+        if zoho_status == 'inactive' and item.status != STATUS_PENDING:
+            current_app.logger.info(f"Item {item.id} ({item.name}) is inactive in Zoho")
+            item.status = STATUS_PENDING
+        progress(checked, len(items_with_zoho))
+    db.session.commit()
+
+    result = zoho_service.sync_inventory(user)
+    if not result['success']:
+        return 'Failed to sync with Zoho inventory. Please check your connection in Settings.'
+    return None
+
+class ZohoSyncRunner:
+    """Runs users' Zoho syncs on a small background pool.
+
+    A sync is claimed in the ``zoho_sync_states`` table before it is queued,
+    so however often pages ask, each user has at most one sync running across
+    every process and none starts within ``ZOHO_SYNC_MAX_AGE`` seconds of the
+    last one finishing. A claim whose process died is taken over after
+    ``ZOHO_SYNC_TIMEOUT`` seconds.
+    """
+
+    def __init__(self, app, workers: int = 2) -> None:
+        self.app = app
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='zoho-sync')
+
+    def request_sync(self, user_id: int, force: bool = False) -> Optional[Future]:
+        """Queue a sync of the user's inventory unless a recent or running one makes it unnecessary.
+
+        Args:
+            user_id: ID of the user to sync
+            force: Sync even if the last sync is still fresh
+
+        Returns:
+            The queued sync, or None if none was queued
+        """
+        if not self._claim(user_id, force):
+            return None
+        return self._executor.submit(self._run, user_id)
+
+    def _claim(self, user_id: int, force: bool) -> bool:
+        """Mark the user's sync as started if no fresh or running sync stands in the way."""
+        config = current_app.config
+        now = datetime.utcnow()
+        table = ZohoSyncState.__table__
+        conditions = [
+            table.c.user_id == user_id,
+            or_(
+                table.c.started_at.is_(None),
+                table.c.started_at < now - timedelta(seconds=config.get('ZOHO_SYNC_TIMEOUT', 900))
+            )
+        ]
+        if not force:
+            conditions.append(or_(
+                table.c.finished_at.is_(None),
+                table.c.finished_at < now - timedelta(seconds=config.get('ZOHO_SYNC_MAX_AGE', 600))
+            ))
+        started = {'started_at': now, 'progress_done': 0, 'progress_total': 0}
+
+        # Own connection, so claiming never commits the request's session
+        with db.engine.begin() as connection:
+            if connection.execute(update(table).where(*conditions).values(**started)).rowcount:
+                return True
+            if connection.execute(select(table.c.user_id).where(table.c.user_id == user_id)).first():
+                return False
+        try:
+            with db.engine.begin() as connection:
+                connection.execute(insert(table).values(user_id=user_id, **started))
+        except IntegrityError:
+            # Another request claimed the first sync
+            return False
+        return True
+
+    def _run(self, user_id: int) -> None:
+        table = ZohoSyncState.__table__
+        last_write = [0.0]
+
+        def progress(checked: int, total: int) -> None:
+            # Committed with the statuses checked so far, so a sync that dies keeps them
+            now = time.monotonic()
+            if checked < total and now - last_write[0] < PROGRESS_INTERVAL:
+                return
+            last_write[0] = now
+            db.session.execute(
+                update(table).where(table.c.user_id == user_id).values(progress_done=checked, progress_total=total)
+            )
+            db.session.commit()
+
+        with self.app.app_context(), log_queries('zoho_sync'):
+            try:
+                user = db.session.get(User, user_id)
+                error = reconcile_inventory(user, progress) if user else 'User not found'
+            except Exception as e:
+                self.app.logger.error(f"Zoho sync for user {user_id} failed: {str(e)}")
+                db.session.rollback()
+                error = 'Unexpected error while syncing with Zoho.'
+            try:
+                now = datetime.utcnow()
+                finished = {'started_at': None, 'finished_at': now, 'last_error': error}
+                if error is None:
+                    finished['last_synced_at'] = now
+                db.session.execute(update(table).where(table.c.user_id == user_id).values(**finished))
+                db.session.commit()
+            except Exception as e:
+                self.app.logger.error(f"Error recording Zoho sync for user {user_id}: {str(e)}")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+_create_lock = threading.Lock()
+
+def get_zoho_sync() -> ZohoSyncRunner:
+    """The app's Zoho sync runner, created on first use."""
+    runner = current_app.extensions.get('zoho_sync')
+    if runner is None:
+        with _create_lock:
+            runner = current_app.extensions.get('zoho_sync')
+            if runner is None:
+                runner = current_app.extensions['zoho_sync'] = ZohoSyncRunner(
+                    current_app._get_current_object(),
+                    workers=current_app.config.get('ZOHO_SYNC_WORKERS', 2)
+                )
+    return runner
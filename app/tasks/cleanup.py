@@ -3,6 +3,9 @@ from app.core.extensions import db
 from app.models.item import Item
 from app.models.notification import Notification
 from app.models.user import User
+from app.models.inventory_stats import UserInventoryStats
+from app.models.inventory_snapshot import InventorySnapshot
+from app.services.dashboard_cache import dashboard_cache
 from app.services.zoho_service import ZohoService
 from app.services.notification_service import NotificationService
 from flask import current_app
@@ -99,8 +102,13 @@ def cleanup_unverified_accounts():
                 # Delete all notifications associated with the user
                 Notification.query.filter_by(user_id=user.id).delete(synchronize_session=False)
                 
+                # Delete the user's inventory counters and snapshots
+                UserInventoryStats.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+                InventorySnapshot.query.filter_by(user_id=user.id).delete(synchronize_session=False)
+                
                 # Delete the user
                 db.session.delete(user)
+                dashboard_cache.invalidate(user.id)
                 deleted_count += 1
                 
             except Exception as e:
@@ -0,0 +1,19 @@
+from flask import current_app
+from app.core.extensions import db
+from app.models.inventory_stats import UserInventoryStats
+
+def rebuild_inventory_stats():
+    """Recompute every user's inventory counters for the new day.
+
+    Expiring and expired counts depend on the current date, so items move
+    between buckets at midnight without being modified.
+    """
+    try:
+        rebuilt = UserInventoryStats.rebuild()
+        db.session.commit()
+        current_app.logger.info(f"Rebuilt inventory stats for {rebuilt} users")
+        return rebuilt
+    except Exception as e:
+        current_app.logger.error(f"Error rebuilding inventory stats: {str(e)}")
+        db.session.rollback()
+        return 0
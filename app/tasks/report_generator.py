@@ -1,18 +1,138 @@
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+import secrets
+from typing import Dict, List
 from flask import current_app
+from sqlalchemy import delete, insert, select
+from app.core.extensions import db
+from app.models.inventory_snapshot import InventorySnapshot
+from app.models.report import Report, encode_report_data
+from app.models.user import User
+from app.services.analytics_service import InventoryAnalytics
 from app.services.report_service import ReportService
 
+def generate_daily_reports(shards: int = None, workers: int = None) -> Dict[str, int]:
+    """Generate today's inventory report for every active user in one run.
+
+    Users are split into shards by ID. Each shard loads all of its users' items
+    with one snapshot query, computes every report from that snapshot, then
+    replaces today's reports for those users with a single bulk insert, along
+    with each user's daily inventory snapshot. Shards
+    run in parallel on a pool of worker threads, each with its own app context
+    and database session.
+
+    Args:
+        shards: Number of user shards (defaults to ``REPORT_BATCH_SHARDS``)
+        workers: Number of worker threads (defaults to ``REPORT_BATCH_WORKERS``)
+
+    Returns:
+        Counts of users processed, reports written and shards that failed
+    """
+    shards = shards or current_app.config.get('REPORT_BATCH_SHARDS', 4)
+    workers = workers or current_app.config.get('REPORT_BATCH_WORKERS', 4)
+    current_date = datetime.now().date()
+
+    user_ids = db.session.execute(
+        select(User.id).where(User.is_active.is_(True)).order_by(User.id)
+    ).scalars().all()
+    shard_user_ids = [ids for ids in (user_ids[index::shards] for index in range(shards)) if ids]
+    current_app.logger.info(
+        f"Starting batch report generation for {len(user_ids)} users in {len(shard_user_ids)} shards"
+    )
+
+    app = current_app._get_current_object()
+    if workers > 1 and len(shard_user_ids) > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='report-shard') as executor:
+            results = list(executor.map(
+                lambda ids: _run_shard(app, ids, current_date), shard_user_ids
+            ))
+    else:
+        results = [_run_shard(app, ids, current_date) for ids in shard_user_ids]
+
+    summary = {
+        'users': len(user_ids),
+        'reports': sum(count for count in results if count is not None),
+        'failed_shards': sum(1 for count in results if count is None)
+    }
+    current_app.logger.info(
+        f"Completed batch report generation: {summary['reports']} reports, {summary['failed_shards']} failed shards"
+    )
+    return summary
+
+def _run_shard(app, user_ids: List[int], current_date) -> int:
+    """Generate reports for one shard inside its own app context."""
+    with app.app_context():
+        try:
+            return _generate_shard_reports(user_ids, current_date)
+        except Exception as e:
+            app.logger.error(f"Error generating reports for shard starting at user {user_ids[0]}: {str(e)}")
+            db.session.rollback()
+            return None
+        finally:
+            db.session.remove()
+
+def _generate_shard_reports(user_ids: List[int], current_date) -> int:
+    """Build and bulk-insert today's reports for the given users."""
+    report_service = ReportService()
+    analytics_by_user = InventoryAnalytics.for_users(user_ids)
+
+    # Last week's counts for the whole shard in one query
+    last_week = current_date - timedelta(days=7)
+    last_week_reports = {
+        row.user_id: row
+        for row in db.session.execute(
+            select(
+                Report.user_id, Report.expiring_items,
+                Report.expired_items, Report.low_stock_items
+            ).where(Report.user_id.in_(user_ids), Report.date == last_week)
+        )
+    }
+
+    rows = []
+    for user_id in user_ids:
+        metrics = analytics_by_user[user_id].report_metrics()
+        summary = metrics['summary']
+        rows.append({
+            'date': current_date,
+            'user_id': user_id,
+            'total_items': summary['total_items'],
+            'total_value': 0.0,
+            'expiring_items': summary['expiring_items'],
+            'expired_items': summary['expired_items'],
+            'low_stock_items': summary['low_stock_items'],
+            'total_sales': 0.0,
+            'total_purchases': 0.0,
+            'report_payload': encode_report_data(
+                report_service.build_report_data(metrics, last_week_reports.get(user_id))
+            ),
+            'is_public': False,
+            'public_token': secrets.token_urlsafe(32)
+        })
+
+    # Replace any reports already generated today for these users
+    db.session.execute(
+        delete(Report).where(Report.user_id.in_(user_ids), Report.date == current_date)
+    )
+    db.session.execute(insert(Report), rows)
+
+    # Append today's snapshot for the shard and refresh its weekly/monthly rollups
+    InventorySnapshot.record_day({
+        user_id: InventorySnapshot.snapshot_values(analytics)
+        for user_id, analytics in analytics_by_user.items()
+    }, current_date)
+    db.session.commit()
+    return len(rows)
+
 def generate_daily_report():
-    """Generate daily inventory report at midnight."""
+    """Generate daily inventory reports for all users at midnight."""
     try:
         current_app.logger.info("Starting daily report generation")
-        report_service = ReportService()
-        report = report_service.generate_daily_report()
-        
-        if report:
-            current_app.logger.info(f"Successfully generated report for {report.date}")
+        summary = generate_daily_reports()
+
+        if summary['failed_shards']:
+            current_app.logger.error(f"Daily report generation failed for {summary['failed_shards']} shards")
         else:
-            current_app.logger.error("Failed to generate daily report")
-            
+            current_app.logger.info(f"Successfully generated {summary['reports']} daily reports")
+
     except Exception as e:
-        current_app.logger.error(f"Error in daily report generation: {str(e)}") 
\ No newline at end of file
+        current_app.logger.error(f"Error in daily report generation: {str(e)}")
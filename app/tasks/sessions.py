@@ -0,0 +1,9 @@
+from flask import current_app
+from app.core.sessions import delete_expired_sessions
+
+def sweep_expired_sessions():
+    """Delete expired server-side sessions."""
+    deleted = delete_expired_sessions()
+    if deleted:
+        current_app.logger.info(f"Deleted {deleted} expired sessions")
+    return deleted
@@ -0,0 +1,9 @@
+from flask import current_app
+from app.services.user_activity import last_logins
+
+def flush_last_logins():
+    """Write buffered last login times to the users table."""
+    written = last_logins.flush()
+    if written:
+        current_app.logger.info(f"Wrote last login times for {written} users")
+    return written
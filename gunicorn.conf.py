@@ -0,0 +1,21 @@
+"""Gunicorn settings, loaded automatically from the working directory.
+
+With several workers, start gunicorn with PROMETHEUS_MULTIPROC_DIR set to an
+empty directory so /metrics can combine every worker's samples.
+"""
+from glob import glob
+import os
+
+def on_starting(server):
+    # Samples left from a previous run would be counted again
+    directory = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        # Only prometheus-client's own files, in case the directory holds anything else
+        for path in glob(os.path.join(directory, '*.db')):
+            os.remove(path)
+
+def child_exit(server, worker):
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
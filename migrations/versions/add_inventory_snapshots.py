@@ -0,0 +1,40 @@
+"""Add inventory snapshots table
+
+Revision ID: add_inventory_snapshots
+Revises: compress_report_data
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_inventory_snapshots'
+down_revision = 'compress_report_data'
+branch_labels = None
+depends_on = None
+
+COUNT_COLUMNS = (
+    'total_items', 'expired_items', 'expiring_items', 'low_stock_items', 'critical_items',
+    'expires_today', 'expires_next_week', 'expires_next_month', 'expires_next_quarter',
+    'expires_later', 'no_expiry'
+)
+
+def upgrade():
+    op.create_table(
+        'inventory_snapshots',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('period', sa.String(length=5), nullable=False, server_default='day'),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('period_end', sa.Date(), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False, server_default='1'),
+        *[sa.Column(name, sa.Integer(), nullable=False, server_default='0') for name in COUNT_COLUMNS],
+        sa.Column('total_value', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.UniqueConstraint('user_id', 'period', 'period_start', name='uq_inventory_snapshots_period'),
+        sa.CheckConstraint("period IN ('day', 'week', 'month')", name='check_inventory_snapshot_period')
+    )
+
+def downgrade():
+    op.drop_table('inventory_snapshots')
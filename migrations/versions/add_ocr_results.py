@@ -0,0 +1,30 @@
+"""Add OCR results table
+
+Revision ID: add_ocr_results
+Revises: add_inventory_snapshots
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_ocr_results'
+down_revision = 'add_inventory_snapshots'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'ocr_results',
+        sa.Column('image_hash', sa.String(length=64), primary_key=True),
+        sa.Column('perceptual_hash', sa.BigInteger(), nullable=True),
+        sa.Column('date', sa.String(length=10), nullable=True),
+        sa.Column('confidence', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(), nullable=True)
+    )
+    op.create_index('ix_ocr_results_created_at', 'ocr_results', ['created_at'])
+
+def downgrade():
+    op.drop_index('ix_ocr_results_created_at', table_name='ocr_results')
+    op.drop_table('ocr_results')
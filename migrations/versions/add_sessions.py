@@ -0,0 +1,29 @@
+"""Add server-side sessions table
+
+Revision ID: add_sessions
+Revises: add_ocr_results
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_sessions'
+down_revision = 'add_ocr_results'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'sessions',
+        sa.Column('id', sa.String(length=64), primary_key=True),
+        sa.Column('data', sa.Text(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True)
+    )
+    op.create_index('ix_sessions_expires_at', 'sessions', ['expires_at'])
+
+def downgrade():
+    op.drop_index('ix_sessions_expires_at', table_name='sessions')
+    op.drop_table('sessions')
@@ -0,0 +1,33 @@
+"""Add user inventory stats table
+
+Revision ID: add_user_inventory_stats
+Revises: report_unique_per_user_date
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_user_inventory_stats'
+down_revision = 'report_unique_per_user_date'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Rows are created on first use and rebuilt nightly, so no backfill is needed
+    op.create_table(
+        'user_inventory_stats',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('total_items', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('expiring_items', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('expiring_soon_items', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('expired_items', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('low_stock_items', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('total_value', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('as_of', sa.Date(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True)
+    )
+
+def downgrade():
+    op.drop_table('user_inventory_stats')
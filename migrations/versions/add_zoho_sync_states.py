@@ -0,0 +1,30 @@
+"""Add Zoho sync state table
+
+Revision ID: add_zoho_sync_states
+Revises: add_sessions
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_zoho_sync_states'
+down_revision = 'add_sessions'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'zoho_sync_states',
+        sa.Column('user_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('last_synced_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.String(length=255), nullable=True),
+        sa.Column('progress_done', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('progress_total', sa.Integer(), nullable=False, server_default='0')
+    )
+
+def downgrade():
+    op.drop_table('zoho_sync_states')
@@ -0,0 +1,49 @@
+"""Store report details as a compressed, normalized payload
+
+Revision ID: compress_report_data
+Revises: add_user_inventory_stats
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+import json
+from alembic import op
+import sqlalchemy as sa
+from app.models.report import encode_report_data, decode_report_data
+
+# revision identifiers, used by Alembic.
+revision = 'compress_report_data'
+down_revision = 'add_user_inventory_stats'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    with op.batch_alter_table('reports') as batch_op:
+        batch_op.add_column(sa.Column('report_payload', sa.LargeBinary(), nullable=True))
+
+    # Re-encode existing reports one row at a time
+    conn = op.get_bind()
+    reports = sa.table('reports', sa.column('id'), sa.column('report_data'), sa.column('report_payload'))
+    for row in conn.execute(sa.select(reports.c.id, reports.c.report_data)).fetchall():
+        data = row.report_data
+        if isinstance(data, str):
+            data = json.loads(data)
+        conn.execute(
+            reports.update().where(reports.c.id == row.id).values(report_payload=encode_report_data(data))
+        )
+
+    with op.batch_alter_table('reports') as batch_op:
+        batch_op.drop_column('report_data')
+
+def downgrade():
+    with op.batch_alter_table('reports') as batch_op:
+        batch_op.add_column(sa.Column('report_data', sa.JSON(), nullable=True))
+
+    conn = op.get_bind()
+    reports = sa.table('reports', sa.column('id'), sa.column('report_data', sa.JSON()), sa.column('report_payload'))
+    for row in conn.execute(sa.select(reports.c.id, reports.c.report_payload)).fetchall():
+        conn.execute(
+            reports.update().where(reports.c.id == row.id).values(report_data=decode_report_data(row.report_payload))
+        )
+
+    with op.batch_alter_table('reports') as batch_op:
+        batch_op.drop_column('report_payload')
@@ -0,0 +1,33 @@
+"""Make report uniqueness per user and date
+
+Revision ID: report_unique_per_user_date
+Revises: bdaddb1d9553
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'report_unique_per_user_date'
+down_revision = 'bdaddb1d9553'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    # Drop the global unique constraint on date, whatever the backend named it
+    date_constraints = [
+        constraint['name'] for constraint in inspector.get_unique_constraints('reports')
+        if constraint['column_names'] == ['date']
+    ]
+    with op.batch_alter_table('reports') as batch_op:
+        for name in date_constraints:
+            batch_op.drop_constraint(name, type_='unique')
+        batch_op.create_unique_constraint('uq_reports_user_date', ['user_id', 'date'])
+
+def downgrade():
+    with op.batch_alter_table('reports') as batch_op:
+        batch_op.drop_constraint('uq_reports_user_date', type_='unique')
+        batch_op.create_unique_constraint('reports_date_key', ['date'])
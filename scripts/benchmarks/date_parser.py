@@ -0,0 +1,118 @@
+"""Microbenchmark the single-pass date parser against the original pattern loop.
+
+Parses a set of OCR text blobs typical of product labels, with the date early,
+late or missing, using the original parser (ten regexes run one after another,
+each match tried against ten ``strptime`` formats) and the precompiled
+single-pass parser, and reports the time per blob for each. The original
+parser's logging is left out so only parsing is timed.
+
+The single-pass parser is meant to be at least ``TARGET_SPEEDUP`` times faster
+on every blob; the script exits with status 1 naming any blob that falls short.
+
+Usage:
+    python scripts/benchmarks/date_parser.py [--repeat 2000]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from app.services.date_parser import parse_date
+
+# Minimum speed-up over the original parser on every blob
+TARGET_SPEEDUP = 10
+
+BLOBS = [
+    'exp 31/12/2026',
+    'ingredients: wheat flour, sugar, palm oil, salt. may contain nuts. best before 2027-03-15 lot 4471',
+    'net wt 500g keep refrigerated batch 12345 mfg 01/01/2026 exp 01/01/2027',
+    'use by dec 31, 2026 store in a cool dry place',
+    'nutrition facts serving size 30g energy 450kj protein 3g fat 5g carbohydrate 20g sodium 120mg',
+    'produced for acme foods ltd, 1 high street, london. packed 02/05/2026. best before 14-02-2028',
+]
+
+DATE_PATTERNS = [
+    r'\d{1,2}[-/]\d{1,2}[-/]\d{2,4}',
+    r'\d{2,4}[-/]\d{1,2}[-/]\d{1,2}',
+    r'\d{1,2}[-/]\d{1,2}[-/]\d{2}',
+    r'\d{2}[-/]\d{1,2}[-/]\d{2,4}',
+    r'exp(?:iry)?\s*date\s*[:]?\s*(\d{1,2}[-/]\d{1,2}[-/]\d{2,4})',
+    r'exp(?:iry)?\s*date\s*[:]?\s*(\d{2,4}[-/]\d{1,2}[-/]\d{1,2})',
+    r'exp(?:iry)?\s*date\s*[:]?\s*(\d{1,2}[-/]\d{1,2}[-/]\d{2})',
+    r'exp(?:iry)?\s*date\s*[:]?\s*(\d{2}[-/]\d{1,2}[-/]\d{2,4})',
+    r'(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{2,4}',
+    r'exp(?:iry)?\s*date\s*[:]?\s*(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|jun(?:e)?|jul(?:y)?|aug(?:ust)?|sep(?:tember)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\s+\d{1,2}(?:st|nd|rd|th)?,?\s+\d{2,4}'
+]
+
+DATE_FORMATS = [
+    '%d-%m-%Y', '%d/%m/%Y', '%Y-%m-%d', '%Y/%m/%d', '%d-%m-%y',
+    '%d/%m/%y', '%y-%m-%d', '%y/%m/%d', '%B %d, %Y', '%b %d, %Y'
+]
+
+def baseline_parse_date(full_text: str):
+    """The original parser, without its logging."""
+    for pattern in DATE_PATTERNS:
+        matches = re.findall(pattern, full_text)
+        if matches:
+            date_str = matches[0] if isinstance(matches[0], str) else matches[0][0]
+            try:
+                for fmt in DATE_FORMATS:
+                    try:
+                        date_obj = datetime.strptime(date_str, fmt)
+                        if 2000 <= date_obj.year <= 2100:
+                            return date_obj.strftime('%Y-%m-%d')
+                    except ValueError:
+                        continue
+            except Exception:
+                continue
+    return None
+
+def time_parser(parser, blob: str, repeat: int, rounds: int = 5) -> float:
+    """Best mean seconds per call over several rounds, to ride out noise."""
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            parser(blob)
+        elapsed = (time.perf_counter() - started) / repeat
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=2000, help='Calls per blob per round')
+    args = parser.parse_args()
+
+    # Warm up regex compilation and strptime's locale setup
+    for blob in BLOBS:
+        baseline_parse_date(blob)
+        parse_date(blob)
+
+    print(f"{len(BLOBS)} blobs, best of 5 rounds of {args.repeat} calls, time per blob:")
+    print(f"  {'original':>10} {'single pass':>12} {'speedup':>8}  found         blob")
+    baseline_total = single_pass_total = 0.0
+    too_slow = []
+    for blob in BLOBS:
+        baseline = time_parser(baseline_parse_date, blob, args.repeat)
+        single_pass = time_parser(parse_date, blob, args.repeat)
+        baseline_total += baseline
+        single_pass_total += single_pass
+        if baseline / single_pass < TARGET_SPEEDUP:
+            too_slow.append(blob)
+        print(f"  {baseline * 1e6:>8.1f}us {single_pass * 1e6:>10.1f}us {baseline / single_pass:>7.1f}x"
+              f"  {str(parse_date(blob)):<12}  {blob[:50]}")
+    print(f"  {baseline_total / len(BLOBS) * 1e6:>8.1f}us {single_pass_total / len(BLOBS) * 1e6:>10.1f}us"
+          f" {baseline_total / single_pass_total:>7.1f}x  mean")
+
+    if too_slow:
+        print(f"\nBelow the {TARGET_SPEEDUP}x target on {len(too_slow)} of {len(BLOBS)} blobs:")
+        for blob in too_slow:
+            print(f"  {blob[:50]}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+"""Load-test the OCR extraction pipeline offline.
+
+Pushes label images through the shared OCR job pool, as the API does, with a
+fake OCR backend that returns fixture text after a configurable delay in place
+of the network call. Reports throughput and job latency percentiles, so
+changes to preprocessing, caching or the pool can be measured without Azure.
+Pass ``--backend tesseract`` (or ``azure``) to load-test a real engine instead.
+
+Usage:
+    python scripts/benchmarks/ocr_load.py [--images 200] [--distinct 50] [--workers 4] [--latency-ms 300]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import cv2
+import numpy as np
+
+from app import create_app
+from app.services.date_ocr_service import DateOCRService
+from app.services.ocr_backends import FakeOCRBackend, create_ocr_backend
+from app.services.ocr_cache import ocr_cache
+from app.services.ocr_jobs import OCRJobQueue
+
+def label_images(count: int, seed: int = 11) -> list:
+    """Generate distinct noisy 3000x2000 JPEG photos of a printed date label."""
+    rng = np.random.default_rng(seed)
+    images = []
+    for index in range(count):
+        image = np.full((2000, 3000, 3), 225, np.uint8)
+        cv2.putText(image, f'EXP 31/12/2026 LOT {index}', (200, 1000), cv2.FONT_HERSHEY_SIMPLEX, 5, (30, 30, 30), 12)
+        image = np.clip(image + rng.normal(0, 15, image.shape), 0, 255).astype(np.uint8)
+        images.append(cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes())
+    return images
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--images', type=int, default=200, help='Number of requests to send')
+    parser.add_argument('--distinct', type=int, default=50, help='Number of distinct images among them')
+    parser.add_argument('--workers', type=int, default=4, help='OCR pool workers')
+    parser.add_argument('--latency-ms', type=int, default=300, help='Fake backend latency per call')
+    parser.add_argument('--backend', default='fake', help="OCR backend: 'fake', 'tesseract' or 'azure'")
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    app.logger.disabled = True
+    images = label_images(args.distinct)
+
+    with app.app_context():
+        if args.backend == 'fake':
+            backend = FakeOCRBackend(['EXP 31/12/2026'], args.latency_ms / 1000)
+        else:
+            backend = create_ocr_backend(args.backend)
+            if backend is None:
+                sys.exit(f'OCR backend {args.backend} is not available')
+        service = DateOCRService(backend=backend)
+        ocr_cache.clear()
+        jobs = OCRJobQueue(app, service, workers=args.workers, queue_size=args.images)
+
+        # Silence the service's per-image logging while timing
+        stdout, sys.stdout = sys.stdout, open(os.devnull, 'w')
+        try:
+            started = time.perf_counter()
+            submitted = [jobs.submit(images[index % len(images)]) for index in range(args.images)]
+            for job in submitted:
+                jobs.wait(job)
+            elapsed = time.perf_counter() - started
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        jobs._executor.shutdown(wait=True)
+
+    latencies = [(job['finished_at'] - job['created_at']).total_seconds() for job in submitted]
+    found = sum(1 for job in submitted if job['result'] and job['result']['date'] == '2026-12-31')
+    stats = ocr_cache.stats()
+    print(f"{args.images} images ({args.distinct} distinct), {args.workers} workers, backend {args.backend}")
+    print(f"  throughput           {args.images / elapsed:>10.1f} images/s")
+    print(f"  total                {elapsed:>10.2f} s")
+    print(f"  latency p50 (queued) {percentile(latencies, 0.5) * 1000:>10.1f} ms")
+    print(f"  latency p95 (queued) {percentile(latencies, 0.95) * 1000:>10.1f} ms")
+    print(f"  dates found          {found:>10}/{args.images}")
+    print(f"  cache hit rate       {stats['hit_rate']:>10.3f}")
+
+if __name__ == '__main__':
+    main()
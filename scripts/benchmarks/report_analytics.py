@@ -0,0 +1,88 @@
+"""Benchmark the Python and vectorized report metric paths.
+
+Builds synthetic inventories of increasing size and times
+``ReportService.build_report_metrics`` (per-item Python loops over ORM objects)
+against ``InventoryAnalytics.report_metrics`` (NumPy/pandas over a frame).
+Both paths are checked to produce identical results before timing.
+
+Usage:
+    python scripts/benchmarks/report_analytics.py [--sizes 1000 100000 1000000]
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import numpy as np
+import pandas as pd
+
+from app import create_app
+from app.models.item import Item
+from app.services.analytics_service import InventoryAnalytics, ANALYTICS_COLUMNS
+from app.services.report_service import ReportService
+
+def build_frame(size: int, seed: int = 42) -> pd.DataFrame:
+    """Build a synthetic items frame with realistic nulls and expiry spread."""
+    rng = np.random.default_rng(seed)
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    offsets = rng.integers(-30, 365, size)
+    expiry = pd.Series(pd.Timestamp(today) + pd.to_timedelta(offsets, unit='D'))
+    expiry[rng.random(size) < 0.05] = pd.NaT
+    quantity = rng.integers(0, 200, size).astype(float)
+    cost = np.round(rng.random(size) * 50, 2)
+    return pd.DataFrame({
+        'id': np.arange(1, size + 1),
+        'name': [f'Item {i}' for i in range(size)],
+        'quantity': quantity,
+        'unit': np.where(rng.random(size) < 0.5, 'pcs', 'kg'),
+        'expiry_date': expiry,
+        'location': None,
+        'batch_number': None,
+        'cost_price': cost
+    }, columns=ANALYTICS_COLUMNS)
+
+def build_items(frame: pd.DataFrame) -> list:
+    """Build transient Item objects mirroring the frame."""
+    records = frame.astype(object).where(frame.notna(), None).to_dict('records')
+    for record in records:
+        if record['expiry_date'] is not None:
+            record['expiry_date'] = record['expiry_date'].to_pydatetime()
+    return [Item(**record) for record in records]
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    app = create_app('testing')
+    app.logger.disabled = True
+    service = ReportService()
+
+    print(f"{'rows':>10} {'python (s)':>12} {'vectorized (s)':>16} {'speedup':>9}")
+    with app.app_context():
+        # Warm up both paths so one-off import and first-call costs are not timed
+        warmup = build_frame(100)
+        service.build_report_metrics(build_items(warmup))
+        InventoryAnalytics(warmup).report_metrics()
+
+        for size in args.sizes:
+            frame = build_frame(size)
+            items = build_items(frame)
+
+            expected, python_time = timed(service.build_report_metrics, items)
+            actual, vectorized_time = timed(lambda: InventoryAnalytics(frame).report_metrics())
+            if actual != expected:
+                raise SystemExit(f"Result mismatch at {size} rows")
+
+            print(f"{size:>10} {python_time:>12.3f} {vectorized_time:>16.3f} {python_time / vectorized_time:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
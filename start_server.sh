@@ -6,5 +6,8 @@ cd "/Users/divyanshsingh/Desktop/project copy"
 # Activate virtual environment
 source venv/bin/activate
 
+# Workers share metrics through this directory; gunicorn.conf.py empties it on start
+export PROMETHEUS_MULTIPROC_DIR="${PROMETHEUS_MULTIPROC_DIR:-/tmp/expiry-tracker-metrics}"
+
 # Start gunicorn with logging to terminal
 exec gunicorn --workers 1 --bind 0.0.0.0:5000 "app:create_app()" --log-level debug --access-logfile - --error-logfile - 
\ No newline at end of file
@@ -1 +1,99 @@
- 
\ No newline at end of file
+import os
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+import pytest
+from flask.testing import FlaskClient
+
+# Production config reads these at import time
+os.environ.setdefault('ZOHO_CLIENT_ID', 'test-client-id')
+os.environ.setdefault('ZOHO_CLIENT_SECRET', 'test-client-secret')
+os.environ.setdefault('ZOHO_REDIRECT_URI', 'http://localhost:5000/auth/zoho/callback')
+
+from app import create_app
+from app.core.extensions import db as _db
+from app.core.identity import user_cache
+from app.core.query_stats import track_queries
+from app.models.item import Item
+from app.models.user import User
+from app.services.dashboard_cache import dashboard_cache
+
+@pytest.fixture
+def app():
+    """Application with a fresh in-memory database."""
+    app = create_app('testing')
+    with app.app_context():
+        _db.create_all()
+        yield app
+        _db.session.remove()
+        _db.drop_all()
+        # User IDs restart with every database
+        user_cache.clear()
+        dashboard_cache.clear()
+
+@pytest.fixture
+def db(app):
+    """Database extension bound to the test application."""
+    return _db
+
+@pytest.fixture
+def user(db):
+    """A verified user."""
+    user = User(username='tester', email='tester@example.com', is_verified=True)
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+class WebClient(FlaskClient):
+    """Test client running each request in a fresh app context, as outside the fixtures."""
+
+    def open(self, *args, **kwargs):
+        with self.application.app_context():
+            return super().open(*args, **kwargs)
+
+@pytest.fixture
+def login(app):
+    """Return a web client with the given user logged in."""
+    def login(user):
+        client = WebClient(app, app.response_class)
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user.id)
+            session['_fresh'] = True
+        return client
+    return login
+
+@pytest.fixture
+def web_client(login, user):
+    """A web client with the default user logged in."""
+    return login(user)
+
+@pytest.fixture
+def add_users(db):
+    """Add verified users with 0, 3, 6, ... items expiring every 5 days from today."""
+    def add(count):
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        users = []
+        for index in range(count):
+            user = User(username=f'user{index}', email=f'user{index}@example.com', is_verified=True)
+            db.session.add(user)
+            db.session.flush()
+            for offset in range(index * 3):
+                db.session.add(Item(
+                    name=f'Item {index}-{offset}', user_id=user.id, quantity=20.0,
+                    cost_price=75.0, expiry_date=today + timedelta(days=offset * 5)
+                ))
+            users.append(user)
+        db.session.commit()
+        return users
+    return add
+
+@pytest.fixture
+def query_budget():
+    """Context manager failing the test if its block runs more than a number of queries."""
+    @contextmanager
+    def budget(max_queries):
+        with track_queries('test') as stats:
+            yield stats
+        assert stats.count <= max_queries, (
+            f'{stats.count} queries, budget {max_queries}: {dict(stats.shapes)}'
+        )
+    return budget
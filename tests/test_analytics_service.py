@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+from app.models.item import Item
+from app.models.report import Report
+from app.services.analytics_service import InventoryAnalytics
+from app.services.report_service import ReportService
+
+def _add_items(db, user):
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    offsets = [-5, 0, 1, 3, 7, 8, 15, 30, 31, 60, 90, 91, 200, None]
+    for index, offset in enumerate(offsets):
+        db.session.add(Item(
+            name=f'Item {index}',
+            user_id=user.id,
+            quantity=None if index == 2 else float(index * 3),
+            unit='pcs' if index % 2 else None,
+            cost_price=None if index == 4 else 120.0 * index,
+            location='Shelf A' if index % 3 else None,
+            batch_number=f'B{index}',
+            expiry_date=today + timedelta(days=offset) if offset is not None else None
+        ))
+    db.session.commit()
+
+def test_vectorized_metrics_match_python_path(db, user):
+    _add_items(db, user)
+    items = Item.query.filter_by(user_id=user.id).order_by(Item.id).all()
+
+    expected = ReportService().build_report_metrics(items)
+    actual = InventoryAnalytics.for_user(user.id).report_metrics()
+
+    assert actual == expected
+
+def test_empty_inventory(db, user):
+    analytics = InventoryAnalytics.for_user(user.id)
+
+    assert analytics.report_metrics() == ReportService().build_report_metrics([])
+    assert analytics.expiry_histogram()['no_expiry'] == 0
+    assert analytics.top_risks() == []
+
+def test_histogram_and_risk_scores(db, user):
+    _add_items(db, user)
+    analytics = InventoryAnalytics.for_user(user.id)
+
+    histogram = analytics.expiry_histogram()
+    assert histogram == {
+        'expired': 1, 'today': 1, 'next_week': 3, 'next_month': 3,
+        'next_quarter': 3, 'later': 2, 'no_expiry': 1
+    }
+
+    scores = analytics.risk_scores()
+    assert list(scores.values) == sorted(scores.values, reverse=True)
+    # An expired item without stock has nothing at risk
+    empty_item = Item.query.filter_by(name='Item 0').first()
+    assert scores.loc[empty_item.id] == 0.0
+    # An item expiring today carries its full stock value
+    expiring_today = Item.query.filter_by(name='Item 1').first()
+    assert scores.loc[expiring_today.id] == 3.0 * 120.0
+
+def test_report_backends_store_same_data(app, db, user):
+    _add_items(db, user)
+    service = ReportService()
+
+    app.config['REPORT_ANALYTICS_BACKEND'] = 'python'
+    python_data = service.generate_daily_report(user.id).report_data
+    app.config['REPORT_ANALYTICS_BACKEND'] = 'vectorized'
+    vectorized_report = service.generate_daily_report(user.id)
+
+    assert vectorized_report.report_data == python_data
+    assert Report.query.filter_by(user_id=user.id).count() == 1
@@ -0,0 +1,107 @@
+from datetime import date, datetime, timedelta
+import pytest
+from app.core.query_stats import track_queries
+from app.models.item import Item
+from app.models.notification import Notification
+from app.services.dashboard_cache import dashboard_cache
+
+def _days(offset):
+    return datetime.combine(date.today() + timedelta(days=offset), datetime.min.time())
+
+@pytest.fixture
+def items(db, user):
+    items = [
+        Item(name=f'item {offset}', user_id=user.id, expiry_date=_days(offset), quantity=5)
+        for offset in (-3, -1, 0, 2, 5, 30)
+    ]
+    db.session.add_all(items)
+    db.session.commit()
+    return items
+
+def test_view_model(app, user, items):
+    dashboard = dashboard_cache.get(user.id)
+    assert [item['name'] for item in dashboard['expiring_items']] == ['item 0', 'item 2', 'item 5']
+    assert [item['name'] for item in dashboard['expired_items']] == ['item -1', 'item -3']
+    assert dashboard['stats']['total_items'] == 6
+    assert dashboard['stats']['expired_items'] == 2
+    assert dashboard['as_of'] == date.today()
+
+def test_item_lists_are_limited(app, user, items):
+    app.config['DASHBOARD_ITEMS_LIMIT'] = 1
+    dashboard = dashboard_cache.get(user.id)
+    assert [item['name'] for item in dashboard['expiring_items']] == ['item 0']
+    assert [item['name'] for item in dashboard['expired_items']] == ['item -1']
+
+def test_chart_counts_cover_items_beyond_the_list_limit(app, db, user, items, web_client):
+    app.config['DASHBOARD_ITEMS_LIMIT'] = 2
+    db.session.add_all(Item(name=f'extra {n}', user_id=user.id, expiry_date=_days(2)) for n in range(3))
+    db.session.commit()
+
+    dashboard = dashboard_cache.get(user.id)
+    assert len(dashboard['expiring_items']) == 2
+    assert dashboard['expiring_by_day'][(date.today() + timedelta(days=2)).isoformat()] == 4
+    assert sum(dashboard['expiring_by_day'].values()) == 6
+    assert dashboard['expiring_by_category'] == {'Uncategorized': 6}
+    assert dashboard['stats']['expiring_soon_items'] == 6
+    assert b'{"Uncategorized": 6}' in web_client.get('/dashboard').data
+
+def test_repeat_views_skip_the_database(items, web_client):
+    assert web_client.get('/dashboard').status_code == 200
+    hits = dashboard_cache.stats()['hits']
+    with track_queries() as stats:
+        response = web_client.get('/dashboard')
+    assert response.status_code == 200
+    assert b'item 2' in response.data
+    assert dashboard_cache.stats()['hits'] == hits + 1
+    assert not any('FROM items' in shape or 'FROM notifications' in shape for shape in stats.shapes)
+
+def test_item_changes_invalidate(db, user, items, web_client):
+    web_client.get('/dashboard')
+    db.session.add(Item(name='new arrival', user_id=user.id, expiry_date=_days(1)))
+    db.session.commit()
+    assert b'new arrival' in web_client.get('/dashboard').data
+
+    items[3].name = 'renamed'
+    db.session.commit()
+    assert b'renamed' in web_client.get('/dashboard').data
+
+    db.session.delete(items[3])
+    db.session.commit()
+    assert b'renamed' not in web_client.get('/dashboard').data
+
+def test_notifications_invalidate(db, user, items, web_client):
+    assert b'No recent notifications' in web_client.get('/dashboard').data
+    db.session.add(Notification(
+        message='Milk expires tomorrow', type='email', user_id=user.id, item_id=items[0].id
+    ))
+    db.session.commit()
+    assert b'Milk expires tomorrow' in web_client.get('/dashboard').data
+
+def test_marking_all_notifications_read_invalidates(app, db, user, items, web_client):
+    app.config['WTF_CSRF_ENABLED'] = False
+    notification = Notification(
+        message='Milk expires tomorrow', type='email', user_id=user.id, item_id=items[0].id
+    )
+    db.session.add(notification)
+    db.session.commit()
+    response = web_client.get('/dashboard')
+    assert b'Milk expires tomorrow' in response.data
+    assert str(notification.created_at).encode() in response.data
+
+    assert web_client.put('/api/v1/notifications/read-all').status_code == 200
+    assert b'No recent notifications' in web_client.get('/dashboard').data
+
+def test_other_users_are_not_invalidated(db, user, items):
+    cached = dashboard_cache.get(user.id)
+    db.session.add(Item(name='elsewhere', user_id=user.id + 1, expiry_date=_days(1)))
+    db.session.flush()
+    assert dashboard_cache.get(user.id) is cached
+
+def test_entries_from_yesterday_are_rebuilt(user, items):
+    stale = dashboard_cache.get(user.id)
+    stale['as_of'] = date.today() - timedelta(days=1)
+    assert dashboard_cache.get(user.id) is not stale
+
+def test_zero_ttl_disables_the_cache(app, user, items):
+    app.config['DASHBOARD_CACHE_TTL'] = 0
+    assert dashboard_cache.get(user.id) is not dashboard_cache.get(user.id)
@@ -0,0 +1,82 @@
+import cv2
+import numpy as np
+import pytest
+from app.services.date_ocr_service import DateOCRService, image_dimensions
+from app.services.ocr_backends import FakeOCRBackend
+from app.services.ocr_cache import ocr_cache
+
+def _encoded(extension, width=3200, height=2400):
+    image = np.full((height, width, 3), 220, np.uint8)
+    cv2.putText(image, 'EXP 31/12/2026', (100, height // 2), cv2.FONT_HERSHEY_SIMPLEX, 5, (20, 20, 20), 12)
+    return cv2.imencode(extension, image)[1].tobytes()
+
+@pytest.mark.parametrize('extension', ['.png', '.jpg', '.webp', '.bmp', '.tiff'])
+def test_image_dimensions_from_header(extension):
+    assert image_dimensions(_encoded(extension)) == (3200, 2400)
+
+def test_image_dimensions_extended_webp():
+    header = b'RIFF' + b'\0' * 4 + b'WEBPVP8X' + b'\0' * 8 + (3199).to_bytes(3, 'little') + (2399).to_bytes(3, 'little')
+    assert image_dimensions(header) == (3200, 2400)
+
+def test_image_dimensions_unknown_format():
+    assert image_dimensions(b'not an image') is None
+
+def test_load_image_reduces_to_target(app):
+    gray = DateOCRService().load_image(_encoded('.jpg'), target_size=1000)
+    assert gray.ndim == 2
+    assert max(gray.shape) == 1000
+
+def test_expensive_tier_only_runs_when_fast_tier_fails(app, monkeypatch):
+    ocr_cache.clear()
+    service = DateOCRService(backend=FakeOCRBackend())
+    monkeypatch.setattr(service, 'save_debug_image', lambda image, tier: None)
+    tiers = []
+    monkeypatch.setattr(service, 'preprocess', lambda gray, tier: tiers.append(tier) or gray)
+
+    monkeypatch.setattr(service, 'recognize_text', lambda image: 'exp 31/12/2026')
+    assert service.extract_date(_encoded('.jpg')) == '2026-12-31'
+    assert tiers == ['fast']
+
+    tiers.clear()
+    ocr_cache.clear()
+    texts = iter(['smudged', 'exp 31/12/2026'])
+    monkeypatch.setattr(service, 'recognize_text', lambda image: next(texts))
+    assert service.extract_date(_encoded('.jpg')) == '2026-12-31'
+    assert tiers == ['fast', 'denoise']
+
+def test_pipeline_stays_in_memory_by_default(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'root_path', str(tmp_path))
+    service = DateOCRService()
+
+    processed = service.preprocess_image(_encoded('.jpg'))
+
+    assert not (tmp_path / 'debug_images').exists()
+    assert cv2.imdecode(np.frombuffer(processed, np.uint8), cv2.IMREAD_GRAYSCALE) is not None
+
+def test_debug_images_are_opt_in(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'root_path', str(tmp_path))
+    app.config['OCR_DEBUG_IMAGES'] = True
+
+    DateOCRService().preprocess_image(_encoded('.jpg'))
+    DateOCRService().preprocess_image(_encoded('.jpg'))
+
+    assert len(list((tmp_path / 'debug_images').iterdir())) == 2
+
+@pytest.mark.parametrize('upload_format, quality', [('png', None), ('jpeg', 80)])
+def test_upload_codec_is_configurable(app, upload_format, quality):
+    app.config.update(OCR_UPLOAD_FORMAT=upload_format, OCR_UPLOAD_QUALITY=quality)
+    service = DateOCRService()
+    cleaned = service.preprocess(service.load_image(_encoded('.jpg')), 'fast')
+
+    encoded = service.encode_image(cleaned)
+
+    decoded = cv2.imdecode(encoded, cv2.IMREAD_GRAYSCALE)
+    assert decoded.shape == cleaned.shape
+    if upload_format == 'png':
+        assert np.array_equal(decoded, cleaned)
+
+def test_stage_buffers_are_reused(app):
+    service = DateOCRService()
+    first = service.preprocess(service.load_image(_encoded('.jpg')), 'fast')
+    second = service.preprocess(service.load_image(_encoded('.jpg')), 'fast')
+    assert first is second
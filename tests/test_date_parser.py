@@ -0,0 +1,73 @@
+import time
+from datetime import date
+import pytest
+from app.services.date_parser import _current_date, correct_ocr_errors, date_candidates, parse_date
+
+TODAY = date(2026, 6, 1)
+
+# OCR text, after correction, and the expiry date it should yield
+CORPUS = [
+    ('exp 31/12/2026', '2026-12-31'),
+    ('exp date: 05/06/2027', '2027-06-05'),
+    ('expiry date 2027-03-15', '2027-03-15'),
+    ('best before 2027-03-15', '2027-03-15'),
+    ('use by 2026/11/30', '2026-11-30'),
+    ('expiry 14-02-2028', '2028-02-14'),
+    ('exp 01/01/27', '2027-01-01'),
+    ('exp 31.12.2026', '2026-12-31'),
+    ('best before dec 31, 2026', '2026-12-31'),
+    ('bbe 15 mar 2027', '2027-03-15'),
+    ('exp 07-jan-2027', '2027-01-07'),
+    ('use by september 3rd 2026', '2026-09-03'),
+    ('12/31/2026', '2026-12-31'),
+    ('mfg 01/01/2026 exp 01/01/2027', '2027-01-01'),
+    ('exp 01/01/2027 mfd 01/01/2026', '2027-01-01'),
+    ('packed 02/05/2026 best before 02/08/2026', '2026-08-02'),
+    ('lot 2026-01-10 exp 2026-07-10', '2026-07-10'),
+    ('printed 01/03/2025 01/03/2027', '2027-03-01'),
+    ('may contain nuts exp 31/12/2026', '2026-12-31'),
+    ('net wt 500g batch 12345 price 3.99', None),
+    ('exp 31/02/2027', None),
+    ('exp 31/12/1999', None),
+    ('', None),
+]
+
+@pytest.mark.parametrize('text, expected', CORPUS)
+def test_corpus(text, expected):
+    assert parse_date(text, today=TODAY) == expected
+
+def test_candidates_are_scored_by_context_and_future():
+    candidates = date_candidates('mfg 01/01/2026 exp 01/01/2027 10/10/2025', today=TODAY)
+
+    assert [c['date'].isoformat() for c in candidates] == ['2026-01-01', '2027-01-01', '2025-10-10']
+    assert [c['context'] for c in candidates] == ['made', 'expiry', 'expiry']
+    assert candidates[1]['score'] > candidates[2]['score'] > candidates[0]['score']
+
+@pytest.mark.parametrize('text, expected', [
+    ('Best Before 31/12/2026', 'best before 31/12/2026'),
+    ('SEE 31/12/2026', 'exp 31/12/2026'),
+    ('seed oil, may contain mayonnaise, date', 'seed oil, may contain mayonnaise, date'),
+    ('EXP 3l/12/2O26', 'exp 31/12/2026'),
+    ('ロマ了', 'ロml'),
+    ('sold 10 oil', 'sold 10 oil'),
+])
+def test_corrections_only_touch_whole_tokens(text, expected):
+    assert correct_ocr_errors(text) == expected
+
+def test_scoring_defaults_to_today():
+    assert _current_date() == date.today()
+    assert parse_date('packed 01/01/2000 best before 01/01/2099') == '2099-01-01'
+
+def test_month_names_survive_correction():
+    assert parse_date(correct_ocr_errors('BEST BEFORE MAY 5, 2027'), today=TODAY) == '2027-05-05'
+
+@pytest.mark.parametrize('text', [
+    '1' * 100_000,
+    '12 ' * 30_000,
+    '12/' * 30_000,
+    '1 jan ' * 20_000,
+], ids=['digits', 'numbers', 'slashes', 'day-month'])
+def test_adversarial_text_parses_in_linear_time(text):
+    start = time.perf_counter()
+    parse_date(text, today=TODAY)
+    assert time.perf_counter() - start < 2
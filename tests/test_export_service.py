@@ -0,0 +1,59 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+import pytest
+from app.models.item import Item
+from app.services.export_service import ExportService, ITEM_EXPORT_FIELDS, column_types
+
+def _add_items(db, user, count):
+    expiry = datetime(2026, 1, 1)
+    db.session.add_all([
+        Item(name=f'Item {index}', user_id=user.id, quantity=float(index), unit='pcs',
+             expiry_date=expiry + timedelta(days=index))
+        for index in range(count)
+    ])
+    db.session.commit()
+
+def test_csv_export_streams_one_chunk_per_batch(db, user):
+    _add_items(db, user, 25)
+    service = ExportService(batch_size=10)
+
+    chunks = list(service.stream(service.item_batches(user.id), ITEM_EXPORT_FIELDS, 'csv'))
+
+    # Header, then three batches of at most ten rows
+    assert len(chunks) == 4
+    rows = list(csv.DictReader(io.StringIO(b''.join(chunks).decode('utf-8'))))
+    assert [row['name'] for row in rows] == [f'Item {index}' for index in range(25)]
+
+def test_header_is_sent_before_the_query_runs(db, user):
+    service = ExportService(batch_size=10)
+    batches = iter(())
+
+    chunks = service.stream(batches, ITEM_EXPORT_FIELDS, 'csv')
+
+    assert next(chunks).decode('utf-8').startswith('id,name,')
+
+def test_ndjson_export(db, user):
+    _add_items(db, user, 3)
+    service = ExportService(batch_size=2)
+
+    body = b''.join(service.stream(service.item_batches(user.id), ITEM_EXPORT_FIELDS, 'ndjson'))
+
+    records = [json.loads(line) for line in body.decode('utf-8').splitlines()]
+    assert len(records) == 3
+    assert records[2]['expiry_date'] == '2026-01-03T00:00:00'
+    assert records[2]['quantity'] == 2.0
+
+def test_parquet_export(db, user):
+    pq = pytest.importorskip('pyarrow.parquet')
+    _add_items(db, user, 5)
+    service = ExportService(batch_size=2)
+
+    body = b''.join(service.stream(
+        service.item_batches(user.id), ITEM_EXPORT_FIELDS, 'parquet', column_types(Item, ITEM_EXPORT_FIELDS)
+    ))
+
+    table = pq.read_table(io.BytesIO(body))
+    assert table.num_rows == 5
+    assert table.column('name').to_pylist()[4] == 'Item 4'
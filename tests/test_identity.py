@@ -0,0 +1,133 @@
+import pytest
+from flask_jwt_extended import create_access_token, get_jwt_identity, jwt_required
+from flask_login import current_user, login_required
+from sqlalchemy import delete, event
+from app.core.identity import get_user, user_cache
+from app.models.user import User
+
+@pytest.fixture
+def user_selects(db):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('SELECT') and 'FROM users' in statement:
+            statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', count)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', count)
+
+@pytest.fixture
+def api_get(app, user):
+    token = create_access_token(identity=str(user.id))
+    client = app.test_client()
+
+    def get(path):
+        # A fresh app context per request, as outside the test fixtures
+        with app.app_context():
+            return client.get(path, headers={'Authorization': f'Bearer {token}'})
+    return get
+
+def test_repeated_lookups_in_a_request_share_one_query(app, user, user_selects):
+    user_id = user.id
+    user_selects.clear()
+    with app.app_context():
+        first = get_user(user_id)
+        assert get_user(str(user_id)) is first
+        assert get_user(user_id) is first
+    assert len(user_selects) == 1
+
+def test_cached_identity_needs_no_query(api_get, user, user_selects):
+    assert api_get('/api/v1/auth/me').status_code == 200
+    user_selects.clear()
+
+    response = api_get('/api/v1/auth/me')
+    assert response.status_code == 200
+    assert response.get_json()['username'] == 'tester'
+    assert user_selects == []
+    assert user_cache.stats()['hits'] >= 1
+
+def test_uncached_fields_load_on_access(app, user, db, user_selects):
+    user.zoho_access_token = 'token'
+    db.session.commit()
+    user_id = user.id
+    with app.app_context():
+        get_user(user_id)
+    user_selects.clear()
+
+    with app.app_context():
+        cached = get_user(user_id)
+        assert cached.username == 'tester'
+        assert user_selects == []
+        assert cached.zoho_access_token == 'token'
+        assert len(user_selects) == 1
+
+def test_updates_invalidate_the_cache(app, api_get, user, db):
+    assert api_get('/api/v1/auth/me').get_json()['username'] == 'tester'
+    user_id = user.id
+
+    with app.app_context():
+        renamed = get_user(user_id)
+        renamed.username = 'renamed'
+        db.session.commit()
+
+    assert api_get('/api/v1/auth/me').get_json()['username'] == 'renamed'
+
+def test_deleted_user_is_not_served_from_cache(app, user, db):
+    user_id = user.id
+    with app.app_context():
+        get_user(user_id)
+    db.session.delete(user)
+    db.session.commit()
+
+    with app.app_context():
+        assert get_user(user_id) is None
+
+@pytest.fixture
+def zoho_token_routes(app):
+    # Read a column outside IDENTITY_FIELDS, as settings and Zoho pages do
+    @app.route('/api/v1/_zoho_token')
+    @jwt_required()
+    def api_zoho_token():
+        return {'token': get_user(get_jwt_identity()).zoho_access_token}
+
+    @app.route('/_zoho_token')
+    @login_required
+    def web_zoho_token():
+        return current_user.zoho_access_token or ''
+
+def _delete_elsewhere(db, user_id):
+    # As another process or a bulk statement would, bypassing the ORM events
+    db.session.execute(delete(User.__table__).where(User.id == user_id))
+    db.session.commit()
+
+def test_api_user_deleted_elsewhere_is_unauthorized(api_get, user, db, zoho_token_routes):
+    assert api_get('/api/v1/_zoho_token').status_code == 200
+    _delete_elsewhere(db, user.id)
+
+    response = api_get('/api/v1/_zoho_token')
+    assert response.status_code == 401
+    assert response.get_json()['message'] == 'User no longer exists'
+    assert user_cache.stats()['size'] == 0
+
+def test_web_user_deleted_elsewhere_is_logged_out(user, db, web_client, zoho_token_routes):
+    assert web_client.get('/_zoho_token').status_code == 200
+    _delete_elsewhere(db, user.id)
+
+    response = web_client.get('/_zoho_token')
+    assert response.status_code == 302
+    assert '/login' in response.headers['Location']
+    with web_client.session_transaction() as session:
+        assert '_user_id' not in session
+
+def test_zero_ttl_disables_the_cache(app, api_get, user_selects):
+    app.config['USER_CACHE_TTL'] = 0
+    api_get('/api/v1/auth/me')
+    user_selects.clear()
+
+    assert api_get('/api/v1/auth/me').status_code == 200
+    assert len(user_selects) == 1
+
+def test_invalid_identity(app):
+    assert get_user(None) is None
+    assert get_user('abc') is None
+    assert get_user(12345) is None
@@ -0,0 +1,39 @@
+from datetime import date, timedelta
+from app.models.inventory_snapshot import InventorySnapshot
+from app.tasks.report_generator import generate_daily_reports
+
+def _values(total):
+    values = {field: 0 for field in ('total_items', 'expired_items', 'expiring_items', 'low_stock_items',
+                                     'critical_items', 'expires_today', 'expires_next_week',
+                                     'expires_next_month', 'expires_next_quarter', 'expires_later', 'no_expiry')}
+    values.update(total_items=total, total_value=total * 10.0)
+    return values
+
+def test_daily_rows_are_append_only_and_rolled_up(db, user):
+    monday = date(2026, 6, 1)
+    for offset in range(3):
+        InventorySnapshot.record_day({user.id: _values(offset + 1)}, monday + timedelta(days=offset))
+    # A second run for the same day leaves the stored snapshot alone
+    InventorySnapshot.record_day({user.id: _values(99)}, monday + timedelta(days=2))
+    db.session.commit()
+
+    daily = InventorySnapshot.series(user.id, 'day', monday, monday + timedelta(days=6), ['total_items'])
+    assert daily['total_items'] == [1, 2, 3]
+
+    week = InventorySnapshot.query.filter_by(user_id=user.id, period='week').one()
+    assert (week.period_start, week.period_end, week.samples, week.total_items) == (
+        monday, monday + timedelta(days=2), 3, 3
+    )
+    month = InventorySnapshot.query.filter_by(user_id=user.id, period='month').one()
+    assert month.period_start == date(2026, 6, 1) and month.total_value == 30.0
+
+def test_batch_reports_record_snapshots(db, add_users):
+    users = add_users(3)
+
+    generate_daily_reports(shards=2, workers=1)
+
+    assert InventorySnapshot.query.filter_by(period='day').count() == 3
+    assert InventorySnapshot.query.filter_by(period='week').count() == 3
+    snapshot = InventorySnapshot.query.filter_by(user_id=users[2].id, period='day').one()
+    assert snapshot.total_items == 6
+    assert snapshot.total_value == 6 * 20.0 * 75.0
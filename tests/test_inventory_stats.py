@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+from app.models.inventory_stats import UserInventoryStats, COUNTER_FIELDS
+from app.models.item import Item
+
+def _counters(user_id):
+    stats = UserInventoryStats.for_user(user_id)
+    return {field: getattr(stats, field) for field in COUNTER_FIELDS}
+
+def _rebuilt(db, user_id):
+    UserInventoryStats.rebuild(user_id)
+    db.session.commit()
+    return _counters(user_id)
+
+def _item(user, days, quantity=20.0, cost_price=5.0, **kwargs):
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    return Item(
+        name=kwargs.pop('name', f'Item {days}'), user_id=user.id, quantity=quantity,
+        cost_price=cost_price, expiry_date=today + timedelta(days=days), **kwargs
+    )
+
+def test_counters_follow_inserts_updates_and_deletes(db, user):
+    UserInventoryStats.for_user(user.id)
+
+    # Several items for the same user in a single flush
+    items = [_item(user, days) for days in (-3, 0, 5, 20, 60)] + [_item(user, 2, quantity=3.0)]
+    db.session.add_all(items)
+    db.session.commit()
+
+    counters = _counters(user.id)
+    assert counters['total_items'] == 6
+    assert counters['expired_items'] == 1
+    assert counters['expiring_soon_items'] == 3
+    assert counters['expiring_items'] == 3
+    assert counters['low_stock_items'] == 1
+    assert counters['total_value'] == 5 * 20.0 * 5.0 + 3.0 * 5.0
+
+    items[4].expiry_date = items[0].expiry_date
+    items[1].quantity = 1.0
+    db.session.commit()
+    db.session.delete(items[2])
+    db.session.commit()
+
+    counters = _counters(user.id)
+    assert counters == _rebuilt(db, user.id)
+    assert counters['total_items'] == 5
+    assert counters['expired_items'] == 2
+
+def test_rolled_back_changes_are_not_counted(db, user):
+    UserInventoryStats.for_user(user.id)
+    db.session.add(_item(user, 5))
+    db.session.flush()
+    db.session.rollback()
+
+    assert _counters(user.id)['total_items'] == 0
+
+def test_stale_counters_are_rebuilt(db, user):
+    db.session.add(_item(user, 1))
+    db.session.commit()
+    stats = UserInventoryStats.for_user(user.id)
+    stats.as_of = stats.as_of - timedelta(days=1)
+    stats.expired_items = 99
+    db.session.commit()
+
+    counters = _counters(user.id)
+    assert counters['expired_items'] == 0
+    assert UserInventoryStats.for_user(user.id).as_of == datetime.now().date()
+
+def test_bulk_delete_then_rebuild(db, user):
+    db.session.add_all([_item(user, days) for days in range(5)])
+    db.session.commit()
+    UserInventoryStats.for_user(user.id)
+
+    Item.query.filter_by(user_id=user.id).delete()
+    UserInventoryStats.rebuild(user.id)
+    db.session.commit()
+
+    assert _counters(user.id)['total_items'] == 0
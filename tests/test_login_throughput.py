@@ -0,0 +1,60 @@
+"""Login throughput benchmark.
+
+Drives the API login endpoint from one thread per core at each bcrypt cost
+and reports logins per second per core. Skipped unless
+``LOGIN_BENCHMARK_COSTS`` names the costs to measure, e.g.
+
+    LOGIN_BENCHMARK_COSTS=10,11,12 python -m pytest -s tests/test_login_throughput.py
+"""
+import os
+import threading
+import time
+import pytest
+from app.core.passwords import get_password_hasher
+
+PASSWORD = 'Str0ng!Passw0rd'
+COSTS = [int(cost) for cost in os.environ.get('LOGIN_BENCHMARK_COSTS', '4').split(',')]
+DURATION = float(os.environ.get('LOGIN_BENCHMARK_SECONDS', 1))
+
+pytestmark = pytest.mark.skipif(not os.environ.get('LOGIN_BENCHMARK_COSTS'),
+                                reason='set LOGIN_BENCHMARK_COSTS to run the login benchmark')
+
+@pytest.mark.parametrize('cost', COSTS)
+def test_login_throughput(app, user, db, cost):
+    cores = os.cpu_count() or 1
+    app.config.update(BCRYPT_ROUNDS=cost, PASSWORD_HASH_WORKERS=cores, PASSWORD_HASH_QUEUE_SIZE=cores)
+    app.config['WTF_CSRF_ENABLED'] = False
+    app.extensions.pop('password_hasher', None)
+    user.password = PASSWORD
+    db.session.commit()
+    credentials = {'email': user.email, 'password': PASSWORD}
+
+    logins = []
+    statuses = set()
+    deadline = time.perf_counter() + DURATION
+
+    def log_in():
+        client = app.test_client()
+        count = 0
+        while time.perf_counter() < deadline:
+            response = client.post('/api/v1/auth/login', json=credentials,
+                                   headers={'X-CSRFToken': 'token'})
+            statuses.add(response.status_code)
+            count += 1
+        logins.append(count)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=log_in) for _ in range(cores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    stats = get_password_hasher().stats()
+    get_password_hasher().shutdown()
+    print(f"\ncost {cost}: {sum(logins) / elapsed:.1f} logins/s, {sum(logins) / elapsed / cores:.1f} per core "
+          f"({cores} cores), mean hash {stats['mean_hash_ms']} ms, mean wait {stats['mean_wait_ms']} ms, "
+          f"max queued {stats['max_queued']}")
+    assert statuses == {200}
+    assert sum(logins) > 0
@@ -0,0 +1,82 @@
+import os
+import subprocess
+import sys
+import pytest
+from prometheus_client import REGISTRY
+from app.core.metrics import track_outbound
+
+def _sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+@pytest.fixture
+def client(app):
+    @app.route('/_metrics_probe')
+    def probe():
+        return 'ok'
+
+    @app.route('/_metrics_error')
+    def error():
+        return 'unavailable', 503
+    return app.test_client()
+
+def test_requests_are_counted_and_timed(client):
+    before = _sample('http_requests_total', method='GET', endpoint='probe', status='200')
+    timed = _sample('http_request_duration_seconds_count', method='GET', endpoint='probe')
+
+    client.get('/_metrics_probe')
+
+    assert _sample('http_requests_total', method='GET', endpoint='probe', status='200') == before + 1
+    assert _sample('http_request_duration_seconds_count', method='GET', endpoint='probe') == timed + 1
+    assert _sample('http_requests_in_progress', endpoint='probe') == 0
+
+def test_requests_are_counted_by_status(client):
+    before = _sample('http_requests_total', method='GET', endpoint='error', status='503')
+    client.get('/_metrics_error')
+    assert _sample('http_requests_total', method='GET', endpoint='error', status='503') == before + 1
+
+def test_metrics_endpoint_serves_prometheus_text(client):
+    client.get('/_metrics_probe')
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    assert b'http_request_duration_seconds_bucket{endpoint="probe"' in response.data
+    assert b'db_pool_connections_in_use' in response.data
+
+def test_metrics_token(app, client):
+    app.config['METRICS_TOKEN'] = 'secret'
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer secret'}).status_code == 200
+
+def test_metrics_need_a_token_in_production(app, client):
+    app.testing = False
+    app.debug = False
+    assert client.get('/metrics').status_code == 404
+    app.config['METRICS_TOKEN'] = 'secret'
+    assert client.get('/metrics', headers={'Authorization': 'Bearer secret'}).status_code == 200
+
+def test_outbound_calls_are_timed_by_outcome():
+    ok = _sample('outbound_request_duration_seconds_count', service='zoho', outcome='ok')
+    failed = _sample('outbound_request_duration_seconds_count', service='zoho', outcome='error')
+
+    with track_outbound('zoho'):
+        pass
+    with pytest.raises(ConnectionError):
+        with track_outbound('zoho'):
+            raise ConnectionError()
+
+    assert _sample('outbound_request_duration_seconds_count', service='zoho', outcome='ok') == ok + 1
+    assert _sample('outbound_request_duration_seconds_count', service='zoho', outcome='error') == failed + 1
+
+def test_workers_are_aggregated(tmp_path):
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    record = "from app.core.metrics import track_outbound\nwith track_outbound('smtp'):\n    pass\n"
+    for _ in range(2):
+        subprocess.run([sys.executable, '-c', record], env=env, check=True, capture_output=True)
+
+    report = (
+        "from prometheus_client import generate_latest\n"
+        "from app.core.metrics import metrics_registry\n"
+        "print(generate_latest(metrics_registry()).decode())\n"
+    )
+    output = subprocess.run([sys.executable, '-c', report], env=env, check=True, capture_output=True, text=True).stdout
+    assert 'outbound_request_duration_seconds_count{outcome="ok",service="smtp"} 2.0' in output
@@ -0,0 +1,57 @@
+import time
+import cv2
+import numpy as np
+import pytest
+from app.services.date_ocr_service import DateOCRService
+from app.services.ocr_backends import FakeOCRBackend, TesseractOCRBackend, create_ocr_backend
+from app.services.ocr_cache import ocr_cache
+
+def _label(text='EXP 31/12/2026', width=1600, height=1200):
+    image = np.full((height, width, 3), 220, np.uint8)
+    cv2.putText(image, text, (60, height // 2), cv2.FONT_HERSHEY_SIMPLEX, 3, (20, 20, 20), 8)
+    return cv2.imencode('.png', image)[1].tobytes()
+
+def test_fake_backend_is_deterministic_with_latency():
+    backend = FakeOCRBackend(['EXP 01/02/2027', 'USE BY 2027-03-04\nLOT 7'], latency=0.05)
+
+    started = time.perf_counter()
+    first = backend.recognize(b'image-one')
+    assert time.perf_counter() - started >= 0.05
+
+    assert backend.recognize(b'image-one') == first
+    assert {tuple(backend.recognize(bytes([n]))) for n in range(16)} == {
+        ('EXP 01/02/2027',), ('USE BY 2027-03-04', 'LOT 7')
+    }
+
+def test_pipeline_runs_offline_on_the_fake_backend(app):
+    ocr_cache.clear()
+    backend = FakeOCRBackend(['best before 15/03/2027'])
+    service = DateOCRService(backend=backend)
+
+    assert service.available
+    assert service.extract_date_result(_label()) == {'date': '2027-03-15', 'confidence': 1.0, 'cache': None}
+    assert backend.calls == 1
+    ocr_cache.clear()
+
+def test_backend_selection(app, monkeypatch):
+    monkeypatch.delenv('AZURE_VISION_KEY', raising=False)
+    monkeypatch.delenv('AZURE_VISION_ENDPOINT', raising=False)
+    app.config.update(OCR_FAKE_TEXTS=('EXP 01/01/2027',), OCR_FAKE_LATENCY_MS=20)
+
+    fake = create_ocr_backend('fake')
+    assert isinstance(fake, FakeOCRBackend)
+    assert fake.latency == 0.02
+    assert create_ocr_backend('azure') is None
+    with pytest.raises(ValueError):
+        create_ocr_backend('unknown')
+
+    monkeypatch.setattr(TesseractOCRBackend, 'installed', staticmethod(lambda command=None: False))
+    assert create_ocr_backend('auto') is None
+    assert not DateOCRService().available
+
+@pytest.mark.skipif(not TesseractOCRBackend.installed(), reason='Tesseract is not installed')
+def test_tesseract_reads_a_label(app):
+    ocr_cache.clear()
+    service = DateOCRService(backend=TesseractOCRBackend())
+    assert service.extract_date(_label()) == '2026-12-31'
+    ocr_cache.clear()
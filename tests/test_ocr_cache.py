@@ -0,0 +1,86 @@
+import time
+import cv2
+import numpy as np
+import pytest
+from app.models.ocr_result import OCRResult
+from app.services.date_ocr_service import DateOCRService
+from app.services.ocr_backends import FakeOCRBackend
+from app.services.ocr_cache import ocr_cache
+
+def _label(width=1600, height=1200, quality=90):
+    image = np.full((height, width, 3), 220, np.uint8)
+    cv2.putText(image, 'EXP 31/12/2026', (60, height // 2), cv2.FONT_HERSHEY_SIMPLEX, width / 600, (20, 20, 20), 6)
+    return cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, quality])[1].tobytes()
+
+@pytest.fixture
+def service(app, monkeypatch):
+    ocr_cache.clear()
+    service = DateOCRService(backend=FakeOCRBackend())
+    calls = []
+
+    def recognize_text(image):
+        calls.append(image)
+        return 'exp 31/12/2026'
+    monkeypatch.setattr(service, 'recognize_text', recognize_text)
+    service.calls = calls
+    yield service
+    ocr_cache.clear()
+
+def test_repeat_scan_is_served_from_cache(service):
+    first = service.extract_date_result(_label())
+    second = service.extract_date_result(_label())
+
+    assert first == {'date': '2026-12-31', 'confidence': 1.0, 'cache': None}
+    assert second == {'date': '2026-12-31', 'confidence': 1.0, 'cache': 'content'}
+    assert len(service.calls) == 1
+    stats = ocr_cache.stats()
+    assert (stats['hits'], stats['misses'], stats['hit_rate']) == (1, 1, 0.5)
+
+def test_near_duplicates_need_the_perceptual_tier(app, service):
+    service.extract_date(_label())
+    service.extract_date(_label(width=1200, height=900, quality=70))
+    assert len(service.calls) == 2
+
+    app.config['OCR_CACHE_PERCEPTUAL'] = True
+    result = service.extract_date_result(_label(width=1000, height=750, quality=60))
+    assert result['cache'] == 'perceptual'
+    assert len(service.calls) == 2
+
+def test_entries_expire(app, service, monkeypatch):
+    service.extract_date(_label())
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + app.config['OCR_CACHE_TTL'] + 1)
+
+    service.extract_date(_label())
+
+    assert len(service.calls) == 2
+
+def test_results_can_be_persisted(app, db, service):
+    app.config['OCR_CACHE_PERSIST'] = True
+    service.extract_date(_label())
+    assert OCRResult.query.one().date == '2026-12-31'
+
+    ocr_cache.clear()
+    result = service.extract_date_result(_label())
+
+    assert result['cache'] == 'content'
+    assert ocr_cache.stats()['persisted_hits'] == 1
+    assert len(service.calls) == 1
+
+def test_results_without_a_date_expire_sooner(app, service, monkeypatch):
+    monkeypatch.setattr(service, 'recognize_text', lambda image: service.calls.append(image) or 'no date here')
+    service.extract_date(_label())
+    calls = len(service.calls)
+    assert service.extract_date_result(_label())['cache'] == 'content'
+
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + app.config['OCR_CACHE_NEGATIVE_TTL'] + 1)
+    assert service.extract_date_result(_label())['cache'] is None
+    assert len(service.calls) == 2 * calls
+
+def test_backend_errors_are_not_cached(service, monkeypatch):
+    def fail(image):
+        raise ConnectionError('backend down')
+    monkeypatch.setattr(service, 'recognize_text', fail)
+    assert service.extract_date(_label()) is None
+    assert ocr_cache.stats()['size'] == 0
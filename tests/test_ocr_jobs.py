@@ -0,0 +1,124 @@
+import io
+import json
+import threading
+import cv2
+import numpy as np
+import pytest
+
+PNG = cv2.imencode('.png', np.zeros((8, 8), np.uint8))[1].tobytes()
+
+class FakeOCRService:
+    available = True
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.release.set()
+
+    def extract_date_result(self, image_data):
+        self.release.wait(5)
+        return {'date': '2026-12-31', 'confidence': 1.0, 'cache': None}
+
+@pytest.fixture
+def ocr(app):
+    app.config.update(OCR_WORKERS=1, OCR_QUEUE_SIZE=1)
+    service = app.extensions['date_ocr_service'] = FakeOCRService()
+    yield service
+    service.release.set()
+    jobs = app.extensions.pop('ocr_jobs', None)
+    if jobs:
+        jobs._executor.shutdown(wait=True)
+
+def _upload(client, path):
+    return client.post(path, data={'image': (io.BytesIO(PNG), 'label.png')},
+                       content_type='multipart/form-data')
+
+def test_job_lifecycle(app, ocr):
+    client = app.test_client()
+
+    created = _upload(client, '/api/v1/date_ocr/extract/jobs')
+    assert created.status_code == 202
+    status_url = created.get_json()['status_url']
+    assert created.headers['Location'].endswith(status_url)
+
+    app.extensions['ocr_jobs'].wait(app.extensions['ocr_jobs'].get(created.get_json()['job']['id']), 5)
+    job = client.get(status_url).get_json()['job']
+    assert job['status'] == 'done'
+    assert job['result']['date'] == '2026-12-31'
+
+    assert client.get('/api/v1/date_ocr/extract/jobs/unknown').status_code == 404
+
+def test_full_queue_returns_503_with_retry_after(app, ocr):
+    client = app.test_client()
+    ocr.release.clear()
+
+    # One running and one waiting fill the pool
+    assert _upload(client, '/api/v1/date_ocr/extract/jobs').status_code == 202
+    assert _upload(client, '/api/v1/date_ocr/extract/jobs').status_code == 202
+    rejected = _upload(client, '/api/v1/date_ocr/extract/jobs')
+
+    assert rejected.status_code == 503
+    assert int(rejected.headers['Retry-After']) >= 1
+    assert _upload(client, '/api/v1/date_ocr/extract').status_code == 503
+
+def test_sync_extract_runs_on_the_pool(app, ocr):
+    response = _upload(app.test_client(), '/api/v1/date_ocr/extract')
+    assert response.status_code == 200
+    assert response.get_json()['date'] == '2026-12-31'
+
+class ScriptedOCRService(FakeOCRService):
+    """Returns the date appended to the image bytes, failing on b'fail'."""
+
+    def extract_date_result(self, image_data):
+        self.release.wait(5)
+        text = bytes(image_data[len(PNG):])
+        if text == b'fail':
+            raise ValueError('unreadable')
+        return {'date': text.decode() or None, 'confidence': 1.0, 'cache': None}
+
+def _batch(client, images, order=None):
+    path = '/api/v1/date_ocr/extract/batch' + (f'?order={order}' if order else '')
+    return client.post(path, data={
+        'images': [(io.BytesIO(PNG + data if data else b''), f'label-{index}.png') for index, data in enumerate(images)]
+    }, content_type='multipart/form-data')
+
+def test_batch_streams_a_line_per_image(app, ocr):
+    app.extensions['date_ocr_service'] = ScriptedOCRService()
+    images = [b'2026-01-01', b'fail', b'2026-01-03', b'', b'2026-01-05']
+
+    response = _batch(app.test_client(), images, order='input')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    # More images than the one worker and one queue slot, all still processed
+    assert [line['index'] for line in lines] == [0, 1, 2, 3, 4]
+    assert [line['status'] for line in lines] == ['success', 'error', 'success', 'error', 'success']
+    assert lines[2]['date'] == '2026-01-03'
+    assert lines[2]['filename'] == 'label-2.png'
+    assert 'unreadable' in lines[1]['message']
+
+def test_batch_completion_order_covers_every_image(app, ocr):
+    app.config.update(OCR_WORKERS=3, OCR_QUEUE_SIZE=0)
+    app.extensions['date_ocr_service'] = ScriptedOCRService()
+
+    response = _batch(app.test_client(), [b'2026-02-0%d' % day for day in range(1, 8)])
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert sorted(line['index'] for line in lines) == list(range(7))
+    assert all(line['date'] == '2026-02-0%d' % (line['index'] + 1) for line in lines)
+
+def test_batch_limits(app, ocr):
+    client = app.test_client()
+    assert _batch(client, []).status_code == 400
+    app.config['OCR_BATCH_MAX_IMAGES'] = 2
+    assert _batch(client, [b'a', b'b', b'c']).status_code == 413
+
+def test_batch_reports_hanging_jobs_instead_of_waiting_forever(app, ocr):
+    app.config['OCR_SYNC_TIMEOUT'] = 0.2
+    ocr.release.clear()
+
+    response = _batch(app.test_client(), [b'a', b'b', b'c'])
+    lines = sorted((json.loads(line) for line in response.get_data(as_text=True).splitlines()),
+                   key=lambda line: line['index'])
+    assert [line['status'] for line in lines] == ['error', 'error', 'error']
+    assert [line['message'] for line in lines[:2]] == ['OCR timed out', 'OCR timed out']
+    assert 'Not processed' in lines[2]['message']
@@ -0,0 +1,76 @@
+import io
+import struct
+import zlib
+import cv2
+import numpy as np
+import pytest
+from werkzeug.datastructures import FileStorage
+from app.services.ocr_uploads import UploadRejected, read_image_upload
+
+def _upload(data, filename='label.png'):
+    return FileStorage(io.BytesIO(data), filename)
+
+def _png_header(width, height):
+    """Signature and IHDR chunk of a PNG claiming the given size."""
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 0, 0, 0, 0)
+    chunk = b'IHDR' + ihdr
+    return b'\x89PNG\r\n\x1a\n' + struct.pack('>I', len(ihdr)) + chunk + struct.pack('>I', zlib.crc32(chunk))
+
+def test_accepted_upload_is_read_into_one_buffer(app):
+    image = np.random.default_rng(3).integers(0, 255, (600, 800), np.uint8)
+    data = cv2.imencode('.jpg', image)[1].tobytes()
+    assert len(data) > 64 * 1024
+
+    buffer = read_image_upload(_upload(data, 'label.jpg'))
+
+    assert isinstance(buffer, bytearray)
+    assert buffer == data
+    assert cv2.imdecode(np.frombuffer(buffer, np.uint8), cv2.IMREAD_GRAYSCALE).shape == (600, 800)
+
+@pytest.mark.parametrize('data, status', [
+    (b'', 400),
+    (b'name,quantity\nmilk,2\n', 415),
+    (b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n', 415),
+])
+def test_non_images_are_rejected(app, data, status):
+    with pytest.raises(UploadRejected) as rejected:
+        read_image_upload(_upload(data))
+    assert rejected.value.status_code == status
+
+def test_oversized_dimensions_are_rejected_from_the_header(app):
+    app.config['OCR_MAX_PIXELS'] = 1_000_000
+    with pytest.raises(UploadRejected) as rejected:
+        read_image_upload(_upload(_png_header(40000, 40000) + b'\0' * 1024))
+    assert rejected.value.status_code == 413
+    assert '40000x40000' in str(rejected.value)
+
+@pytest.mark.parametrize('extension', ['.webp', '.bmp', '.tiff'])
+def test_other_formats_are_sized_from_the_header(app, extension):
+    image = np.random.default_rng(5).integers(0, 255, (300, 500), np.uint8)
+    data = cv2.imencode(extension, image)[1].tobytes()
+    assert len(data) > 64 * 1024
+
+    assert read_image_upload(_upload(data, f'label{extension}')) == data
+    app.config['OCR_MAX_PIXELS'] = 100_000
+    with pytest.raises(UploadRejected) as rejected:
+        read_image_upload(_upload(data, f'label{extension}'))
+    assert rejected.value.status_code == 413
+    assert '500x300' in str(rejected.value)
+
+def test_uploads_without_readable_dimensions_are_rejected(app):
+    data = cv2.imencode('.jpg', np.zeros((40, 40), np.uint8))[1].tobytes()
+    # Metadata segments pushing the frame header past the bytes read up front
+    padding = (b'\xff\xe1' + (0xFFFF).to_bytes(2, 'big') + b'\0' * 0xFFFD) * 2
+    with pytest.raises(UploadRejected) as rejected:
+        read_image_upload(_upload(data[:2] + padding + data[2:], 'label.jpg'))
+    assert rejected.value.status_code == 415
+    assert 'dimensions' in str(rejected.value)
+
+def test_extract_route_rejects_before_ocr(app):
+    response = app.test_client().post(
+        '/api/v1/date_ocr/extract',
+        data={'image': (io.BytesIO(b'not an image at all'), 'label.jpg')},
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 415
+    assert response.get_json()['message'].startswith('Unsupported file type')
@@ -0,0 +1,68 @@
+import threading
+import bcrypt
+import pytest
+from app.core.passwords import HasherBusyError, PasswordHasher, get_password_hasher
+
+PASSWORD = 'Str0ng!Passw0rd'
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(rounds=4, workers=1, queue_size=0, timeout=0.05)
+    yield hasher
+    hasher.shutdown()
+
+def test_hash_and_verify_run_on_the_pool(hasher):
+    password_hash = hasher.hash(PASSWORD)
+
+    assert PasswordHasher.cost(password_hash) == 4
+    assert hasher.verify(PASSWORD, password_hash)
+    assert not hasher.verify('wrong', password_hash)
+    assert not hasher.verify(PASSWORD, 'not-a-bcrypt-hash')
+    stats = hasher.stats()
+    assert (stats['completed'], stats['queued'], stats['running'], stats['rejected']) == (4, 0, 0, 0)
+
+def test_saturated_pool_rejects(hasher):
+    release = threading.Event()
+    started = threading.Event()
+    worker = threading.Thread(target=hasher._submit, args=(lambda: started.set() or release.wait(5),))
+    worker.start()
+    started.wait(5)
+
+    with pytest.raises(HasherBusyError):
+        hasher.verify(PASSWORD, bcrypt.hashpw(b'x', bcrypt.gensalt(4)).decode())
+    release.set()
+    worker.join()
+    assert hasher.stats()['rejected'] == 1
+
+def test_outdated_cost_is_rehashed_on_login(app, user, db):
+    app.config['BCRYPT_ROUNDS'] = 5
+    app.extensions.pop('password_hasher', None)
+    user.password_hash = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(4)).decode()
+    db.session.commit()
+
+    assert not user.verify_password('wrong')
+    assert PasswordHasher.cost(user.password_hash) == 4
+
+    assert user.verify_password(PASSWORD)
+    assert PasswordHasher.cost(user.password_hash) == 5
+    assert user.verify_password(PASSWORD)
+    assert get_password_hasher().stats()['rehashed'] == 1
+
+def test_only_cheaper_hashes_need_rehashing(hasher):
+    assert hasher.needs_rehash(bcrypt.hashpw(b'x', bcrypt.gensalt(4)).decode()) is False
+    assert hasher.needs_rehash(bcrypt.hashpw(b'x', bcrypt.gensalt(5)).decode()) is False
+    hasher.rounds = 5
+    assert hasher.needs_rehash(bcrypt.hashpw(b'x', bcrypt.gensalt(4)).decode()) is True
+    assert hasher.needs_rehash('not-a-bcrypt-hash') is False
+
+def test_api_login_returns_503_when_hashing_is_saturated(app, user, monkeypatch):
+    app.config['WTF_CSRF_ENABLED'] = False
+    user.password = PASSWORD
+    monkeypatch.setattr(get_password_hasher(), 'verify', lambda *args: (_ for _ in ()).throw(HasherBusyError()))
+
+    response = app.test_client().post(
+        '/api/v1/auth/login', json={'email': user.email, 'password': PASSWORD},
+        headers={'X-CSRFToken': 'token'}
+    )
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
@@ -0,0 +1,107 @@
+import os
+import time
+import pytest
+from flask_jwt_extended import create_access_token
+from app.core.profiling import SamplingProfiler, list_profiles, profile_job, profiles_dir
+from app.models.user import User
+
+def busy_loop(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+@pytest.fixture
+def app(app, tmp_path):
+    app.config['PROFILES_DIR'] = str(tmp_path)
+
+    @app.route('/_profile_probe')
+    def probe():
+        busy_loop(0.05)
+        return 'ok'
+    return app
+
+@pytest.fixture
+def admin(db):
+    admin = User(username='admin', email='admin@example.com', is_verified=True)
+    admin.is_admin = True
+    db.session.add(admin)
+    db.session.commit()
+    return admin
+
+def _auth(user):
+    return {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+def test_sampling_profiler_captures_the_running_code(tmp_path):
+    profiler = SamplingProfiler(interval=0.001)
+    profiler.start()
+    busy_loop(0.1)
+    profiler.stop()
+    path = tmp_path / 'loop.folded'
+    profiler.write(str(path))
+
+    lines = path.read_text().splitlines()
+    assert lines
+    assert any('test_profiling.busy_loop' in line for line in lines)
+    stack, count = lines[0].rsplit(' ', 1)
+    assert int(count) > 0 and ';' in stack
+
+def test_admin_can_profile_a_request(app, admin):
+    response = app.test_client().get('/_profile_probe?profile=1', headers=_auth(admin))
+
+    profile_id = response.headers['X-Profile-Id']
+    assert '-probe-' in profile_id
+    assert [profile['name'] for profile in list_profiles()] == [profile_id]
+    with open(os.path.join(profiles_dir(), profile_id)) as profile:
+        assert 'busy_loop' in profile.read()
+
+def test_profile_flag_is_ignored_for_other_users(app, user):
+    response = app.test_client().get('/_profile_probe?profile=1', headers=_auth(user))
+    assert 'X-Profile-Id' not in response.headers
+    assert list_profiles() == []
+
+def test_sample_rate_profiles_requests(app):
+    app.config['PROFILE_SAMPLE_RATE'] = 100
+    client = app.test_client()
+    client.get('/_profile_probe')
+    client.get('/_profile_probe')
+    assert len(list_profiles()) == 2
+
+def test_cprofile_profiler(app, admin):
+    app.config['PROFILER'] = 'cprofile'
+    response = app.test_client().get('/_profile_probe', headers={**_auth(admin), 'X-Profile': '1'})
+    assert response.headers['X-Profile-Id'].endswith('.prof')
+
+def test_jobs_are_profiled_only_when_listed(app):
+    with profile_job('cleanup_expired_items'):
+        busy_loop(0.01)
+    assert list_profiles() == []
+
+    app.config['PROFILE_JOBS'] = ('cleanup_expired_items',)
+    with profile_job('cleanup_expired_items'):
+        busy_loop(0.01)
+    with profile_job('send_daily_notifications'):
+        busy_loop(0.01)
+    profiles = list_profiles()
+    assert len(profiles) == 1
+    assert '-job-cleanup_expired_items-' in profiles[0]['name']
+
+def test_old_profiles_are_removed(app):
+    app.config['PROFILE_MAX_FILES'] = 2
+    app.config['PROFILE_JOBS'] = ('all',)
+    for _ in range(4):
+        with profile_job('rebuild_inventory_stats'):
+            pass
+    assert len(list_profiles()) == 2
+
+def test_profiles_endpoints_are_admin_only(app, user, admin):
+    client = app.test_client()
+    client.get('/_profile_probe?profile=1', headers=_auth(admin))
+    name = list_profiles()[0]['name']
+    assert client.get('/api/v1/admin/profiles', headers=_auth(user)).status_code == 403
+
+    response = client.get('/api/v1/admin/profiles', headers=_auth(admin))
+    assert response.status_code == 200
+    assert response.get_json()['profiles'][0]['name'] == name
+    download = client.get(f'/api/v1/admin/profiles/{name}', headers=_auth(admin))
+    assert download.status_code == 200 and b'busy_loop' in download.data
+    assert client.get('/api/v1/admin/profiles/missing.folded', headers=_auth(admin)).status_code == 404
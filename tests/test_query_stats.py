@@ -0,0 +1,95 @@
+from datetime import date, timedelta
+import logging
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy.exc import IntegrityError
+from app.core.query_stats import log_queries, statement_shape, track_queries
+from app.models.item import Item
+from app.models.user import User
+
+@pytest.fixture
+def items(db, user):
+    today = date.today()
+    db.session.add_all([
+        Item(name=f'item {i}', user_id=user.id, expiry_date=today + timedelta(days=i - 5))
+        for i in range(20)
+    ])
+    db.session.commit()
+
+def test_statement_shape_ignores_parameter_list_lengths():
+    assert statement_shape('SELECT * FROM items WHERE id IN (?, ?, ?)') == statement_shape(
+        'SELECT *\n  FROM items WHERE id IN (?)'
+    )
+
+def test_nested_trackers_all_count(db, user):
+    user_id = user.id
+    with track_queries('outer') as outer:
+        db.session.get(User, user_id + 1)
+        with track_queries('inner') as inner:
+            db.session.get(User, user_id + 2)
+    assert (outer.count, inner.count) == (2, 1)
+    assert outer.duration >= inner.duration
+
+def test_failed_statements_leave_nothing_on_the_connection(db, user):
+    with track_queries() as stats:
+        db.session.add(User(username=user.username, email='other@example.com'))
+        with pytest.raises(IntegrityError):
+            db.session.flush()
+        db.session.rollback()
+        db.session.get(User, user.id + 1)
+        leftover = {key for key in db.session.connection().info if 'start' in key}
+    assert stats.count >= 1
+    assert leftover == set()
+
+def test_repeated_statements_are_flagged(db, user):
+    with track_queries() as stats:
+        for user_id in range(100, 106):
+            db.session.get(User, user_id)
+        db.session.get(Item, 1)
+    repeated = stats.repeated(5)
+    assert len(repeated) == 1
+    assert repeated[0][1] == 6
+    assert 'FROM users' in repeated[0][0]
+
+def test_requests_report_server_timing(app, user):
+    token = create_access_token(identity=str(user.id))
+    response = app.test_client().get('/api/v1/auth/me', headers={'Authorization': f'Bearer {token}'})
+    assert response.headers['Server-Timing'].startswith('db;dur=')
+    assert 'queries' in response.headers['Server-Timing']
+
+def test_likely_n_plus_one_is_logged(app, db, user, caplog):
+    @app.route('/_n_plus_one')
+    def n_plus_one():
+        for user_id in range(100, 110):
+            db.session.get(User, user_id)
+        return 'ok'
+
+    with caplog.at_level(logging.WARNING):
+        app.test_client().get('/_n_plus_one')
+    assert any('Likely N+1' in record.getMessage() for record in caplog.records)
+
+def test_frequent_jobs_log_only_likely_n_plus_one(app, db, user, caplog):
+    with caplog.at_level(logging.INFO), log_queries('frequent_job', totals=False):
+        db.session.get(User, user.id + 1)
+    assert not any('frequent_job' in record.getMessage() for record in caplog.records)
+
+    with caplog.at_level(logging.INFO), log_queries('frequent_job', totals=False):
+        for user_id in range(100, 110):
+            db.session.get(User, user_id)
+    assert [record.levelname for record in caplog.records if 'frequent_job' in record.getMessage()] == ['WARNING']
+
+@pytest.mark.parametrize('path, max_queries', [
+    ('/dashboard', 5),
+    ('/inventory', 5),
+    ('/notifications', 3),
+])
+def test_page_query_budgets(items, web_client, query_budget, path, max_queries):
+    # The first visit settles item statuses
+    web_client.get(path)
+    with query_budget(max_queries):
+        assert web_client.get(path).status_code == 200
+
+def test_api_query_budget(app, user, query_budget):
+    token = create_access_token(identity=str(user.id))
+    with app.app_context(), query_budget(1):
+        app.test_client().get('/api/v1/auth/me', headers={'Authorization': f'Bearer {token}'})
@@ -0,0 +1,102 @@
+import pytest
+from app.core import rate_limit
+from app.core.rate_limit import (
+    MemoryRateLimitStore, SQLiteRateLimitStore, get_concurrency_limiter, parse_limit, rate_limit_group
+)
+
+@pytest.fixture
+def limited_app(app):
+    app.config['RATE_LIMIT_ENABLED'] = True
+    app.config['RATE_LIMIT_DEFAULT'] = '2 per minute'
+
+    @app.route('/_limited')
+    def limited():
+        return 'ok'
+
+    @app.route('/_ocr')
+    @rate_limit_group('ocr')
+    def ocr():
+        return 'ok'
+    return app
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(rate_limit.time, 'time', lambda: now[0])
+    return now
+
+def test_parse_limit():
+    assert parse_limit('30 per minute') == (30, 60)
+    assert parse_limit('5/second') == (5, 1)
+    assert parse_limit('100 per 10 minutes') == (100, 600)
+    with pytest.raises(ValueError):
+        parse_limit('lots')
+
+def test_bucket_allows_a_burst_then_refills(clock):
+    store = MemoryRateLimitStore()
+    assert [store.take('k', 3, 60)[1] for _ in range(4)] == [True, True, True, False]
+    clock[0] += 20
+    assert store.take('k', 3, 60)[1]
+    assert not store.take('k', 3, 60)[1]
+
+def test_sqlite_store_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / 'limits.sqlite')
+    first, second = SQLiteRateLimitStore(path), SQLiteRateLimitStore(path)
+    allowed = [store.take('k', 3, 60)[1] for store in (first, second, first, second)]
+    assert allowed == [True, True, True, False]
+
+def test_requests_over_the_limit_get_429(limited_app):
+    client = limited_app.test_client()
+    first = client.get('/_limited')
+    assert first.headers['RateLimit-Limit'] == '2'
+    assert first.headers['RateLimit-Remaining'] == '1'
+    client.get('/_limited')
+
+    response = client.get('/_limited')
+    assert response.status_code == 429
+    assert response.headers['RateLimit-Remaining'] == '0'
+    assert int(response.headers['Retry-After']) > 0
+
+def test_groups_have_separate_limits(limited_app):
+    client = limited_app.test_client()
+    client.get('/_limited')
+    client.get('/_limited')
+    response = client.get('/_ocr')
+    assert response.status_code == 200
+    assert response.headers['RateLimit-Limit'] == '30'
+
+def test_clients_have_separate_limits(limited_app):
+    client = limited_app.test_client()
+    for _ in range(2):
+        client.get('/_limited')
+    response = client.get('/_limited', environ_base={'REMOTE_ADDR': '10.0.0.2'})
+    assert response.status_code == 200
+
+def test_api_errors_are_json(limited_app):
+    limited_app.config['RATE_LIMIT_AUTH'] = '1 per minute'
+    client = limited_app.test_client()
+    client.post('/api/v1/auth/login', json={})
+    response = client.post('/api/v1/auth/login', json={})
+    assert response.status_code == 429
+    assert response.get_json()['error'] == 'Too Many Requests'
+
+def test_concurrency_cap_sheds_with_503(limited_app):
+    limited_app.config['MAX_CONCURRENT_OCR'] = 1
+    client = limited_app.test_client()
+    limiter = get_concurrency_limiter()
+    assert limiter.acquire('ocr')
+
+    response = client.get('/_ocr')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+    limiter.release('ocr')
+    assert client.get('/_ocr').status_code == 200
+    assert limiter.stats()['running']['ocr'] == 0
+
+def test_store_errors_allow_requests(limited_app, monkeypatch):
+    def broken(*args):
+        raise RuntimeError('disk full')
+    monkeypatch.setattr(MemoryRateLimitStore, 'take', broken)
+    client = limited_app.test_client()
+    assert all(client.get('/_limited').status_code == 200 for _ in range(3))
@@ -0,0 +1,32 @@
+from app.models.report import Report
+from app.services.report_service import ReportService
+from app.tasks.report_generator import generate_daily_reports
+
+def test_generates_one_report_per_user(db, add_users):
+    users = add_users(5)
+
+    summary = generate_daily_reports(shards=2, workers=1)
+
+    assert summary == {'users': 5, 'reports': 5, 'failed_shards': 0}
+    reports = {report.user_id: report for report in Report.query.all()}
+    assert set(reports) == {user.id for user in users}
+    assert len({report.public_token for report in reports.values()}) == 5
+
+def test_rerun_replaces_todays_reports(db, add_users):
+    add_users(3)
+
+    generate_daily_reports(shards=2, workers=1)
+    generate_daily_reports(shards=3, workers=1)
+
+    assert Report.query.count() == 3
+
+def test_batch_report_matches_single_user_report(db, add_users):
+    users = add_users(3)
+    user_id = users[2].id
+
+    generate_daily_reports(shards=2, workers=1)
+    batch_data = Report.query.filter_by(user_id=user_id).one().report_data
+
+    single = ReportService().generate_daily_report(user_id)
+
+    assert single.report_data == batch_data
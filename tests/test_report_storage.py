@@ -0,0 +1,45 @@
+import json
+from datetime import datetime, timedelta
+from sqlalchemy import inspect
+from app.models.item import Item
+from app.models.report import encode_report_data, decode_report_data
+from app.services.report_service import ReportService
+
+def _add_items(db, user, count=40):
+    today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    for index in range(count):
+        db.session.add(Item(
+            name=f'Item {index}', user_id=user.id, quantity=50.0, cost_price=40.0,
+            expiry_date=today + timedelta(days=1 + index % 6), location='Shelf A'
+        ))
+    db.session.commit()
+
+def test_payload_round_trips_and_shares_items(db, user):
+    _add_items(db, user)
+    report = ReportService().generate_daily_report(user.id)
+    data = report.report_data
+
+    payload = encode_report_data(data)
+    assert decode_report_data(payload) == data
+    # Each item is stored once even though it appears in several sections
+    assert len(payload) < len(json.dumps(data)) / 4
+
+def test_items_that_differ_are_not_merged():
+    data = {'a': [{'id': 1, 'name': 'x'}], 'b': [{'id': 1, 'name': 'y'}]}
+    assert decode_report_data(encode_report_data(data)) == data
+    assert decode_report_data(encode_report_data(None)) is None
+
+def test_report_listing_leaves_payload_unloaded(db, user):
+    _add_items(db, user, count=5)
+    user_id = user.id
+    service = ReportService()
+    service.generate_daily_report(user_id)
+    db.session.expunge_all()
+
+    today = datetime.now().date()
+    reports = service.get_reports_by_date_range(today - timedelta(days=30), today, user_id)
+
+    assert len(reports) == 1
+    unloaded = inspect(reports[0]).unloaded
+    assert 'report_payload' in unloaded
+    assert reports[0].total_items == 5
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+import time
+import pytest
+from app.models.item import Item
+from app.routes import reports as report_routes
+from app.services import report_service as report_service_module
+from app.services.report_service import ReportService
+
+@pytest.fixture
+def report(db, user):
+    db.session.add(Item(name='Milk', user_id=user.id, quantity=20.0, cost_price=2.0,
+                        expiry_date=datetime.now() + timedelta(days=3)))
+    db.session.commit()
+    report = ReportService().generate_daily_report(user.id)
+    report.public_token = 'shared-token'
+    report.is_public = True
+    db.session.commit()
+    report_service_module.rendered_reports.clear()
+    return report
+
+def test_owner_view_revalidates_with_etag(web_client, report):
+    response = web_client.get(f'/reports/{report.id}')
+    assert response.status_code == 200
+    assert b'Milk' in response.data
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    etag = response.headers['ETag']
+    assert etag.startswith('W/')
+
+    repeat = web_client.get(f'/reports/{report.id}', headers={'If-None-Match': etag})
+    assert repeat.status_code == 304
+    assert repeat.data == b''
+
+def test_cached_pages_are_replaced_before_their_csrf_token_expires(app, web_client, report, monkeypatch):
+    etag = web_client.get(f'/reports/{report.id}').headers['ETag']
+    now = time.time()
+    monkeypatch.setattr(report_routes.time, 'time', lambda: now + app.config.get('WTF_CSRF_TIME_LIMIT', 3600))
+    assert web_client.get(f'/reports/{report.id}', headers={'If-None-Match': etag}).status_code == 200
+
+def test_rendered_body_is_cached(web_client, report, monkeypatch):
+    web_client.get(f'/reports/{report.id}')
+
+    def fail(*args, **kwargs):
+        raise AssertionError('report body rendered twice')
+    monkeypatch.setattr(report_service_module, 'Markup', fail)
+
+    assert web_client.get(f'/reports/{report.id}').status_code == 200
+
+def test_public_link(app, report):
+    client = app.test_client()
+    response = client.get('/reports/public/shared-token')
+    assert response.status_code == 200
+    assert 'max-age=1800' in response.headers['Cache-Control']
+    assert b'Print Report' not in response.data
+
+    assert client.get('/reports/public/unknown').status_code == 404
@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta
+import pytest
+from flask import session
+from sqlalchemy import event, func, select, update
+from app import create_app
+from app.config import config
+from app.core.extensions import db as _db
+from app.core.sessions import delete_expired_sessions
+from app.models.server_session import ServerSession
+
+def _add_routes(app):
+    @app.route('/_session/set/<value>')
+    def set_value(value):
+        session['value'] = value
+        return 'ok'
+
+    @app.route('/_session/get')
+    def get_value():
+        return session.get('value', '')
+
+    @app.route('/_session/clear')
+    def clear():
+        session.clear()
+        return 'ok'
+
+@pytest.fixture
+def client(app):
+    _add_routes(app)
+    return app.test_client()
+
+@pytest.fixture
+def session_writes(db):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith(('INSERT INTO sessions', 'UPDATE sessions', 'DELETE FROM sessions')):
+            statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', count)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', count)
+
+def _rows(db):
+    return db.session.scalar(select(func.count()).select_from(ServerSession))
+
+def test_session_is_stored_under_a_hash_of_the_cookie(app, client, db):
+    response = client.get('/_session/set/a')
+    token = client.get_cookie(app.config['SESSION_COOKIE_NAME']).value
+    assert 'Set-Cookie' in response.headers
+    assert _rows(db) == 1
+    assert db.session.get(ServerSession, token) is None
+
+    assert client.get('/_session/get').text == 'a'
+
+def test_empty_session_is_not_stored(client, db, session_writes):
+    response = client.get('/_session/get')
+    assert 'Set-Cookie' not in response.headers
+    assert session_writes == []
+
+def test_unchanged_session_is_not_written(client, session_writes):
+    client.get('/_session/set/a')
+    session_writes.clear()
+
+    response = client.get('/_session/get')
+    assert response.text == 'a'
+    assert 'Set-Cookie' not in response.headers
+    assert session_writes == []
+
+def test_changed_session_is_written_once(client, session_writes):
+    client.get('/_session/set/a')
+    session_writes.clear()
+
+    client.get('/_session/set/b')
+    assert len(session_writes) == 1
+    assert session_writes[0].startswith('UPDATE sessions')
+    assert client.get('/_session/get').text == 'b'
+
+def test_session_in_use_is_extended_after_the_touch_interval(app, client, db, session_writes):
+    client.get('/_session/set/a')
+    app.config['SESSION_TOUCH_SECONDS'] = 60
+    earlier = datetime.utcnow() + app.permanent_session_lifetime - timedelta(minutes=5)
+    db.session.execute(update(ServerSession).values(expires_at=earlier))
+    db.session.commit()
+    session_writes.clear()
+
+    response = client.get('/_session/get')
+    assert len(session_writes) == 1
+    assert 'Set-Cookie' in response.headers
+    assert db.session.scalar(select(ServerSession.expires_at)) > earlier
+
+def test_cleared_session_is_deleted(app, client, db):
+    client.get('/_session/set/a')
+    response = client.get('/_session/clear')
+    assert _rows(db) == 0
+    assert client.get_cookie(app.config['SESSION_COOKIE_NAME']) is None
+    assert 'Set-Cookie' in response.headers
+
+def test_expired_session_is_ignored_and_swept(client, db):
+    client.get('/_session/set/a')
+    db.session.execute(update(ServerSession).values(expires_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.session.commit()
+
+    assert client.get('/_session/get').text == ''
+    assert delete_expired_sessions(batch_size=1) == 1
+    assert _rows(db) == 0
+
+def test_sweeper_deletes_in_batches(db):
+    expired = datetime.utcnow() - timedelta(minutes=1)
+    db.session.add_all(
+        [ServerSession(id=f'{i:064d}', data='{}', expires_at=expired) for i in range(5)]
+        + [ServerSession(id='f' * 64, data='{}', expires_at=datetime.utcnow() + timedelta(hours=1))]
+    )
+    db.session.commit()
+
+    assert delete_expired_sessions(batch_size=2) == 5
+    assert _rows(db) == 1
+
+def test_cookie_backend_keeps_sessions_in_the_cookie(monkeypatch):
+    monkeypatch.setattr(config['testing'], 'SESSION_BACKEND', 'cookie')
+    app = create_app('testing')
+    _add_routes(app)
+    with app.app_context():
+        client = app.test_client()
+        client.get('/_session/set/a')
+        assert client.get('/_session/get').text == 'a'
+        assert _rows(_db) == 0
+        _db.session.remove()
+        _db.drop_all()
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import event
+from app.models.user import User
+from app.services.user_activity import last_logins
+
+PASSWORD = 'Str0ng!Passw0rd'
+
+@pytest.fixture
+def login(app, user, db):
+    # The login form validates email addresses with email_validator
+    pytest.importorskip('email_validator')
+    app.config['WTF_CSRF_ENABLED'] = False
+    user.password = PASSWORD
+    db.session.commit()
+    client = app.test_client()
+    email = user.email
+
+    def login(password=PASSWORD):
+        return client.post('/auth/login', data={'email': email, 'password': password})
+    yield login
+    last_logins.flush()
+
+@pytest.fixture
+def user_updates(db):
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('UPDATE users'):
+            statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', count)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', count)
+
+def test_successful_login_does_not_write_the_user_row(login, user, user_updates):
+    assert login().status_code == 302
+    assert user_updates == []
+    assert last_logins.pending(user.id) is not None
+
+def test_api_login_does_not_write_the_user_row(app, user, db, user_updates):
+    app.config['WTF_CSRF_ENABLED'] = False
+    user.password = PASSWORD
+    db.session.commit()
+    user_updates.clear()
+
+    response = app.test_client().post('/api/v1/auth/login', json={'email': user.email, 'password': PASSWORD},
+                                      headers={'X-CSRFToken': 'token'})
+    assert response.status_code == 200
+    assert user_updates == []
+    assert last_logins.pending(user.id) is not None
+    last_logins.flush()
+
+def test_expired_lock_and_login_share_one_write(login, user, db, user_updates):
+    user.login_attempts = 5
+    user.locked_until = datetime.utcnow() - timedelta(minutes=1)
+    db.session.commit()
+    user_updates.clear()
+
+    assert login().status_code == 302
+    assert len(user_updates) == 1
+
+def test_failed_login_is_one_write(login, user, db, user_updates):
+    login('Wr0ng!Password')
+    assert len(user_updates) == 1
+    db.session.expire_all()
+    assert db.session.get(User, user.id).login_attempts == 1
+
+def test_flush_writes_buffered_logins_in_one_batch(app, user, db, user_updates):
+    other = User(username='other', email='other@example.com', is_verified=True)
+    db.session.add(other)
+    db.session.commit()
+    updated_at = user.updated_at
+    user_id, other_id = user.id, other.id
+    earlier, later = datetime(2026, 5, 1, 9), datetime(2026, 5, 1, 10)
+
+    last_logins.record(user_id, earlier)
+    last_logins.record(user_id, later)
+    last_logins.record(other_id, earlier)
+    user_updates.clear()
+
+    assert last_logins.flush() == 2
+    assert len(user_updates) == 1
+    db.session.expire_all()
+    assert db.session.get(User, user_id).last_login == later
+    assert db.session.get(User, user_id).updated_at == updated_at
+
+    # An older buffered time never overwrites a newer stored one
+    last_logins.record(user_id, earlier)
+    last_logins.flush()
+    db.session.expire_all()
+    assert db.session.get(User, user_id).last_login == later
+    assert last_logins.flush() == 0
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+import pytest
+from app.models.item import Item, STATUS_PENDING
+from app.models.zoho_sync_state import ZohoSyncState
+from app.services.zoho_service import ZohoService
+from app.services.zoho_sync import get_sync_state, get_zoho_sync
+
+@pytest.fixture
+def zoho_user(db, user):
+    user.zoho_access_token = 'token'
+    user.zoho_token_expires_at = datetime.now() + timedelta(hours=1)
+    db.session.commit()
+    return user
+
+@pytest.fixture
+def zoho(monkeypatch):
+    """Fake Zoho responses, recording the calls made."""
+    calls = {'statuses': [], 'syncs': 0}
+    inactive = set()
+    result = {'success': True, 'synced': 0}
+
+    def get_item_status(self, zoho_item_id):
+        calls['statuses'].append(zoho_item_id)
+        return 'inactive' if zoho_item_id in inactive else 'active'
+
+    def sync_inventory(self, user):
+        calls['syncs'] += 1
+        return result
+
+    monkeypatch.setattr(ZohoService, 'get_item_status', get_item_status)
+    monkeypatch.setattr(ZohoService, 'sync_inventory', sync_inventory)
+    return {'calls': calls, 'inactive': inactive, 'result': result}
+
+def _state(db, user_id):
+    db.session.expire_all()
+    return db.session.get(ZohoSyncState, user_id)
+
+def test_sync_checks_items_and_records_progress(db, zoho_user, zoho):
+    user_id = zoho_user.id
+    db.session.add_all([
+        Item(name='milk', user_id=user_id, zoho_item_id='z1', status='active'),
+        Item(name='eggs', user_id=user_id, zoho_item_id='z2', status='active')
+    ])
+    db.session.commit()
+    zoho['inactive'].add('z2')
+
+    get_zoho_sync().request_sync(user_id).result(timeout=10)
+
+    state = _state(db, user_id)
+    assert zoho['calls']['statuses'] == ['z1', 'z2'] and zoho['calls']['syncs'] == 1
+    assert (state.progress_done, state.progress_total) == (2, 2)
+    assert state.started_at is None and state.last_error is None
+    assert state.last_synced_at is not None and state.age() < 60
+    assert Item.query.filter_by(zoho_item_id='z2').one().status == STATUS_PENDING
+
+def test_fresh_syncs_are_not_repeated(app, db, zoho_user, zoho):
+    runner = get_zoho_sync()
+    runner.request_sync(zoho_user.id).result(timeout=10)
+    assert runner.request_sync(zoho_user.id) is None
+
+    runner.request_sync(zoho_user.id, force=True).result(timeout=10)
+    app.config['ZOHO_SYNC_MAX_AGE'] = 0
+    runner.request_sync(zoho_user.id).result(timeout=10)
+    assert zoho['calls']['syncs'] == 3
+
+def test_running_syncs_block_others_until_they_time_out(db, zoho_user, zoho):
+    user_id = zoho_user.id
+    db.session.add(ZohoSyncState(user_id=user_id, started_at=datetime.utcnow()))
+    db.session.commit()
+    assert get_zoho_sync().request_sync(user_id) is None
+
+    _state(db, user_id).started_at = datetime.utcnow() - timedelta(hours=1)
+    db.session.commit()
+    get_zoho_sync().request_sync(user_id).result(timeout=10)
+    assert zoho['calls']['syncs'] == 1
+
+def test_failures_are_recorded_and_not_retried_at_once(db, zoho_user, zoho):
+    user_id = zoho_user.id
+    zoho['result']['success'] = False
+    get_zoho_sync().request_sync(user_id).result(timeout=10)
+
+    status = get_sync_state(user_id).to_dict()
+    assert status['running'] is False
+    assert status['last_synced_at'] is None and status['age_seconds'] is None
+    assert 'Failed to sync' in status['last_error']
+    assert get_zoho_sync().request_sync(user_id) is None
+
+def test_inventory_page_syncs_in_the_background(login, zoho_user, zoho):
+    client = login(zoho_user)
+
+    for _ in range(3):
+        response = client.get('/inventory')
+        assert response.status_code == 200
+        assert b'id="syncStatus"' in response.data
+    get_zoho_sync()._executor.shutdown(wait=True)
+    assert zoho['calls']['syncs'] == 1
+
+    status = client.get('/inventory/sync-status').get_json()
+    assert status['running'] is False and status['age_seconds'] is not None
+
+def test_users_without_zoho_are_not_synced(db, user, web_client, zoho):
+    response = web_client.get('/inventory')
+    assert response.status_code == 200
+    assert b'id="syncStatus"' not in response.data
+    assert db.session.get(ZohoSyncState, user.id) is None